@@ -1,18 +1,158 @@
-from agentparse.yaml_model import (
-    YamlModel,
-    create_yaml_schema_from_dict,
-    pydantic_type_to_yaml_schema,
-)
-from agentparse.yaml_output_parser import YamlOutputParser
-from agentparse.json_output_parser import JsonOutputParser
-from agentparse.main import file_to_string, chunk_text_dynamic
+"""AgentParse: parse LLM output and ingest files for agents.
+
+Public names are imported lazily on first attribute access, so
+``import agentparse`` stays cheap and heavy dependencies (PyPDF2,
+openpyxl, tiktoken, ...) only load when the feature that needs them is
+used.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Maps each public name to the submodule that defines it
+_LAZY_ATTRIBUTES = {
+    "YamlModel": "agentparse.yaml_model",
+    "create_yaml_schema_from_dict": "agentparse.yaml_model",
+    "pydantic_type_to_yaml_schema": "agentparse.yaml_model",
+    "YamlOutputParser": "agentparse.yaml_output_parser",
+    "JsonOutputParser": "agentparse.json_output_parser",
+    "JsonStreamParser": "agentparse.json_stream_parser",
+    "ParseError": "agentparse.parse_result",
+    "ParseResult": "agentparse.parse_result",
+    "file_to_string": "agentparse.main",
+    "chunk_text_dynamic": "agentparse.main",
+    "iter_text_chunks": "agentparse.main",
+    "chunk_corpus": "agentparse.main",
+    "ExtractionCache": "agentparse.extraction_cache",
+    "FileHandler": "agentparse.extractors",
+    "register_extractor": "agentparse.extractors",
+    "iter_file_text": "agentparse.extractors",
+    "IngestionResult": "agentparse.file_processing",
+    "ingest_files": "agentparse.file_processing",
+    "iter_input_files": "agentparse.file_processing",
+    "iter_pdf_pages": "agentparse.file_readers",
+    "iter_text_blocks": "agentparse.file_readers",
+    "iter_xlsx_rows": "agentparse.file_readers",
+    "format_instructions": "agentparse.instructions",
+    "prewarm_format_instructions": "agentparse.instructions",
+    "format_instruction_tokens": "agentparse.instructions",
+    "clear_format_instructions_cache": "agentparse.instructions",
+    "enable_metrics": "agentparse.metrics",
+    "disable_metrics": "agentparse.metrics",
+    "metrics_snapshot": "agentparse.metrics",
+    "metrics_to_prometheus": "agentparse.metrics",
+    "add_metrics_sink": "agentparse.metrics",
+    "remove_metrics_sink": "agentparse.metrics",
+    "reset_metrics": "agentparse.metrics",
+    "count_tokens": "agentparse.tokenizer",
+    "get_tokenizer": "agentparse.tokenizer",
+    "token_cache_stats": "agentparse.tokenizer",
+}
 
 __all__ = [
+    "ExtractionCache",
+    "FileHandler",
+    "IngestionResult",
+    "JsonOutputParser",
+    "JsonStreamParser",
+    "ParseError",
+    "ParseResult",
     "YamlModel",
-    "create_yaml_schema_from_dict",
-    "pydantic_type_to_yaml_schema",
     "YamlOutputParser",
-    "JsonOutputParser",
-    "file_to_string",
+    "add_metrics_sink",
+    "chunk_corpus",
     "chunk_text_dynamic",
+    "clear_format_instructions_cache",
+    "count_tokens",
+    "create_yaml_schema_from_dict",
+    "disable_metrics",
+    "enable_metrics",
+    "file_to_string",
+    "format_instruction_tokens",
+    "format_instructions",
+    "get_tokenizer",
+    "ingest_files",
+    "iter_file_text",
+    "iter_input_files",
+    "iter_pdf_pages",
+    "iter_text_blocks",
+    "iter_text_chunks",
+    "iter_xlsx_rows",
+    "metrics_snapshot",
+    "metrics_to_prometheus",
+    "prewarm_format_instructions",
+    "pydantic_type_to_yaml_schema",
+    "register_extractor",
+    "remove_metrics_sink",
+    "reset_metrics",
+    "token_cache_stats",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        )
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from agentparse.extraction_cache import ExtractionCache
+    from agentparse.extractors import (
+        FileHandler,
+        iter_file_text,
+        register_extractor,
+    )
+    from agentparse.file_processing import (
+        IngestionResult,
+        ingest_files,
+        iter_input_files,
+    )
+    from agentparse.file_readers import (
+        iter_pdf_pages,
+        iter_text_blocks,
+        iter_xlsx_rows,
+    )
+    from agentparse.instructions import (
+        clear_format_instructions_cache,
+        format_instruction_tokens,
+        format_instructions,
+        prewarm_format_instructions,
+    )
+    from agentparse.json_output_parser import JsonOutputParser
+    from agentparse.json_stream_parser import JsonStreamParser
+    from agentparse.main import (
+        chunk_corpus,
+        chunk_text_dynamic,
+        file_to_string,
+        iter_text_chunks,
+    )
+    from agentparse.metrics import (
+        add_metrics_sink,
+        disable_metrics,
+        enable_metrics,
+        metrics_snapshot,
+        metrics_to_prometheus,
+        remove_metrics_sink,
+        reset_metrics,
+    )
+    from agentparse.parse_result import ParseError, ParseResult
+    from agentparse.tokenizer import (
+        count_tokens,
+        get_tokenizer,
+        token_cache_stats,
+    )
+    from agentparse.yaml_model import (
+        YamlModel,
+        create_yaml_schema_from_dict,
+        pydantic_type_to_yaml_schema,
+    )
+    from agentparse.yaml_output_parser import YamlOutputParser
@@ -1,26 +1,32 @@
-import subprocess
-from typing import Any, Dict, List, Callable
+from typing import TYPE_CHECKING, Any, Dict, List, Callable
 
 from loguru import logger
 from pydantic import BaseModel
 
-# Setting up loguru logging
-logger.add("agent_metadata.log", rotation="10 MB")
-
-try:
-    import pandas as pd
-except ImportError:
-    logger.error("Failed to import pandas")
-    subprocess.run(["pip", "install", "pandas"])
+if TYPE_CHECKING:
     import pandas as pd
 
 
-def display_agents_info(agents: List[Callable]) -> pd.DataFrame:
+def _import_pandas():
+    """Import pandas on first use; it is an optional dependency."""
+    try:
+        import pandas as pd
+    except ImportError as e:
+        raise ImportError(
+            "pandas is required for agent metadata tables."
+            " Install it with `pip install pandas`."
+        ) from e
+    return pd
+
+
+def display_agents_info(agents: List[Callable]) -> "pd.DataFrame":
     """
     Displays information about all agents in a list using a DataFrame.
 
     :param agents: List of callable functions that return Agent instances.
     """
+    pd = _import_pandas()
+
     # Extracting relevant information from each agent
     agent_data = []
     for agent_callable in agents:
@@ -58,19 +64,21 @@ def display_agents_info(agents: List[Callable]) -> pd.DataFrame:
         logger.error(f"Failed to print DataFrame: {e}")
 
 
-def dict_to_dataframe(data: Dict[str, Any]) -> pd.DataFrame:
+def dict_to_dataframe(data: Dict[str, Any]) -> "pd.DataFrame":
     """
     Converts a dictionary into a pandas DataFrame.
 
     :param data: Dictionary to convert.
     :return: A pandas DataFrame representation of the dictionary.
     """
+    pd = _import_pandas()
+
     # Convert dictionary to DataFrame
     df = pd.json_normalize(data)
     return df
 
 
-def pydantic_model_to_dataframe(model: BaseModel) -> pd.DataFrame:
+def pydantic_model_to_dataframe(model: BaseModel) -> "pd.DataFrame":
     """
     Converts a Pydantic Base Model into a pandas DataFrame.
 
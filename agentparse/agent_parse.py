@@ -1,5 +1,31 @@
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any, Callable, List, Type
+import asyncio
+import inspect
+import threading
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from functools import partial
+from itertools import islice, repeat
+from time import perf_counter
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+from weakref import WeakKeyDictionary
 
 from pydantic import BaseModel
 
@@ -7,27 +33,181 @@ from agentparse.function_to_basemodel import (
     function_to_pydantic_schema,
 )
 from agentparse.json_output_parser import JsonOutputParser
+from agentparse.metrics import EXECUTOR_QUEUE_DEPTH, METRICS
+from agentparse.parse_result import ParseResult
 from agentparse.yaml_output_parser import YamlOutputParser
 from agentparse.agent_metadata import display_agents_info
 
+# How AgentParse runs its *_concurrently methods
+EXECUTION_MODES = ("thread", "process")
+
+# Items per process-pool task when the input length is unknown
+_STREAM_CHUNKSIZE = 64
+
+R = TypeVar("R")
+
+
+def _parse_json(
+    base_model: Type[BaseModel], json_data: Any, return_results: bool
+) -> Union[BaseModel, ParseResult]:
+    # Parsers are cheap to build: the costly per-model setup is cached
+    # in json_output_parser, keyed weakly so dynamic models can be freed
+    parser = JsonOutputParser(base_model)
+    if return_results:
+        return parser.parse_result(json_data)
+    return parser.parse(json_data)
+
+
+def _parse_yaml(
+    base_model: Type[BaseModel], yaml_data: Any
+) -> BaseModel:
+    return YamlOutputParser(base_model).parse(yaml_data)
+
+
+def _parse_json_batch(
+    batch: List[Tuple[Type[BaseModel], Any]], return_results: bool
+) -> List[Union[BaseModel, ParseResult]]:
+    return [
+        _parse_json(base_model, json_data, return_results)
+        for base_model, json_data in batch
+    ]
+
+
+def _batched(items: Iterable[R], size: int) -> Iterator[List[R]]:
+    items = iter(items)
+    while batch := list(islice(items, size)):
+        yield batch
+
+
+def _bounded_map(
+    executor: Executor,
+    func: Callable[[Any], R],
+    items: Iterable[Any],
+    max_in_flight: int,
+) -> Iterator[R]:
+    """
+    Yield func(item) for each item, in input order, running on executor.
+
+    Items are pulled lazily and at most max_in_flight tasks are submitted
+    but not yet yielded; tasks still pending when the generator is closed
+    (or a task raises) are cancelled.
+    """
+    items = iter(items)
+    pool = type(executor).__name__
+    in_order = deque(
+        executor.submit(func, item)
+        for item in islice(items, max_in_flight)
+    )
+    METRICS.add_gauge(
+        EXECUTOR_QUEUE_DEPTH, len(in_order), executor=pool
+    )
+    try:
+        while in_order:
+            future = in_order.popleft()
+            METRICS.add_gauge(EXECUTOR_QUEUE_DEPTH, -1, executor=pool)
+            started = METRICS.enabled and perf_counter()
+            result = future.result()
+            if started:
+                METRICS.stage_time("agent.wait", started)
+            for item in islice(items, 1):
+                in_order.append(executor.submit(func, item))
+                METRICS.add_gauge(
+                    EXECUTOR_QUEUE_DEPTH, 1, executor=pool
+                )
+            yield result
+    finally:
+        for future in in_order:
+            future.cancel()
+        METRICS.add_gauge(
+            EXECUTOR_QUEUE_DEPTH, -len(in_order), executor=pool
+        )
+
 
 class AgentParse:
     """
     AgentParse is a utility class designed to facilitate the conversion of functions to Pydantic models and the parsing of JSON data concurrently.
     It leverages the `function_to_pydantic_schema` function to create Pydantic models from function signatures and the `JsonOutputParser` to parse JSON data.
+
+    The worker pool is created on first use and reused by every call until close(); use the instance as a context manager to shut it down.
+
+    Examples:
+    >>> with AgentParse(workers=4) as agent:
+    ...     for model in agent.imap(MyModel, consumer):
+    ...         handle(model)
     """
 
     def __init__(
         self,
         workers: int = 1,
+        mode: str = "thread",
+        chunksize: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        max_concurrency: Optional[int] = None,
     ):
         """
         Initializes the AgentParse instance with the specified number of workers for concurrent operations.
 
         Args:
             workers (int, optional): The number of workers to use for concurrent operations. Defaults to 1.
+            mode (str, optional): "thread" runs parsing on a thread pool, which suits I/O-bound callers; "process" runs it on a process pool, so CPU-bound JSON decoding and validation scale across cores. Defaults to "thread".
+            chunksize (Optional[int], optional): Items sent to a worker process per batch in process mode. Defaults to about four batches per worker.
+            executor (Optional[Executor], optional): The executor to run parsing on. It is not shut down by close(). Defaults to a pool of workers threads or processes (per mode) that AgentParse creates on first use.
+            max_concurrency (Optional[int], optional): Maximum parses the async methods run at once, per event loop. Defaults to workers.
         """
+        if mode not in EXECUTION_MODES:
+            raise ValueError(
+                f"mode must be one of {EXECUTION_MODES}, got {mode!r}"
+            )
+        if chunksize is not None and chunksize <= 0:
+            raise ValueError("chunksize must be greater than zero")
+        if max_concurrency is not None and max_concurrency <= 0:
+            raise ValueError(
+                "max_concurrency must be greater than zero"
+            )
         self.workers = workers
+        self.mode = mode
+        self.chunksize = chunksize
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        # Event loop -> asyncio.Semaphore; a semaphore is bound to one loop
+        self._semaphores = WeakKeyDictionary()
+        # Pools created on demand, by kind ("thread" or "process")
+        self._pools: Dict[str, Executor] = {}
+        self._pools_lock = threading.Lock()
+
+    def __enter__(self) -> "AgentParse":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Shuts down the worker pools this instance created, waiting for running tasks. A later call starts new pools.
+        """
+        with self._pools_lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _get_executor(self, kind: Optional[str] = None) -> Executor:
+        # The executor for work of the given kind (default: mode). Function
+        # conversion always needs threads: its models cannot be pickled.
+        kind = kind or self.mode
+        if self.executor is not None and kind == self.mode:
+            return self.executor
+        with self._pools_lock:
+            pool = self._pools.get(kind)
+            if pool is None:
+                pool_class = (
+                    ProcessPoolExecutor
+                    if kind == "process"
+                    else ThreadPoolExecutor
+                )
+                pool = pool_class(max_workers=self.workers)
+                self._pools[kind] = pool
+            return pool
 
     def func_to_base_model(
         self,
@@ -39,6 +219,8 @@ class AgentParse:
         """
         Converts a given function to a Pydantic BaseModel.
 
+        Models are memoized per function and name, so converting the same function again returns the cached model.
+
         Args:
             func (Callable[..., Any]): The function to convert to a Pydantic model.
             name (str, optional): The name for the created model. Defaults to None.
@@ -60,7 +242,7 @@ class AgentParse:
         **kwargs,
     ) -> List[Type[BaseModel]]:
         """
-        Converts a list of functions to Pydantic models concurrently using a ThreadPoolExecutor.
+        Converts a list of functions to Pydantic models concurrently on the persistent thread pool.
 
         Args:
             functions (List[Callable[..., Any]]): A list of functions to convert to Pydantic models.
@@ -74,19 +256,17 @@ class AgentParse:
         if names is None:
             names = [None] * len(functions)
 
-        with ThreadPoolExecutor(max_workers=self.workers) as executor:
-            futures = [
-                executor.submit(
-                    function_to_pydantic_schema,
-                    func,
-                    name,
-                    *args,
-                    **kwargs,
-                )
-                for func, name in zip(functions, names)
-            ]
-            models = [future.result() for future in futures]
-        return models
+        def convert(item: Tuple[Callable[..., Any], str]):
+            return function_to_pydantic_schema(*item, *args, **kwargs)
+
+        return list(
+            _bounded_map(
+                self._get_executor("thread"),
+                convert,
+                zip(functions, names),
+                2 * self.workers,
+            )
+        )
 
     def parse_json_with_base_model(
         self, base_model: BaseModel, json_data: Any
@@ -101,40 +281,289 @@ class AgentParse:
         Returns:
             BaseModel: The parsed Pydantic model instance.
         """
-        model = JsonOutputParser(base_model)
-        return model.parse(json_data)
+        return _parse_json(
+            base_model, json_data, return_results=False
+        )
 
     def parse_json_concurrently(
         self,
         base_models: List[BaseModel],
         json_data: List[Any],
-    ) -> List[BaseModel]:
+        return_results: bool = False,
+    ) -> List[Union[BaseModel, ParseResult]]:
         """
-        Parses a list of JSON data concurrently using a ThreadPoolExecutor and a list of Pydantic models.
+        Parses a list of JSON data concurrently using a list of Pydantic models.
+
+        In thread mode each item is a task on the persistent thread pool. In process mode items are sent in batches to the process pool, where each worker checks each model's schema once; the models and data must then be picklable, i.e. the models defined at module level. Either way results are in input order and the first failing item's exception is raised.
 
         Args:
             base_models (List[BaseModel]): A list of Pydantic models to use for parsing.
             json_data (List[Any]): A list of JSON data to parse.
+            return_results (bool, optional): Return a ParseResult per item, with a compact error record for failures, instead of raising on the first failure. Defaults to False.
 
         Returns:
-            List[BaseModel]: A list of parsed Pydantic model instances.
+            List[Union[BaseModel, ParseResult]]: A list of parsed Pydantic model instances, or of ParseResults if return_results is set.
         """
-        with ThreadPoolExecutor(max_workers=self.workers) as executor:
-            futures = [
-                executor.submit(
-                    self.parse_json_with_base_model, model, data
-                )
-                for model, data in zip(base_models, json_data)
-            ]
-            parsed_models = [future.result() for future in futures]
-        return parsed_models
+        chunksize = 1
+        if self.mode == "process":
+            count = min(len(base_models), len(json_data))
+            chunksize = self.chunksize or max(
+                1, -(-count // (4 * self.workers))
+            )
+        return list(
+            self._imap_pairs(
+                zip(base_models, json_data),
+                return_results,
+                chunksize,
+                2 * self.workers,
+            )
+        )
+
+    def imap(
+        self,
+        base_model: Union[Type[BaseModel], Iterable[Type[BaseModel]]],
+        json_data: Iterable[Any],
+        return_results: bool = False,
+        max_in_flight: Optional[int] = None,
+    ) -> Iterator[Union[BaseModel, ParseResult]]:
+        """
+        Lazily parses an iterable of JSON data, e.g. messages from a queue consumer, on the persistent pool.
+
+        Inputs are pulled only as results are consumed, with at most max_in_flight tasks submitted but not yet yielded, so memory stays flat however long the input is. Results are yielded in input order. If an item fails and return_results is not set, its exception is raised and the pending tasks are cancelled, as they are when the iteration stops early. In process mode each task is a batch of chunksize items (default 64).
+
+        Args:
+            base_model (Union[Type[BaseModel], Iterable[Type[BaseModel]]]): The Pydantic model for every item, or an iterable of models paired with json_data.
+            json_data (Iterable[Any]): The JSON data to parse; may be unbounded.
+            return_results (bool, optional): Yield a ParseResult per item instead of raising on the first failure. Defaults to False.
+            max_in_flight (Optional[int], optional): Maximum tasks submitted but not yet yielded. Defaults to 2 * workers.
+
+        Yields:
+            Union[BaseModel, ParseResult]: Parsed model instances, or ParseResults if return_results is set.
+        """
+        max_in_flight = max_in_flight or 2 * self.workers
+        if max_in_flight <= 0:
+            raise ValueError(
+                "max_in_flight must be greater than zero"
+            )
+        base_models = (
+            repeat(base_model)
+            if isinstance(base_model, type)
+            else base_model
+        )
+        chunksize = 1
+        if self.mode == "process":
+            chunksize = self.chunksize or _STREAM_CHUNKSIZE
+        return self._imap_pairs(
+            zip(base_models, json_data),
+            return_results,
+            chunksize,
+            max_in_flight,
+        )
+
+    def _imap_pairs(
+        self,
+        pairs: Iterable[Tuple[Type[BaseModel], Any]],
+        return_results: bool,
+        chunksize: int,
+        max_in_flight: int,
+    ) -> Iterator[Union[BaseModel, ParseResult]]:
+        parse_batch = partial(
+            _parse_json_batch, return_results=return_results
+        )
+        for batch in _bounded_map(
+            self._get_executor(),
+            parse_batch,
+            _batched(pairs, chunksize),
+            max_in_flight,
+        ):
+            yield from batch
+
+    def parse_json_result_with_base_model(
+        self, base_model: BaseModel, json_data: Any
+    ) -> ParseResult:
+        """
+        Parses JSON data using a given Pydantic BaseModel without raising.
+
+        Args:
+            base_model (BaseModel): The Pydantic model to use for parsing.
+            json_data (Any): The JSON data to parse.
+
+        Returns:
+            ParseResult: The parsed model instance, or a compact error record.
+        """
+        return _parse_json(base_model, json_data, return_results=True)
 
     def yaml_output_parse(
         self, base_model: BaseModel, yaml_data: Any
     ) -> BaseModel:
-        model = YamlOutputParser(base_model)
+        return _parse_yaml(base_model, yaml_data)
 
-        return model.parse(yaml_data)
+    async def aparse_json(
+        self,
+        base_model: Type[BaseModel],
+        json_data: Union[str, Awaitable[str]],
+        return_results: bool = False,
+    ) -> Union[BaseModel, ParseResult]:
+        """
+        Parses JSON data without blocking the event loop.
+
+        Args:
+            base_model (Type[BaseModel]): The Pydantic model to use for parsing.
+            json_data (Union[str, Awaitable[str]]): The JSON data, or an awaitable (e.g. a pending LLM call) that returns it. It is awaited before a concurrency slot is taken.
+            return_results (bool, optional): Return a ParseResult instead of raising. Defaults to False.
+
+        Returns:
+            Union[BaseModel, ParseResult]: The parsed model instance, or a ParseResult if return_results is set.
+        """
+        if inspect.isawaitable(json_data):
+            json_data = await json_data
+        return await self._run_in_executor(
+            self._get_executor(),
+            _parse_json,
+            base_model,
+            json_data,
+            return_results,
+        )
+
+    async def aparse_json_many(
+        self,
+        base_models: List[Type[BaseModel]],
+        json_data: List[Union[str, Awaitable[str]]],
+        return_results: bool = False,
+    ) -> List[Union[BaseModel, ParseResult]]:
+        """
+        Parses a list of JSON data concurrently, the async counterpart of parse_json_concurrently.
+
+        At most max_concurrency items are parsed at once; results are in input order.
+
+        Args:
+            base_models (List[Type[BaseModel]]): A list of Pydantic models to use for parsing.
+            json_data (List[Union[str, Awaitable[str]]]): A list of JSON data, or awaitables returning it.
+            return_results (bool, optional): Return a ParseResult per item instead of raising on the first failure. Defaults to False.
+
+        Returns:
+            List[Union[BaseModel, ParseResult]]: The parsed model instances, or ParseResults if return_results is set.
+        """
+        return await asyncio.gather(*(
+            self.aparse_json(model, data, return_results)
+            for model, data in zip(base_models, json_data)
+        ))
+
+    async def aparse_json_as_completed(
+        self,
+        base_models: List[Type[BaseModel]],
+        json_data: List[Union[str, Awaitable[str]]],
+        return_results: bool = False,
+    ) -> AsyncIterator[Tuple[int, Union[BaseModel, ParseResult]]]:
+        """
+        Parses a list of JSON data concurrently, yielding each result as soon as it is ready.
+
+        When json_data holds awaitables, e.g. pending LLM calls, each response is parsed as it arrives instead of after the slowest one. If an item fails and return_results is not set, its exception is raised and the pending items are cancelled; so are they if the iteration stops early.
+
+        Args:
+            base_models (List[Type[BaseModel]]): A list of Pydantic models to use for parsing.
+            json_data (List[Union[str, Awaitable[str]]]): A list of JSON data, or awaitables returning it.
+            return_results (bool, optional): Yield ParseResults instead of raising. Defaults to False.
+
+        Yields:
+            Tuple[int, Union[BaseModel, ParseResult]]: (index into the inputs, parsed result), in completion order.
+        """
+
+        async def parse(index: int, model, data):
+            return index, await self.aparse_json(
+                model, data, return_results
+            )
+
+        tasks = [
+            asyncio.ensure_future(parse(index, model, data))
+            for index, (model, data) in enumerate(
+                zip(base_models, json_data)
+            )
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def ayaml_output_parse(
+        self,
+        base_model: Type[BaseModel],
+        yaml_data: Union[str, Awaitable[str]],
+    ) -> BaseModel:
+        """
+        Parses YAML data without blocking the event loop.
+
+        Args:
+            base_model (Type[BaseModel]): The Pydantic model to use for parsing.
+            yaml_data (Union[str, Awaitable[str]]): The YAML data, or an awaitable that returns it.
+
+        Returns:
+            BaseModel: The parsed Pydantic model instance.
+        """
+        if inspect.isawaitable(yaml_data):
+            yaml_data = await yaml_data
+        return await self._run_in_executor(
+            self._get_executor(), _parse_yaml, base_model, yaml_data
+        )
+
+    async def aconvert_functions(
+        self,
+        functions: List[Callable[..., Any]],
+        names: List[str] = None,
+        *args,
+        **kwargs,
+    ) -> List[Type[BaseModel]]:
+        """
+        Converts a list of functions to Pydantic models concurrently, the async counterpart of convert_functions_concurrently.
+
+        Conversion runs on threads even in process mode, since the created models cannot be pickled.
+
+        Args:
+            functions (List[Callable[..., Any]]): A list of functions to convert to Pydantic models.
+            names (List[str], optional): A list of names for the created models. Defaults to None.
+            *args: Additional arguments to pass to the `function_to_pydantic_schema` function.
+            **kwargs: Additional keyword arguments to pass to the `function_to_pydantic_schema` function.
+
+        Returns:
+            List[Type[BaseModel]]: A list of created Pydantic models, in input order.
+        """
+        if names is None:
+            names = [None] * len(functions)
+        return await asyncio.gather(*(
+            self._run_in_executor(
+                self._get_executor("thread"),
+                partial(
+                    function_to_pydantic_schema,
+                    func,
+                    name,
+                    *args,
+                    **kwargs,
+                ),
+            )
+            for func, name in zip(functions, names)
+        ))
+
+    async def _run_in_executor(
+        self, executor: Executor, func: Callable[..., R], *args: Any
+    ) -> R:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(
+                self.max_concurrency or self.workers
+            )
+            self._semaphores[loop] = semaphore
+        pool = type(executor).__name__
+        METRICS.add_gauge(EXECUTOR_QUEUE_DEPTH, 1, executor=pool)
+        try:
+            async with semaphore:
+                return await loop.run_in_executor(
+                    executor, partial(func, *args)
+                )
+        finally:
+            METRICS.add_gauge(EXECUTOR_QUEUE_DEPTH, -1, executor=pool)
 
     def display_agents_in_table(self, agents: List[Callable]):
         return display_agents_info(agents)
@@ -0,0 +1,183 @@
+import re
+from dataclasses import dataclass
+from typing import Collection, Iterator, List, Optional, Tuple
+
+# A fence line: three or more backticks or tildes, then an info string.
+# Matching from the newline (not ^ with MULTILINE) lets the regex engine
+# jump between newlines instead of trying every position.
+_FIRST_FENCE = re.compile(r"[ \t]*(`{3,}|~{3,})(.*)")
+_NEXT_FENCE = re.compile(r"\n[ \t]*(`{3,}|~{3,})(.*)")
+_LANGUAGE = re.compile(r"[ \t]*([\w+#.-]*)")
+_OPENER = re.compile(r"[{\[]")
+# Everything up to the next bracket, skipping whole JSON strings
+_SKIP_TO_BRACKET = re.compile(
+    r'[^"{}\[\]]*(?:"[^"\\\n]*(?:\\.[^"\\\n]*)*"[^"{}\[\]]*)*'
+)
+_CLOSER_FOR = {"}": "{", "]": "["}
+
+
+@dataclass(frozen=True)
+class TextBlock:
+    """A span of text that may hold structured output.
+
+    language is the fence's info string, lowercased ("" for a bare ```
+    fence), or None for an unfenced top-level {...} or [...] span.
+    """
+
+    start: int
+    end: int
+    language: Optional[str] = None
+
+    @property
+    def fenced(self) -> bool:
+        return self.language is not None
+
+
+def scan_blocks(text: str) -> Iterator[TextBlock]:
+    """
+    Find every fenced code block and bare {...}/[...] span in one pass.
+
+    Fences follow Markdown: a line of three or more backticks (or tildes)
+    opens a block that the next fence line of the same character and at
+    least the same length closes; an unclosed block runs to the end of the
+    text. A fence line that also contains the closing fence, e.g.
+    ```json {"a": 1}```, is a single-line block. Outside fences, balanced
+    top-level brackets are reported, skipping brackets inside JSON strings.
+    The input is never copied, and blocks are yielded lazily in document
+    order, so callers that stop at the first usable block scan no further.
+
+    Args:
+        text (str): The text to scan, e.g. an LLM response.
+
+    Yields:
+        TextBlock: The blocks found, in order of their start position.
+    """
+    prose_start = 0
+    fences = _iter_fences(text)
+    for fence in fences:
+        yield from _scan_bare_spans(text, prose_start, fence.start())
+
+        marker = fence.group(1)
+        language = _LANGUAGE.match(text, fence.start(2))
+        inline_close = text.find(
+            marker[0] * 3, language.end(), fence.end()
+        )
+        if inline_close >= 0:
+            yield TextBlock(
+                language.end(),
+                inline_close,
+                language.group(1).lower(),
+            )
+            prose_start = fence.end()
+            continue
+
+        content_start = min(fence.end() + 1, len(text))
+        closing = None
+        for candidate in fences:
+            closing_marker = candidate.group(1)
+            if (
+                closing_marker[0] == marker[0]
+                and len(closing_marker) >= len(marker)
+                and not candidate.group(2).strip()
+            ):
+                closing = candidate
+                break
+        content_end = closing.start() if closing else len(text)
+        yield TextBlock(
+            content_start, content_end, language.group(1).lower()
+        )
+        prose_start = closing.end() if closing else len(text)
+
+    yield from _scan_bare_spans(text, prose_start, len(text))
+
+
+def iter_candidates(
+    text: str,
+    languages: Collection[str],
+    include_bare: bool = True,
+) -> Iterator[str]:
+    """
+    Yield the text of each block worth parsing, in document order.
+
+    Args:
+        text (str): The text to scan.
+        languages (Collection[str]): Accepted fence info strings, lowercase;
+            include "" to accept fences without one.
+        include_bare (bool): Also yield unfenced {...}/[...] spans.
+
+    Yields:
+        str: Candidate block contents. If no block qualifies, the whole
+            text is the only candidate.
+    """
+    for start, end in iter_candidate_spans(
+        text, languages, include_bare
+    ):
+        yield text[start:end]
+
+
+def iter_candidate_spans(
+    text: str,
+    languages: Collection[str],
+    include_bare: bool = True,
+) -> Iterator[Tuple[int, int]]:
+    """Like iter_candidates, but yield (start, end) offsets into text."""
+    found = False
+    for block in scan_blocks(text):
+        if block.fenced:
+            if block.language not in languages:
+                continue
+        elif not include_bare:
+            continue
+        found = True
+        yield block.start, block.end
+    if not found:
+        yield 0, len(text)
+
+
+def _iter_fences(text: str) -> Iterator[re.Match]:
+    first = _FIRST_FENCE.match(text)
+    if first is not None:
+        yield first
+    yield from _NEXT_FENCE.finditer(text, first.end() if first else 0)
+
+
+def _scan_bare_spans(
+    text: str, start: int, end: int
+) -> Iterator[TextBlock]:
+    # Open brackets, innermost last: (char, position)
+    stack: List[Tuple[str, int]] = []
+    # Balanced spans inside an unmatched opener, outermost only
+    nested: List[Tuple[int, int]] = []
+    pos = start
+    while pos < end:
+        if not stack:
+            match = _OPENER.search(text, pos, end)
+            if match is None:
+                break
+            stack.append((match.group(), match.start()))
+            pos = match.end()
+            continue
+
+        pos = _SKIP_TO_BRACKET.match(text, pos, end).end()
+        if pos >= end:
+            break
+        char = text[pos]
+        if char == '"':
+            # An unterminated string: treat the quote as prose
+            pos += 1
+            continue
+        if char in "{[":
+            stack.append((char, pos))
+        elif stack[-1][0] == _CLOSER_FOR[char]:
+            opened = stack.pop()[1]
+            if not stack:
+                nested.clear()
+                yield TextBlock(opened, pos + 1)
+            else:
+                while nested and nested[-1][0] > opened:
+                    nested.pop()
+                nested.append((opened, pos + 1))
+        pos += 1
+
+    for span_start, span_end in nested:
+        yield TextBlock(span_start, span_end)
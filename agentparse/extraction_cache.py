@@ -0,0 +1,321 @@
+import hashlib
+import os
+import tempfile
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from agentparse.extractors import detect_extractor
+
+# Bump when extraction output changes so stale entries are never served
+CACHE_VERSION = b"agentparse-extraction-v1"
+
+
+def default_cache_dir() -> str:
+    """Return $AGENTPARSE_CACHE_DIR, or ~/.cache/agentparse/extractions."""
+    return os.environ.get(
+        "AGENTPARSE_CACHE_DIR",
+        os.path.join(
+            os.path.expanduser("~"),
+            ".cache",
+            "agentparse",
+            "extractions",
+        ),
+    )
+
+
+@dataclass(frozen=True)
+class ExtractionCacheStats:
+    """Counters for an ExtractionCache.
+
+    bytes_saved is the total size of source files whose parsing was skipped
+    thanks to a cache hit.
+    """
+
+    hits: int
+    misses: int
+    bytes_saved: int
+    evictions: int
+
+
+class ExtractionCache:
+    """
+    A content-addressed, compressed on-disk cache of extracted file text.
+
+    Entries are keyed by a SHA-256 hash of the file's bytes and extension. A
+    per-path stamp records the file's size and mtime alongside its hash, so
+    unchanged files are recognized without being read again. The total size
+    of stored entries and stamps is capped, evicting the least recently used
+    entries first along with their stamps. Several processes may share one
+    cache directory.
+
+    Args:
+        directory (str, optional): Cache location (default: default_cache_dir()).
+        max_bytes (int): Maximum total size of compressed entries and stamps (default: 1 GiB).
+        extensions (Iterable[str]): Formats worth caching, by extension
+            (default: formats that need parsing, not plain text). Files are
+            matched by the format file_to_string detects for them, so a PDF
+            named "report.bin" is cached too.
+        compress_level (int): zlib compression level (default: 6).
+
+    Examples:
+    >>> cache = ExtractionCache("/tmp/agentparse-cache")
+    >>> text = file_to_string("report.pdf", cache=cache)
+    >>> cache.stats().hits
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_bytes: int = 1 << 30,
+        extensions: Iterable[str] = (".pdf", ".xlsx", ".docx"),
+        compress_level: int = 6,
+    ):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be greater than zero")
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.extensions = frozenset(extensions)
+        self.compress_level = compress_level
+        self._entries_dir = os.path.join(self.directory, "entries")
+        self._stamps_dir = os.path.join(self.directory, "stamps")
+        os.makedirs(self._entries_dir, exist_ok=True)
+        os.makedirs(self._stamps_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._bytes_saved = 0
+        self._evictions = 0
+        self._size_bytes: Optional[int] = None
+
+    def __getstate__(self):
+        # Locks cannot be pickled; worker processes get fresh counters
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def accepts(self, file_path: str) -> bool:
+        """Return True if the file's detected format is cached."""
+        try:
+            extractor = detect_extractor(file_path)
+        except (OSError, ValueError):
+            # file_to_string reports these when it extracts the file
+            return False
+        return not self.extensions.isdisjoint(extractor.extensions)
+
+    def get_or_extract(
+        self, file_path: str, extract: Callable[[str], str]
+    ) -> str:
+        """
+        Return the cached text for file_path, extracting and storing it on a miss.
+
+        Args:
+            file_path (str): Path to the source file.
+            extract (Callable[[str], str]): Function that extracts the text.
+
+        Returns:
+            str: The extracted text.
+        """
+        stat = os.stat(file_path)
+        digest = self._content_digest(file_path, stat)
+        entry_path = self._entry_path(digest)
+
+        text = self._read_entry(entry_path)
+        if text is not None:
+            with self._lock:
+                self._hits += 1
+                self._bytes_saved += stat.st_size
+            return text
+
+        with self._lock:
+            self._misses += 1
+        text = extract(file_path)
+        self._write_entry(entry_path, text)
+        return text
+
+    def stats(self) -> ExtractionCacheStats:
+        with self._lock:
+            return ExtractionCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                bytes_saved=self._bytes_saved,
+                evictions=self._evictions,
+            )
+
+    def size_bytes(self) -> int:
+        """Return the total size of stored entries and stamps."""
+        entries = sum(size for _, size, _ in self._scan_entries())
+        return entries + sum(size for _, size in self._scan_stamps())
+
+    def clear(self) -> None:
+        """Delete every entry and stamp."""
+        for directory in (self._entries_dir, self._stamps_dir):
+            for name in os.listdir(directory):
+                _remove_quietly(os.path.join(directory, name))
+        with self._lock:
+            self._size_bytes = 0
+
+    def _content_digest(
+        self, file_path: str, stat: os.stat_result
+    ) -> str:
+        stamp_path = os.path.join(
+            self._stamps_dir,
+            hashlib.sha1(
+                os.path.abspath(file_path).encode("utf-8")
+            ).hexdigest(),
+        )
+        fingerprint = f"{stat.st_size} {stat.st_mtime_ns}"
+        saved = _read_stamp(stamp_path)
+        if saved is not None and saved[0] == fingerprint:
+            return saved[1]
+
+        hasher = hashlib.sha256(CACHE_VERSION)
+        hasher.update(os.path.splitext(file_path)[1].lower().encode())
+        with open(file_path, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                hasher.update(block)
+        digest = hasher.hexdigest()
+        stamp = f"{fingerprint} {digest}".encode("utf-8")
+        _atomic_write(stamp_path, stamp, self._stamps_dir)
+        with self._lock:
+            # An overwritten stamp is counted twice until the next
+            # eviction recounts
+            if self._size_bytes is not None:
+                self._size_bytes += len(stamp)
+        return digest
+
+    def _entry_path(self, digest: str) -> str:
+        return os.path.join(self._entries_dir, f"{digest}.zlib")
+
+    def _read_entry(self, entry_path: str) -> Optional[str]:
+        try:
+            with open(entry_path, "rb") as file:
+                data = file.read()
+            text = zlib.decompress(data).decode("utf-8")
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error, UnicodeDecodeError) as e:
+            logger.warning(
+                f"Discarding unreadable cache entry {entry_path}: {e}"
+            )
+            _remove_quietly(entry_path)
+            return None
+
+        # Refresh the mtime so eviction sees this entry as recently used
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return text
+
+    def _write_entry(self, entry_path: str, text: str) -> None:
+        data = zlib.compress(
+            text.encode("utf-8"), self.compress_level
+        )
+        if len(data) > self.max_bytes:
+            # Not stored, but the file's stamp still counts
+            self._add_size(0)
+            return
+        _atomic_write(entry_path, data, self._entries_dir)
+        self._add_size(len(data))
+
+    def _add_size(self, nbytes: int) -> None:
+        with self._lock:
+            if self._size_bytes is None:
+                self._size_bytes = self.size_bytes()
+            else:
+                self._size_bytes += nbytes
+            over_budget = self._size_bytes > self.max_bytes
+        if over_budget:
+            self._evict()
+
+    def _scan_entries(self):
+        for entry in os.scandir(self._entries_dir):
+            if not entry.name.endswith(".zlib"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            yield entry.path, stat.st_size, stat.st_mtime_ns
+
+    def _scan_stamps(self):
+        for entry in os.scandir(self._stamps_dir):
+            if entry.name.endswith(".tmp"):
+                continue
+            try:
+                yield entry.path, entry.stat().st_size
+            except FileNotFoundError:
+                continue
+
+    def _evict(self) -> None:
+        entries = sorted(self._scan_entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        live = {_entry_digest(path) for path, _, _ in entries}
+        stamps: Dict[str, List[Tuple[str, int]]] = {}
+        for path, size in self._scan_stamps():
+            saved = _read_stamp(path)
+            if saved is None or saved[1] not in live:
+                # Its entry is gone (evicted, or never written); the
+                # file is simply hashed again next time
+                _remove_quietly(path)
+                continue
+            stamps.setdefault(saved[1], []).append((path, size))
+            total += size
+
+        evicted = 0
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            _remove_quietly(path)
+            total -= size
+            for stamp_path, stamp_size in stamps.pop(
+                _entry_digest(path), ()
+            ):
+                _remove_quietly(stamp_path)
+                total -= stamp_size
+            evicted += 1
+
+        with self._lock:
+            self._size_bytes = total
+            self._evictions += evicted
+
+
+def _entry_digest(entry_path: str) -> str:
+    return os.path.basename(entry_path)[: -len(".zlib")]
+
+
+def _read_stamp(stamp_path: str) -> Optional[Tuple[str, str]]:
+    """Return a stamp's (fingerprint, digest), or None if unreadable."""
+    try:
+        with open(stamp_path, "r", encoding="utf-8") as file:
+            fingerprint, digest = file.read().rsplit(" ", 1)
+    except (OSError, ValueError):
+        return None
+    return fingerprint, digest
+
+
+def _atomic_write(path: str, data: bytes, directory: str) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        _remove_quietly(tmp_path)
+        raise
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,302 @@
+import os
+import threading
+import zipfile
+from dataclasses import dataclass, field, replace
+from importlib import import_module
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+# Bytes read from the start of a file to sniff its format
+SNIFF_BYTES = 2048
+
+
+class FileHandler:
+    """
+    Base class for format handlers used by file_to_string.
+
+    Subclasses implement stream(); extract() joins the streamed blocks by
+    default and may be overridden with a faster whole-file path. Both accept
+    keyword options (e.g. workers) and ignore the ones they do not use.
+    """
+
+    def stream(self, file_path: str, **options) -> Iterator[str]:
+        """Yield the file's text in consecutive blocks."""
+        raise NotImplementedError
+
+    def extract(self, file_path: str, **options) -> str:
+        """Return the file's full text."""
+        return "".join(self.stream(file_path, **options))
+
+
+HandlerSource = Union[str, Callable[[], FileHandler]]
+
+
+@dataclass
+class Extractor:
+    """A registered format: how to recognize it and how to load its handler.
+
+    handler is either a "module:attribute" path or a zero-argument factory,
+    and is only resolved the first time the format is used, so a handler's
+    dependencies are never imported for files of other formats.
+    """
+
+    name: str
+    handler: HandlerSource
+    extensions: Tuple[str, ...] = ()
+    signatures: Tuple[bytes, ...] = ()
+    sniffer: Optional[Callable[[str, bytes], bool]] = None
+    _instance: Optional[FileHandler] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def load(self) -> FileHandler:
+        if self._instance is None:
+            with _registry_lock:
+                if self._instance is None:
+                    factory = self.handler
+                    if isinstance(factory, str):
+                        module_name, _, attribute = factory.partition(
+                            ":"
+                        )
+                        factory = getattr(
+                            import_module(module_name), attribute
+                        )
+                    self._instance = factory()
+        return self._instance
+
+    def matches_content(self, file_path: str, head: bytes) -> bool:
+        if not any(head.startswith(sig) for sig in self.signatures):
+            return False
+        return self.sniffer is None or self.sniffer(file_path, head)
+
+
+_extractors: Dict[str, Extractor] = {}
+_by_extension: Dict[str, Extractor] = {}
+_registry_lock = threading.RLock()
+
+
+def register_extractor(
+    name: str,
+    handler: HandlerSource,
+    extensions: Iterable[str] = (),
+    signatures: Iterable[bytes] = (),
+    sniffer: Optional[Callable[[str, bytes], bool]] = None,
+) -> Extractor:
+    """
+    Register (or replace) a format handler.
+
+    Args:
+        name (str): Unique format name, e.g. "pdf".
+        handler (Union[str, Callable[[], FileHandler]]): "module:attribute" path
+            or factory for the handler, loaded lazily on first use.
+        extensions (Iterable[str]): File extensions handled, e.g. [".pdf"].
+        signatures (Iterable[bytes]): Magic-byte prefixes identifying the format.
+        sniffer (Callable[[str, bytes], bool], optional): Extra check run when a
+            signature matches, for containers shared by several formats (zip).
+
+    Returns:
+        Extractor: The registered extractor.
+
+    Examples:
+    >>> register_extractor(
+    ...     "markdown", "my_package.handlers:MarkdownHandler",
+    ...     extensions=[".md"],
+    ... )
+    """
+    extractor = Extractor(
+        name=name,
+        handler=handler,
+        extensions=tuple(ext.lower() for ext in extensions),
+        signatures=tuple(signatures),
+        sniffer=sniffer,
+    )
+    with _registry_lock:
+        previous = _extractors.pop(name, None)
+        if previous is not None:
+            for ext in previous.extensions:
+                if _by_extension.get(ext) is previous:
+                    del _by_extension[ext]
+        _extractors[name] = extractor
+        for ext in extractor.extensions:
+            _by_extension[ext] = extractor
+    return extractor
+
+
+def unregister_extractor(name: str) -> None:
+    """Remove a registered format handler."""
+    with _registry_lock:
+        extractor = _extractors.pop(name)
+        for ext in extractor.extensions:
+            if _by_extension.get(ext) is extractor:
+                del _by_extension[ext]
+
+
+def registered_extensions() -> List[str]:
+    """Return every file extension with a registered handler."""
+    with _registry_lock:
+        return sorted(_by_extension)
+
+
+RegistrySnapshot = Tuple[List[Extractor], Dict[str, str]]
+
+
+def snapshot_registry() -> RegistrySnapshot:
+    """
+    Capture the registry so another process can rebuild it.
+
+    Handlers are left unloaded in the copy. Under the spawn and forkserver
+    start methods the snapshot is pickled, so handler factories and
+    sniffers registered at runtime must then be importable (defined at
+    module level, not lambdas or closures).
+    """
+    with _registry_lock:
+        extractors = [
+            replace(extractor, _instance=None)
+            for extractor in _extractors.values()
+        ]
+        by_extension = {
+            ext: extractor.name
+            for ext, extractor in _by_extension.items()
+        }
+    return extractors, by_extension
+
+
+def restore_registry(snapshot: RegistrySnapshot) -> None:
+    """Replace the registry with one captured by snapshot_registry."""
+    extractors, by_extension = snapshot
+    with _registry_lock:
+        _extractors.clear()
+        _extractors.update(
+            (extractor.name, extractor) for extractor in extractors
+        )
+        _by_extension.clear()
+        _by_extension.update(
+            (ext, _extractors[name])
+            for ext, name in by_extension.items()
+        )
+
+
+def _looks_like_text(head: bytes) -> bool:
+    if b"\x00" in head:
+        return False
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character may be cut off at the end of the sample
+        return e.start >= len(head) - 3 and e.reason.startswith(
+            "unexpected end"
+        )
+    return True
+
+
+def detect_extractor(file_path: str) -> Extractor:
+    """
+    Choose the extractor for a file.
+
+    Magic-byte signatures are checked first, so files with a wrong or missing
+    extension are still recognized. Otherwise the extension decides, and a
+    file with no extension is treated as text if its first bytes are UTF-8.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        Extractor: The matching extractor.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If no registered format matches.
+    """
+    with open(file_path, "rb") as file:
+        head = file.read(SNIFF_BYTES)
+
+    with _registry_lock:
+        candidates = sorted(
+            (e for e in _extractors.values() if e.signatures),
+            key=lambda e: -max(map(len, e.signatures)),
+        )
+        _, file_extension = os.path.splitext(file_path)
+        by_extension = _by_extension.get(file_extension.lower())
+        text_extractor = _extractors.get("text")
+
+    for extractor in candidates:
+        if extractor.matches_content(file_path, head):
+            return extractor
+    if by_extension is not None:
+        return by_extension
+    if (
+        not file_extension
+        and text_extractor
+        and _looks_like_text(head)
+    ):
+        return text_extractor
+    raise ValueError(f"Unsupported file type: {file_extension}")
+
+
+def get_handler(file_path: str) -> FileHandler:
+    """Return the loaded handler for a file."""
+    return detect_extractor(file_path).load()
+
+
+def iter_file_text(file_path: str, **options) -> Iterator[str]:
+    """
+    Stream any supported file's text in blocks, choosing the handler automatically.
+
+    Args:
+        file_path (str): Path to the file.
+        **options: Handler options, e.g. workers for PDFs.
+
+    Yields:
+        str: Consecutive blocks of the file's text.
+    """
+    return get_handler(file_path).stream(file_path, **options)
+
+
+@dataclass(frozen=True)
+class _ZipMemberSniffer:
+    """Match zip files holding member; a class so it can be pickled."""
+
+    member: str
+
+    def __call__(self, file_path: str, head: bytes) -> bool:
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                archive.getinfo(self.member)
+        except (KeyError, zipfile.BadZipFile, OSError):
+            return False
+        return True
+
+
+register_extractor(
+    "text",
+    "agentparse.file_readers:TextHandler",
+    extensions=[".txt", ".csv", ".json"],
+)
+register_extractor(
+    "pdf",
+    "agentparse.file_readers:PdfHandler",
+    extensions=[".pdf"],
+    signatures=[b"%PDF-"],
+)
+register_extractor(
+    "xlsx",
+    "agentparse.file_readers:XlsxHandler",
+    extensions=[".xlsx"],
+    signatures=[b"PK\x03\x04"],
+    sniffer=_ZipMemberSniffer("xl/workbook.xml"),
+)
+register_extractor(
+    "docx",
+    "agentparse.file_readers:DocxHandler",
+    extensions=[".docx"],
+    signatures=[b"PK\x03\x04"],
+    sniffer=_ZipMemberSniffer("word/document.xml"),
+)
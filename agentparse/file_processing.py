@@ -0,0 +1,250 @@
+import glob
+import os
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, Iterator, Optional, Union
+
+from agentparse.extraction_cache import ExtractionCache
+from agentparse.extractors import (
+    RegistrySnapshot,
+    restore_registry,
+    snapshot_registry,
+)
+from agentparse.main import file_to_string
+
+
+@dataclass
+class IngestionResult:
+    """The outcome of ingesting one file.
+
+    Exactly one of text or error is set. error holds the exception message
+    and error_type its class name, so failures can cross process boundaries.
+    """
+
+    path: str
+    text: Optional[str] = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def iter_input_files(
+    source: Union[str, Iterable[str]],
+    extensions: Optional[Iterable[str]] = None,
+    recursive: bool = True,
+) -> Iterator[str]:
+    """
+    Expand a directory, glob pattern, file path or iterable of paths into file paths.
+
+    Directories are walked in sorted order (recursively by default); glob
+    patterns support "**". Hidden files and directories are skipped when
+    walking.
+
+    Args:
+        source (Union[str, Iterable[str]]): A directory, glob, file path, or iterable of those.
+        extensions (Iterable[str], optional): Only yield files with these extensions, e.g. [".pdf"].
+        recursive (bool): Walk subdirectories (default: True).
+
+    Yields:
+        str: File paths.
+    """
+    wanted = (
+        frozenset(ext.lower() for ext in extensions)
+        if extensions is not None
+        else None
+    )
+
+    def accept(path: str) -> bool:
+        return (
+            wanted is None
+            or os.path.splitext(path)[1].lower() in wanted
+        )
+
+    sources = [source] if isinstance(source, str) else source
+    for item in sources:
+        if os.path.isdir(item):
+            for root, dirs, files in os.walk(item):
+                dirs[:] = sorted(
+                    d for d in dirs if not d.startswith(".")
+                )
+                if not recursive:
+                    dirs[:] = []
+                for name in sorted(files):
+                    path = os.path.join(root, name)
+                    if not name.startswith(".") and accept(path):
+                        yield path
+        elif any(char in item for char in "*?["):
+            for path in sorted(glob.iglob(item, recursive=True)):
+                if os.path.isfile(path) and accept(path):
+                    yield path
+        elif accept(item):
+            yield item
+
+
+def _ingest_file(
+    file_path: str, cache: Optional[ExtractionCache]
+) -> IngestionResult:
+    try:
+        text = file_to_string(file_path, cache=cache)
+    except Exception as e:
+        return _failure(file_path, e)
+    return IngestionResult(path=file_path, text=text)
+
+
+def _failure(file_path: str, error: Exception) -> IngestionResult:
+    return IngestionResult(
+        path=file_path,
+        error=str(error),
+        error_type=type(error).__name__,
+    )
+
+
+class _IngestPool:
+    """
+    A process pool that survives its workers dying.
+
+    When a worker dies (e.g. a crash inside a native parser), every file in
+    flight on the pool fails with BrokenProcessPool, not just the one that
+    crashed it. Those files are re-run one at a time in a fresh single-worker
+    pool, so only a file that crashes again is reported as failed, and the
+    shared pool is replaced on the next submit.
+
+    Workers start with the extractor registry of the process that created
+    the pool, whatever the start method: under spawn and forkserver they
+    would otherwise only see the built-in formats.
+    """
+
+    def __init__(
+        self, workers: int, cache: Optional[ExtractionCache]
+    ):
+        self.workers = workers
+        self.cache = cache
+        self.registry: RegistrySnapshot = snapshot_registry()
+        self.executor = self._new_executor(workers)
+
+    def _new_executor(self, workers: int) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=restore_registry,
+            initargs=(self.registry,),
+        )
+
+    def submit(self, file_path: str) -> Future:
+        try:
+            return self.executor.submit(
+                _ingest_file, file_path, self.cache
+            )
+        except BrokenProcessPool:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = self._new_executor(self.workers)
+            return self.executor.submit(
+                _ingest_file, file_path, self.cache
+            )
+
+    def result(
+        self, file_path: str, future: Future
+    ) -> IngestionResult:
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            return self._run_isolated(file_path)
+        except Exception as e:
+            return _failure(file_path, e)
+
+    def _run_isolated(self, file_path: str) -> IngestionResult:
+        with self._new_executor(1) as executor:
+            future = executor.submit(
+                _ingest_file, file_path, self.cache
+            )
+            try:
+                return future.result()
+            except Exception as e:
+                return _failure(file_path, e)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def ingest_files(
+    source: Union[str, Iterable[str]],
+    workers: Optional[int] = None,
+    ordered: bool = False,
+    max_in_flight: Optional[int] = None,
+    extensions: Optional[Iterable[str]] = None,
+    cache: Optional[ExtractionCache] = None,
+) -> Iterator[IngestionResult]:
+    """
+    Extract text from many files in parallel across a process pool.
+
+    Files are dispatched to worker processes as they are discovered, with at
+    most max_in_flight outstanding, and results stream back as each file
+    finishes. A file that fails to parse yields an IngestionResult with its
+    error instead of stopping the batch, and so does a file that kills its
+    worker process; the other files in flight are re-run and the pool is
+    replaced.
+
+    Workers use the extractors registered when iteration starts. With
+    the spawn or forkserver start method (the default on macOS and Windows,
+    and on Linux from Python 3.14) they are pickled to each worker, so
+    handlers and sniffers registered at runtime must be defined at module
+    level.
+
+    Args:
+        source (Union[str, Iterable[str]]): A directory, glob pattern, file path, or iterable of paths.
+        workers (int, optional): Number of worker processes (default: os.cpu_count()).
+        ordered (bool): Yield results in input order instead of completion order (default: False).
+        max_in_flight (int, optional): Maximum files submitted but not yet yielded (default: 4 * workers).
+        extensions (Iterable[str], optional): Only ingest files with these extensions.
+        cache (ExtractionCache, optional): Extraction cache shared by all workers.
+
+    Yields:
+        IngestionResult: One result per input file.
+
+    Examples:
+    >>> for result in ingest_files("filings/**/*.pdf", ordered=True):
+    ...     if result.ok:
+    ...         index(result.path, result.text)
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 4 * workers
+    if max_in_flight <= 0:
+        raise ValueError("max_in_flight must be greater than zero")
+
+    paths = iter_input_files(source, extensions=extensions)
+    pool = _IngestPool(workers, cache)
+    try:
+        if ordered:
+            in_order = deque()
+            for file_path in paths:
+                in_order.append((file_path, pool.submit(file_path)))
+                if len(in_order) >= max_in_flight:
+                    yield pool.result(*in_order.popleft())
+            while in_order:
+                yield pool.result(*in_order.popleft())
+            return
+
+        in_flight = {}
+
+        def submit(count: int) -> None:
+            for file_path in islice(paths, count):
+                in_flight[pool.submit(file_path)] = file_path
+
+        submit(max_in_flight)
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pool.result(in_flight.pop(future), future)
+            submit(max_in_flight - len(in_flight))
+    finally:
+        pool.shutdown()
@@ -0,0 +1,360 @@
+import codecs
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, Tuple
+
+from agentparse.extractors import FileHandler
+
+
+def _extract_pdf_page_range(
+    file_path: str, start: int, stop: int
+) -> List[str]:
+    """Extract the text of pages [start, stop) in a worker process."""
+    from PyPDF2 import PdfReader
+
+    with open(file_path, "rb") as file:
+        pdf_reader = PdfReader(file)
+        return [
+            pdf_reader.pages[index].extract_text() or ""
+            for index in range(start, stop)
+        ]
+
+
+def iter_pdf_pages(
+    file_path: str,
+    workers: Optional[int] = None,
+    pages_per_task: int = 16,
+    max_in_flight: Optional[int] = None,
+) -> Iterator[Tuple[int, str]]:
+    """
+    Lazily extract text from a PDF, one page at a time.
+
+    By default pages are extracted in the calling process as they are
+    consumed. With workers > 1, ranges of pages_per_task pages are extracted
+    in a process pool and yielded back in page order; at most max_in_flight
+    ranges are outstanding at once.
+
+    Args:
+        file_path (str): Path to the PDF file.
+        workers (int, optional): Number of worker processes. None or 1 extracts serially.
+        pages_per_task (int): Pages extracted per worker task (default: 16).
+        max_in_flight (int, optional): Maximum outstanding tasks (default: 2 * workers).
+
+    Yields:
+        Tuple[int, str]: (page_number, text), with page numbers starting at 1.
+    """
+    if pages_per_task <= 0:
+        raise ValueError("pages_per_task must be greater than zero")
+
+    from PyPDF2 import PdfReader
+
+    with open(file_path, "rb") as file:
+        pdf_reader = PdfReader(file)
+        if not workers or workers <= 1:
+            for page_number, page in enumerate(pdf_reader.pages, 1):
+                yield page_number, page.extract_text() or ""
+            return
+        num_pages = len(pdf_reader.pages)
+
+    max_in_flight = max_in_flight or 2 * workers
+    ranges = (
+        (start, min(start + pages_per_task, num_pages))
+        for start in range(0, num_pages, pages_per_task)
+    )
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        in_flight = deque()
+        for start, stop in ranges:
+            in_flight.append((
+                start,
+                executor.submit(
+                    _extract_pdf_page_range, file_path, start, stop
+                ),
+            ))
+            if len(in_flight) < max_in_flight:
+                continue
+            yield from _drain_page_range(*in_flight.popleft())
+
+        while in_flight:
+            yield from _drain_page_range(*in_flight.popleft())
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _drain_page_range(start, future) -> Iterator[Tuple[int, str]]:
+    for offset, text in enumerate(future.result()):
+        yield start + offset + 1, text
+
+
+@contextmanager
+def _open_workbook(file_path: str):
+    import openpyxl
+
+    # Passing a file object skips openpyxl's extension check, so workbooks
+    # recognized by content (see extractors) load too
+    with open(file_path, "rb") as file:
+        wb = openpyxl.load_workbook(file, read_only=True)
+        try:
+            yield wb
+        finally:
+            wb.close()
+
+
+def _iter_sheet_row_batches(
+    worksheet: Any, batch_size: int
+) -> Iterator[List[Tuple[Any, ...]]]:
+    rows = worksheet.iter_rows(values_only=True)
+    if worksheet.max_column is None:
+        # Unsized sheets (e.g. from streaming writers) need one sizing pass
+        # so rows are padded to the sheet width like in full mode
+        width = max(
+            map(len, worksheet.iter_rows(values_only=True)), default=0
+        )
+        rows = (row + (None,) * (width - len(row)) for row in rows)
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_xlsx_rows(
+    file_path: str, batch_size: int = 1000
+) -> Iterator[Tuple[str, List[Tuple[Any, ...]]]]:
+    """
+    Stream the rows of every sheet in a workbook in batches.
+
+    The workbook is opened in openpyxl's read-only mode, so rows are parsed
+    as they are consumed and memory stays roughly constant as the row count
+    grows.
+
+    Args:
+        file_path (str): Path to the .xlsx file.
+        batch_size (int): Maximum rows per batch (default: 1000).
+
+    Yields:
+        Tuple[str, List[Tuple[Any, ...]]]: (sheet_name, rows) with each row as a tuple of cell values.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be greater than zero")
+
+    with _open_workbook(file_path) as wb:
+        for sheet in wb.sheetnames:
+            for batch in _iter_sheet_row_batches(
+                wb[sheet], batch_size
+            ):
+                yield sheet, batch
+
+
+def iter_xlsx_text(
+    file_path: str, batch_size: int = 1000
+) -> Iterator[str]:
+    """
+    Stream a workbook as text blocks in the file_to_string format.
+
+    Each sheet starts with a "Sheet: <name>" line followed by one
+    comma-separated line per row.
+
+    Args:
+        file_path (str): Path to the .xlsx file.
+        batch_size (int): Maximum rows per yielded block (default: 1000).
+
+    Yields:
+        str: Text blocks that concatenate to the full workbook text.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be greater than zero")
+
+    with _open_workbook(file_path) as wb:
+        for sheet in wb.sheetnames:
+            yield f"Sheet: {sheet}\n"
+            for batch in _iter_sheet_row_batches(
+                wb[sheet], batch_size
+            ):
+                yield "".join(
+                    ",".join(map(str, row)) + "\n" for row in batch
+                )
+
+
+def _iter_buffered_blocks(
+    file_path: str, block_size: int
+) -> Iterator[str]:
+    with open(file_path, "r", encoding="utf-8") as file:
+        carry = ""
+        while True:
+            data = file.read(block_size)
+            if not data:
+                break
+            if carry:
+                data = carry + data
+            cut = data.rfind("\n") + 1 or len(data)
+            carry = data[cut:]
+            yield data[:cut]
+        if carry:
+            yield carry
+
+
+def _iter_mmap_blocks(
+    file_path: str, block_size: int
+) -> Iterator[str]:
+    with open(file_path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        with mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            start = 0
+            carry = ""
+            while start < size:
+                end = min(start + block_size, size)
+                cut = mapped.rfind(b"\n", start, end) + 1
+                if cut == 0 or end == size:
+                    cut = end
+                text = carry + decoder.decode(
+                    mapped[start:cut], cut == size
+                )
+                start = cut
+                carry = ""
+                if text.endswith("\r") and cut < size:
+                    # Keep a CRLF pair together across blocks
+                    text, carry = text[:-1], "\r"
+                if "\r" in text:
+                    text = text.replace("\r\n", "\n").replace(
+                        "\r", "\n"
+                    )
+                if text:
+                    yield text
+
+
+def iter_text_blocks(
+    file_path: str,
+    block_size: int = 1 << 20,
+    use_mmap: bool = False,
+) -> Iterator[str]:
+    """
+    Stream a UTF-8 text file (.txt, .csv, .json, ...) in newline-aligned blocks.
+
+    Blocks end just after a newline whenever the block contains one, so
+    lines are never split; a single line longer than block_size is split
+    between characters. Decoding is incremental, so a multi-byte UTF-8
+    sequence is never cut, and newlines are normalized to "\n" exactly as
+    file_to_string reads them. Concatenating the blocks gives the
+    file_to_string output, and the iterator can be passed straight to
+    iter_text_chunks to chunk a file without loading it whole.
+
+    Args:
+        file_path (str): Path to the file.
+        block_size (int): Approximate block size (characters when buffered,
+            bytes when memory-mapped) (default: 1 MiB).
+        use_mmap (bool): Read through a read-only memory map instead of a
+            buffered file (default: False).
+
+    Yields:
+        str: Consecutive blocks of the file's text.
+    """
+    if block_size <= 0:
+        raise ValueError("block_size must be greater than zero")
+
+    if use_mmap:
+        return _iter_mmap_blocks(file_path, block_size)
+    return _iter_buffered_blocks(file_path, block_size)
+
+
+def iter_docx_paragraphs(file_path: str) -> Iterator[str]:
+    """
+    Stream the paragraphs of a .docx document as plain text.
+
+    The document XML is parsed incrementally with the standard library, so no
+    extra dependency is needed and memory stays flat for long documents.
+    Tabs and line breaks inside a paragraph are kept.
+
+    Args:
+        file_path (str): Path to the .docx file.
+
+    Yields:
+        str: The text of each paragraph, in document order.
+    """
+    import zipfile
+    from xml.etree.ElementTree import iterparse
+
+    namespace = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+    paragraph_tag = f"{namespace}p"
+    text_tag = f"{namespace}t"
+    tab_tag = f"{namespace}tab"
+    break_tags = (f"{namespace}br", f"{namespace}cr")
+
+    with zipfile.ZipFile(file_path) as archive:
+        with archive.open("word/document.xml") as document:
+            parts = []
+            depth = 0
+            for event, element in iterparse(
+                document, events=("start", "end")
+            ):
+                tag = element.tag
+                if event == "start":
+                    if tag == paragraph_tag:
+                        depth += 1
+                    continue
+                if tag == text_tag:
+                    parts.append(element.text or "")
+                elif tag == tab_tag:
+                    parts.append("\t")
+                elif tag in break_tags:
+                    parts.append("\n")
+                elif tag == paragraph_tag:
+                    depth -= 1
+                    if depth == 0:
+                        yield "".join(parts)
+                        parts = []
+                        element.clear()
+
+
+class TextHandler(FileHandler):
+    """Plain UTF-8 text formats: .txt, .csv, .json."""
+
+    def extract(self, file_path: str, **options) -> str:
+        with open(file_path, "r", encoding="utf-8") as file:
+            return file.read()
+
+    def stream(self, file_path: str, **options) -> Iterator[str]:
+        return iter_text_blocks(
+            file_path,
+            options.get("block_size", 1 << 20),
+            use_mmap=options.get("use_mmap", False),
+        )
+
+
+class PdfHandler(FileHandler):
+    """PDF documents, one page per block, with optional parallel extraction."""
+
+    def stream(self, file_path: str, **options) -> Iterator[str]:
+        for _, text in iter_pdf_pages(
+            file_path, workers=options.get("workers")
+        ):
+            yield f"{text}\n"
+
+
+class XlsxHandler(FileHandler):
+    """Excel workbooks, streamed in read-only mode."""
+
+    def stream(self, file_path: str, **options) -> Iterator[str]:
+        return iter_xlsx_text(
+            file_path, batch_size=options.get("batch_size", 1000)
+        )
+
+
+class DocxHandler(FileHandler):
+    """Word documents, one paragraph per line."""
+
+    def stream(self, file_path: str, **options) -> Iterator[str]:
+        for paragraph in iter_docx_paragraphs(file_path):
+            yield f"{paragraph}\n"
@@ -1,6 +1,8 @@
 import inspect
+import threading
 from typing import (
     Callable,
+    Optional,
     Type,
     Any,
     get_type_hints,
@@ -9,10 +11,18 @@ from typing import (
     Dict,
     Tuple,
 )
-from types import NoneType
+from types import FunctionType, MethodType, NoneType
+from weakref import WeakKeyDictionary
 from pydantic import BaseModel, create_model, Field
 from loguru import logger
 
+DEFAULT_MODEL_NAME = "FunctionParamsModel"
+
+# function -> {(model_name, bound method?): (fingerprint, model)}; entries
+# go away when the function is garbage-collected
+_model_cache: WeakKeyDictionary = WeakKeyDictionary()
+_model_cache_lock = threading.Lock()
+
 
 # Utility functions to handle complex types
 def get_origin(tp):
@@ -23,8 +33,31 @@ def get_args(tp):
     return getattr(tp, "__args__", ())
 
 
+def _fingerprint(func: FunctionType) -> Tuple[Any, ...]:
+    # Rebinding any of these changes the signature or the type hints
+    return (
+        func.__code__,
+        func.__defaults__,
+        func.__kwdefaults__,
+        func.__annotations__,
+    )
+
+
+def _same_fingerprint(
+    cached: Tuple[Any, ...], current: Tuple[Any, ...]
+) -> bool:
+    return all(a is b for a, b in zip(cached, current))
+
+
+def clear_function_model_cache() -> None:
+    """Forget every model memoized by function_to_pydantic_schema."""
+    with _model_cache_lock:
+        _model_cache.clear()
+
+
 def function_to_pydantic_schema(
-    func: Callable[..., Any], model_name: str = "FunctionParamsModel"
+    func: Callable[..., Any],
+    model_name: Optional[str] = DEFAULT_MODEL_NAME,
 ) -> Type[BaseModel]:
     """
     Create a production-grade Pydantic BaseModel schema from a function's parameters.
@@ -33,9 +66,14 @@ def function_to_pydantic_schema(
     to create a corresponding Pydantic BaseModel schema. It handles complex types,
     including Optional, Union, List, Dict, and Tuple.
 
+    Models are memoized per function (or bound method's function) and model name,
+    so converting a function again returns the same class almost for free. An entry
+    is rebuilt if the function's code, defaults or annotations are rebound, and is
+    dropped when the function is garbage-collected. Other callables are not cached.
+
     Args:
         func (Callable[..., Any]): The function to create a schema for.
-        model_name (str, optional): The name for the created model. Defaults to "FunctionParamsModel".
+        model_name (str, optional): The name for the created model. Defaults to "FunctionParamsModel", as does None.
 
     Returns:
         Type[BaseModel]: A new Pydantic BaseModel subclass with fields based on the function's parameters.
@@ -49,8 +87,39 @@ def function_to_pydantic_schema(
         >>> ParamsModel = function_to_pydantic_schema(example_function)
         >>> print(ParamsModel.schema_json(indent=2))
     """
-    logger.info(
-        f"Creating Pydantic schema '{model_name}' from function '{func.__name__}'"
+    model_name = model_name or DEFAULT_MODEL_NAME
+    if isinstance(func, MethodType):
+        target, key = func.__func__, (model_name, True)
+    elif isinstance(func, FunctionType):
+        target, key = func, (model_name, False)
+    else:
+        return _create_model_from_signature(func, model_name)
+
+    fingerprint = _fingerprint(target)
+    with _model_cache_lock:
+        entry = _model_cache.get(target, {}).get(key)
+    if entry is not None and _same_fingerprint(entry[0], fingerprint):
+        return entry[1]
+
+    model = _create_model_from_signature(func, model_name)
+    with _model_cache_lock:
+        models = _model_cache.setdefault(target, {})
+        entry = models.get(key)
+        # A concurrent caller may have built it first; keep one model
+        if entry is not None and _same_fingerprint(
+            entry[0], fingerprint
+        ):
+            return entry[1]
+        models[key] = (fingerprint, model)
+    return model
+
+
+def _create_model_from_signature(
+    func: Callable[..., Any], model_name: str
+) -> Type[BaseModel]:
+    logger.debug(
+        f"Creating Pydantic schema '{model_name}' from function"
+        f" '{func.__name__}'"
     )
 
     signature = inspect.signature(func)
@@ -91,7 +160,8 @@ def function_to_pydantic_schema(
         # Handle Union types
         if get_origin(field_type) is Union:
             field_info["description"] = (
-                f"Union of {', '.join([arg.__name__ for arg in get_args(field_type)])}"
+                "Union of"
+                f" {', '.join([arg.__name__ for arg in get_args(field_type)])}"
             )
 
         # Handle List, Dict, and Tuple types
@@ -118,17 +188,11 @@ def function_to_pydantic_schema(
                 + f" (default: {default})"
             )
 
-        logger.debug(
-            f"Field '{name}' of type {field_type} with default {default}"
-        )
         field_definitions[name] = (
             field_type,
             Field(default=default, **field_info),
         )
 
-    logger.success(
-        f"Successfully created schema '{model_name}' with {len(field_definitions)} fields"
-    )
     return create_model(model_name, **field_definitions)
 
 
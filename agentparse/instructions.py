@@ -0,0 +1,290 @@
+import json
+import threading
+from collections import Counter
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Type,
+)
+from weakref import WeakKeyDictionary
+
+from pydantic import BaseModel
+
+# Output formats and rendering styles of the instructions
+FORMATS = ("json", "yaml")
+STYLES = ("full", "compact", "minimal")
+
+# Keywords whose value maps names to subschemas, holds a list of
+# subschemas, or is a subschema; every other keyword is kept verbatim
+_SCHEMA_MAPS = frozenset(
+    ["properties", "patternProperties", "dependentSchemas"]
+)
+_SCHEMA_LISTS = frozenset(["allOf", "anyOf", "oneOf", "prefixItems"])
+_SCHEMA_VALUES = frozenset([
+    "items",
+    "additionalItems",
+    "additionalProperties",
+    "unevaluatedItems",
+    "unevaluatedProperties",
+    "propertyNames",
+    "contains",
+    "not",
+    "if",
+    "then",
+    "else",
+])
+
+_HEADERS = {
+    "json": "JSON Formatting Instructions:",
+    "yaml": "YAML Formatting Instructions:",
+}
+
+# model class -> {(format, style): instructions}; entries
+# go away when the model class is garbage-collected
+_instructions_cache: WeakKeyDictionary = WeakKeyDictionary()
+_instructions_cache_lock = threading.Lock()
+
+
+def _check(format: str, style: str) -> None:
+    if format not in FORMATS:
+        raise ValueError(
+            f"format must be one of {FORMATS}, got {format!r}"
+        )
+    if style not in STYLES:
+        raise ValueError(
+            f"style must be one of {STYLES}, got {style!r}"
+        )
+
+
+def _model_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    if hasattr(model, "model_json_schema"):
+        return model.model_json_schema()
+    return model.schema()
+
+
+def _iter_refs(schema: Any) -> Iterator[str]:
+    """Yield every $ref in schema, skipping its definitions."""
+    if isinstance(schema, list):
+        for item in schema:
+            yield from _iter_refs(item)
+        return
+    if not isinstance(schema, dict):
+        return
+    ref = schema.get("$ref")
+    if isinstance(ref, str):
+        yield ref
+    for key, value in schema.items():
+        if key in _SCHEMA_MAPS and isinstance(value, dict):
+            for subschema in value.values():
+                yield from _iter_refs(subschema)
+        elif key in _SCHEMA_LISTS or key in _SCHEMA_VALUES:
+            yield from _iter_refs(value)
+
+
+def _compact_schema(
+    schema: Dict[str, Any], drop_descriptions: bool
+) -> Dict[str, Any]:
+    """
+    Shrink a JSON schema without changing what it accepts.
+
+    Titles (and descriptions, if asked) are dropped. A definition used by
+    exactly one $ref is inlined there; shared and recursive definitions stay
+    in $defs, so nothing is repeated.
+    """
+    defs_key = "definitions" if "definitions" in schema else "$defs"
+    prefix = f"#/{defs_key}/"
+    definitions = schema.get(defs_key, {})
+    counts = Counter(_iter_refs(schema))
+    for body in definitions.values():
+        counts.update(_iter_refs(body))
+    inline = {
+        prefix + name: body
+        for name, body in definitions.items()
+        if counts[prefix + name] == 1
+    }
+
+    def compact(node: Any, expanding: FrozenSet[str]) -> Any:
+        if isinstance(node, list):
+            return [compact(item, expanding) for item in node]
+        if not isinstance(node, dict):
+            return node
+        ref = node.get("$ref")
+        # A reference cycle is left as a $ref and its definition kept
+        while ref in inline and ref not in expanding:
+            expanding = expanding | {ref}
+            siblings = {k: v for k, v in node.items() if k != "$ref"}
+            node = {**inline[ref], **siblings}
+            ref = node.get("$ref")
+        result = {}
+        for key, value in node.items():
+            if key == "title" or (
+                key == "description" and drop_descriptions
+            ):
+                continue
+            if key == defs_key:
+                continue
+            if key in _SCHEMA_MAPS and isinstance(value, dict):
+                result[key] = {
+                    name: compact(subschema, expanding)
+                    for name, subschema in value.items()
+                }
+            elif key in _SCHEMA_LISTS or key in _SCHEMA_VALUES:
+                result[key] = compact(value, expanding)
+            else:
+                result[key] = value
+        return result
+
+    root = compact(schema, frozenset())
+    # Keep only the definitions something still refers to
+    kept: Dict[str, Any] = {}
+    pending = list(_iter_refs(root))
+    while pending:
+        ref = pending.pop()
+        name = ref[len(prefix) :] if ref.startswith(prefix) else None
+        if name in definitions and name not in kept:
+            kept[name] = compact(definitions[name], frozenset([ref]))
+            pending.extend(_iter_refs(kept[name]))
+    if kept:
+        ordered = {
+            name: kept[name] for name in definitions if name in kept
+        }
+        root = {defs_key: ordered, **root}
+    return root
+
+
+def _render(model: Type[BaseModel], format: str, style: str) -> str:
+    schema = _model_schema(model)
+    if style == "full":
+        reduced_schema = {
+            k: v
+            for k, v in schema.items()
+            if k not in ["title", "type"]
+        }
+        schema_str = json.dumps(reduced_schema, indent=4)
+    else:
+        reduced_schema = _compact_schema(
+            schema, drop_descriptions=style == "minimal"
+        )
+        reduced_schema.pop("type", None)
+        schema_str = json.dumps(
+            reduced_schema, separators=(",", ":"), ensure_ascii=False
+        )
+    return f"{_HEADERS[format]}\n{schema_str}"
+
+
+def format_instructions(
+    model: Type[BaseModel], format: str = "json", style: str = "full"
+) -> str:
+    """
+    Return the formatting instructions for a Pydantic model.
+
+    Instructions are rendered once per (model, format, style) and served
+    from a process-wide cache afterwards. Entries are dropped when the
+    model class is garbage-collected; call clear_format_instructions_cache
+    after changing a model in place (e.g. model_rebuild(force=True)).
+
+    Args:
+        model (Type[BaseModel]): The model the output must follow.
+        format (str): "json" or "yaml".
+        style (str): How the schema is rendered. "full" is the whole JSON
+            schema minus its title and type, indented. "compact" minifies it,
+            drops titles and inlines definitions used only once. "minimal"
+            also drops descriptions.
+
+    Returns:
+        str: The instructions to inject into a prompt.
+
+    Raises:
+        ValueError: If format or style is unknown.
+    """
+    key = (format, style)
+    entries = _instructions_cache.get(model)
+    if entries is not None:
+        cached = entries.get(key)
+        if cached is not None:
+            return cached
+
+    _check(format, style)
+    instructions = _render(model, format, style)
+    with _instructions_cache_lock:
+        entries = _instructions_cache.setdefault(model, {})
+        # Keep the first rendering if another thread won the race
+        return entries.setdefault(key, instructions)
+
+
+def prewarm_format_instructions(
+    models: Iterable[Type[BaseModel]],
+    formats: Iterable[str] = FORMATS,
+    styles: Iterable[str] = STYLES,
+) -> int:
+    """
+    Render and cache the instructions for every model, format and style.
+
+    Call it at worker startup (or pass it as a pool initializer) so the
+    first prompts do not pay for schema generation.
+
+    Args:
+        models (Iterable[Type[BaseModel]]): Models to prepare.
+        formats (Iterable[str]): Formats to prepare (default: all).
+        styles (Iterable[str]): Styles to prepare (default: all).
+
+    Returns:
+        int: The number of (model, format, style) entries prepared.
+    """
+    combinations: Tuple[Tuple[str, str], ...] = tuple(
+        (format, style) for format in formats for style in styles
+    )
+    for format, style in combinations:
+        _check(format, style)
+    count = 0
+    for model in models:
+        for format, style in combinations:
+            format_instructions(model, format, style)
+            count += 1
+    return count
+
+
+def format_instruction_tokens(
+    model: Type[BaseModel],
+    format: str = "json",
+    styles: Iterable[str] = STYLES,
+    encoding_name: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Count the prompt tokens of the instructions in each style.
+
+    Args:
+        model (Type[BaseModel]): The model the output must follow.
+        format (str): "json" or "yaml".
+        styles (Iterable[str]): Styles to measure (default: all).
+        encoding_name (str, optional): The tiktoken encoding to count with
+            (default: the project tokenizer's).
+
+    Returns:
+        Dict[str, int]: Maps each style to its token count.
+    """
+    from agentparse.tokenizer import DEFAULT_ENCODING, count_tokens
+
+    return {
+        style: count_tokens(
+            format_instructions(model, format, style),
+            encoding_name or DEFAULT_ENCODING,
+        )
+        for style in styles
+    }
+
+
+def clear_format_instructions_cache(
+    model: Optional[Type[BaseModel]] = None,
+) -> None:
+    """Forget the cached instructions of model, or of every model."""
+    with _instructions_cache_lock:
+        if model is None:
+            _instructions_cache.clear()
+        else:
+            _instructions_cache.pop(model, None)
@@ -0,0 +1,146 @@
+import json
+import os
+import threading
+from typing import Any, Callable, List, Optional, Union
+
+# Preference order when choosing a backend automatically
+JSON_BACKENDS = ("orjson", "msgspec", "pydantic_core", "json")
+
+Loader = Callable[[Union[str, bytes]], Any]
+
+# Maps every digit to b"0" and every other byte to b" "
+_DIGIT_MASK = bytes(
+    0x30 if 0x30 <= c <= 0x39 else 0x20 for c in range(256)
+)
+# The shortest digit run that can fall outside the 64-bit range: negative
+# integers overflow from 19 digits (below -9223372036854775808)
+_BIG_INTEGER_RUN = b"0" * 19
+
+
+def _load_orjson() -> Loader:
+    import orjson
+
+    return orjson.loads
+
+
+def _load_msgspec() -> Loader:
+    import msgspec
+
+    return msgspec.json.decode
+
+
+def _load_pydantic_core() -> Loader:
+    from pydantic_core import from_json
+
+    return from_json
+
+
+_FACTORIES = {
+    "orjson": _load_orjson,
+    "msgspec": _load_msgspec,
+    "pydantic_core": _load_pydantic_core,
+    "json": lambda: json.loads,
+}
+# Backends that decode integers wider than 64 bits as floats
+_INT64_BACKENDS = frozenset(["orjson", "msgspec"])
+
+_lock = threading.Lock()
+_backend: Optional[str] = None
+_loads: Optional[Loader] = None
+
+
+def available_json_backends() -> List[str]:
+    """Return the installed JSON backends in preference order."""
+    available = []
+    for name in JSON_BACKENDS:
+        try:
+            _FACTORIES[name]()
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+
+def set_json_backend(name: Optional[str] = None) -> str:
+    """
+    Choose the JSON decoder used by agentparse.
+
+    Args:
+        name (str, optional): One of JSON_BACKENDS. Defaults to
+            $AGENTPARSE_JSON_BACKEND, or else the first installed backend.
+
+    Returns:
+        str: The backend now in use.
+
+    Raises:
+        ValueError: If the backend is unknown.
+        ImportError: If the backend is not installed.
+    """
+    global _backend, _loads
+
+    name = name or os.environ.get("AGENTPARSE_JSON_BACKEND")
+    if name is not None and name not in _FACTORIES:
+        raise ValueError(
+            f"Unknown JSON backend {name!r}; expected one of"
+            f" {', '.join(JSON_BACKENDS)}"
+        )
+
+    with _lock:
+        if name is not None:
+            loads = _FACTORIES[name]()
+        else:
+            for name in JSON_BACKENDS:
+                try:
+                    loads = _FACTORIES[name]()
+                except ImportError:
+                    continue
+                break
+        _backend, _loads = name, loads
+    return name
+
+
+def get_json_backend() -> str:
+    """Return the name of the JSON backend in use, choosing one if needed."""
+    if _backend is None:
+        set_json_backend()
+    return _backend
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Decode JSON with the fastest installed backend.
+
+    Results and errors match json.loads exactly: input a fast backend
+    rejects (NaN, lone surrogates, non-UTF-8 bytes, ...) is decoded again
+    by json.loads, which returns its value or raises its JSONDecodeError,
+    and input that may hold integers wider than 64 bits skips backends
+    that would turn them into floats.
+
+    Args:
+        data (Union[str, bytes]): The JSON document.
+
+    Returns:
+        Any: The decoded value.
+
+    Raises:
+        json.JSONDecodeError: If data is not valid JSON.
+    """
+    if _loads is None:
+        set_json_backend()
+    backend, fast_loads = _backend, _loads
+    if backend == "json":
+        return json.loads(data)
+    if backend in _INT64_BACKENDS and _may_hold_big_integer(data):
+        return json.loads(data)
+
+    try:
+        return fast_loads(data)
+    except Exception:
+        # Let json.loads decide, so callers see its value or error
+        return json.loads(data)
+
+
+def _may_hold_big_integer(data: Union[str, bytes]) -> bool:
+    if isinstance(data, str):
+        data = data.encode("utf-8", "surrogatepass")
+    return _BIG_INTEGER_RUN in data.translate(_DIGIT_MASK)
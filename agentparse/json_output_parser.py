@@ -1,11 +1,118 @@
 import json
 import re
-from typing import Type, TypeVar
+import threading
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+from weakref import WeakKeyDictionary
 
 from pydantic import BaseModel, ValidationError
 
+from agentparse import json_backend
+from agentparse.block_scanner import (
+    iter_candidate_spans,
+    iter_candidates,
+)
+from agentparse.instructions import format_instructions
+from agentparse.metrics import CHARS_TOTAL, FAILURES_TOTAL, METRICS
+from agentparse.parse_result import (
+    DEFAULT_MAX_MESSAGE_CHARS,
+    DEFAULT_SNIPPET_CHARS,
+    ParseError,
+    ParseResult,
+    decode_error,
+    exception_error,
+    validation_error,
+)
+
+if TYPE_CHECKING:
+    from agentparse.json_stream_parser import JsonStreamParser
+
 T = TypeVar("T", bound=BaseModel)
 
+_UNRESOLVED = object()
+
+# model class -> whether its compiled JSON validator may be used; only a
+# flag is kept, so entries go away when the model is garbage-collected
+_json_validation_allowed: WeakKeyDictionary = WeakKeyDictionary()
+_json_validation_allowed_lock = threading.Lock()
+
+# Fence info strings treated as JSON
+JSON_LANGUAGES = frozenset(["", "json"])
+_FIRST_NON_SPACE = re.compile(r"\s*(\S)")
+_CLOSING_BRACKET = {"{": "}", "[": "]"}
+
+
+def _is_bare_json(text: str) -> bool:
+    """Return True if text, ignoring surrounding whitespace, is bracketed like a JSON object or array.
+
+    Valid JSON text holds no fence lines (strings cannot span lines), so
+    if it parses whole it is also the only block the scanner would find.
+    """
+    match = _FIRST_NON_SPACE.match(text)
+    if match is None or match.group(1) not in _CLOSING_BRACKET:
+        return False
+    end = len(text)
+    while text[end - 1].isspace():
+        end -= 1
+    return text[end - 1] == _CLOSING_BRACKET[match.group(1)]
+
+
+def _uses_strict(core_schema: Any) -> bool:
+    """Return True if any part of a core schema validates strictly."""
+    if isinstance(core_schema, dict):
+        return core_schema.get("strict") is True or any(
+            _uses_strict(value) for value in core_schema.values()
+        )
+    if isinstance(core_schema, (list, tuple)):
+        return any(_uses_strict(item) for item in core_schema)
+    return False
+
+
+def _allows_json_validation(model: Type[BaseModel]) -> bool:
+    """Return False if the model validates strictly anywhere.
+
+    The core schema is walked once per model class; later parsers of the
+    same model reuse the answer.
+    """
+    allowed = _json_validation_allowed.get(model)
+    if allowed is None:
+        allowed = not _uses_strict(
+            getattr(model, "__pydantic_core_schema__", None)
+        )
+        with _json_validation_allowed_lock:
+            _json_validation_allowed[model] = allowed
+    return allowed
+
+
+def _failure_stage(error: Optional[Exception]) -> str:
+    # Invalid JSON surfaces as JSONDecodeError from the stdlib retry
+    if isinstance(error, json.JSONDecodeError):
+        return "json.decode"
+    return "json.validate"
+
+
+def _record_parse(started: float, text: str) -> None:
+    METRICS.stage_time("json.parse", started)
+    METRICS.inc(CHARS_TOTAL, len(text), stage="json.parse")
+
+
+def _counted(result: ParseResult) -> ParseResult:
+    if result.error is not None and METRICS.enabled:
+        METRICS.inc(
+            FAILURES_TOTAL, stage=f"json.{result.error.stage}"
+        )
+    return result
+
 
 class JsonParsingException(Exception):
     """Custom exception for errors in JSON parsing."""
@@ -19,7 +126,8 @@ class JsonOutputParser:
 
     Attributes:
         pydantic_object: A Pydantic model class for parsing and validation.
-        pattern: A regex pattern to match JSON code blocks.
+        pattern: The legacy regex for JSON code blocks; parsing now uses
+            agentparse.block_scanner.
 
     Examples:
     >>> from pydantic import BaseModel
@@ -40,10 +148,14 @@ class JsonOutputParser:
         self.pattern = re.compile(
             r"^```(?:json)?(?P<json>[^`]*)", re.MULTILINE | re.DOTALL
         )
+        self._validate_json: Any = _UNRESOLVED
 
     def parse(self, text: str) -> T:
         """Parse the provided text to extract and validate JSON data.
 
+        Fenced ```json blocks and bare {...}/[...] spans are tried in the
+        order they appear, and the first one that validates is returned.
+
         Args:
             text: A string containing potential JSON data.
 
@@ -51,41 +163,248 @@ class JsonOutputParser:
             An instance of the specified Pydantic model with parsed data.
 
         Raises:
-            JsonParsingException: If parsing or validation fails.
+            JsonParsingException: If no block parses and validates. The
+                error reported is the first block's.
         """
+        started = METRICS.enabled and perf_counter()
         try:
-            match = re.search(self.pattern, text.strip())
-            json_str = match.group("json") if match else text
+            if _is_bare_json(text):
+                # The common case: the whole response is the JSON document
+                try:
+                    return self._parse_block(text)
+                except (json.JSONDecodeError, ValidationError):
+                    pass
 
-            json_object = json.loads(json_str)
-            return self.pydantic_object.parse_obj(json_object)
+            first_error = None
+            candidates = iter_candidates(text, JSON_LANGUAGES)
+            if METRICS.enabled:
+                candidates = METRICS.timed_iter(
+                    "json.extract", candidates
+                )
+            for json_str in candidates:
+                try:
+                    return self._parse_block(json_str)
+                except (json.JSONDecodeError, ValidationError) as e:
+                    if first_error is None:
+                        first_error = e
 
-        except (json.JSONDecodeError, ValidationError) as e:
+            if METRICS.enabled:
+                METRICS.inc(
+                    FAILURES_TOTAL, stage=_failure_stage(first_error)
+                )
             name = self.pydantic_object.__name__
             msg = (
                 f"Failed to parse {name} from text '{text}'."
-                f" Error: {e}"
+                f" Error: {first_error}"
             )
-            raise JsonParsingException(msg) from e
+            raise JsonParsingException(msg) from first_error
+        finally:
+            if started:
+                _record_parse(started, text)
+
+    def parse_all(self, text: str) -> List[T]:
+        """Parse every JSON block in the text that validates against the model.
+
+        Args:
+            text: A string containing any number of JSON blocks.
+
+        Returns:
+            Model instances for the valid blocks, in document order.
+            Blocks that fail to parse or validate are skipped.
+        """
+        if _is_bare_json(text):
+            try:
+                return [self._parse_block(text)]
+            except (json.JSONDecodeError, ValidationError):
+                pass
+
+        models = []
+        for json_str in iter_candidates(text, JSON_LANGUAGES):
+            try:
+                models.append(self._parse_block(json_str))
+            except (json.JSONDecodeError, ValidationError):
+                continue
+        return models
+
+    def parse_result(
+        self,
+        text: str,
+        max_message_chars: int = DEFAULT_MAX_MESSAGE_CHARS,
+        snippet_chars: int = DEFAULT_SNIPPET_CHARS,
+    ) -> ParseResult[T]:
+        """Parse like parse(), but return a ParseResult instead of raising.
+
+        Failures are described by a compact ParseError (stage, location,
+        truncated message and snippet) instead of an exception message
+        that embeds the whole input. Decode errors carry the same
+        json.JSONDecodeError message that parse() raises.
 
-    def get_format_instructions(self) -> str:
+        Args:
+            text: A string containing potential JSON data.
+            max_message_chars: Maximum length of the error message.
+            snippet_chars: Maximum length of the error's input excerpt.
+
+        Returns:
+            A ParseResult holding the model instance or the first block's error.
+        """
+        limits = (max_message_chars, snippet_chars)
+        started = METRICS.enabled and perf_counter()
+        try:
+            if _is_bare_json(text):
+                value, error = self._try_block(
+                    text, 0, len(text), limits
+                )
+                # Valid JSON is the only block, so a validation error is final
+                if error is None or error.stage == "validate":
+                    return _counted(
+                        ParseResult(value=value, error=error)
+                    )
+
+            first_error = None
+            spans = iter_candidate_spans(text, JSON_LANGUAGES)
+            if METRICS.enabled:
+                spans = METRICS.timed_iter("json.extract", spans)
+            for start, end in spans:
+                value, error = self._try_block(
+                    text, start, end, limits
+                )
+                if error is None:
+                    return ParseResult(value=value)
+                if first_error is None:
+                    first_error = error
+            return _counted(ParseResult(error=first_error))
+        finally:
+            if started:
+                _record_parse(started, text)
+
+    def parse_many(
+        self,
+        texts: Iterable[str],
+        max_message_chars: int = DEFAULT_MAX_MESSAGE_CHARS,
+        snippet_chars: int = DEFAULT_SNIPPET_CHARS,
+    ) -> List[ParseResult[T]]:
+        """Parse a batch of texts without raising.
+
+        Args:
+            texts: The texts to parse.
+            max_message_chars: Maximum length of each error message.
+            snippet_chars: Maximum length of each error's input excerpt.
+
+        Returns:
+            One ParseResult per text, in order.
+        """
+        return [
+            self.parse_result(text, max_message_chars, snippet_chars)
+            for text in texts
+        ]
+
+    def _try_block(
+        self, text: str, start: int, end: int, limits: Tuple[int, int]
+    ) -> Tuple[Optional[T], Optional[ParseError]]:
+        started = METRICS.enabled and perf_counter()
+        try:
+            json_str = text[start:end]
+            try:
+                validate_json = self._json_validator()
+                if validate_json is not None:
+                    try:
+                        return validate_json(json_str), None
+                    except ValidationError as e:
+                        errors = e.errors(include_url=False)
+                        # Syntax errors are re-decoded below so their
+                        # message matches the one parse() raises
+                        if errors[0]["type"] != "json_invalid":
+                            return None, validation_error(
+                                errors, *limits
+                            )
+
+                try:
+                    json_object = json_backend.loads(json_str)
+                except json.JSONDecodeError as e:
+                    return None, decode_error(
+                        text,
+                        "JSONDecodeError",
+                        e.msg,
+                        start + e.pos,
+                        *limits,
+                    )
+                return self._validate_python(json_object), None
+            except Exception as e:
+                return None, exception_error(e, *limits)
+        finally:
+            if started:
+                METRICS.stage_time("json.decode_validate", started)
+
+    def _parse_block(self, json_str: str) -> T:
+        started = METRICS.enabled and perf_counter()
+        try:
+            validate_json = self._json_validator()
+            if validate_json is not None:
+                try:
+                    return validate_json(json_str)
+                except ValidationError:
+                    # Fall through so failures raise exactly as before
+                    pass
+
+            json_object = json_backend.loads(json_str)
+            return self._validate_python(json_object)
+        finally:
+            if started:
+                METRICS.stage_time("json.decode_validate", started)
+
+    def _json_validator(self) -> Optional[Callable[[str], Any]]:
+        """Return the model's compiled JSON validator, resolved once.
+
+        Pydantic v2 models validate a JSON string in a single pass without
+        building an intermediate dict. Models without one (pydantic.v1)
+        return None and always take the json.loads path, as do models with
+        strict validation anywhere: in JSON mode strict validation accepts
+        input (ISO date strings, enum values) that it rejects in Python mode.
+        """
+        if self._validate_json is _UNRESOLVED:
+            validator = getattr(
+                self.pydantic_object, "__pydantic_validator__", None
+            )
+            # Accessing validate_json also completes deferred models
+            validate_json = getattr(validator, "validate_json", None)
+            if (
+                validate_json is not None
+                and not _allows_json_validation(self.pydantic_object)
+            ):
+                validate_json = None
+            self._validate_json = validate_json
+        return self._validate_json
+
+    def _validate_python(self, json_object: Any) -> T:
+        if hasattr(self.pydantic_object, "model_validate"):
+            return self.pydantic_object.model_validate(json_object)
+        return self.pydantic_object.parse_obj(json_object)
+
+    def stream(self) -> "JsonStreamParser[T]":
+        """Return an incremental parser for streamed output of this model.
+
+        Returns:
+            A JsonStreamParser fed with text chunks as they arrive.
+        """
+        from agentparse.json_stream_parser import JsonStreamParser
+
+        return JsonStreamParser(self.pydantic_object)
+
+    def get_format_instructions(self, style: str = "full") -> str:
         """Generate formatting instructions based on the Pydantic model schema.
 
+        The instructions are rendered once per model and style and then
+        served from the cache in agentparse.instructions.
+
+        Args:
+            style: How the schema is rendered (see format_instructions).
+
         Returns:
             A string containing formatting instructions.
         """
-        schema = self.pydantic_object.schema()
-        reduced_schema = {
-            k: v
-            for k, v in schema.items()
-            if k not in ["title", "type"]
-        }
-        schema_str = json.dumps(reduced_schema, indent=4)
-
-        format_instructions = (
-            f"JSON Formatting Instructions:\n{schema_str}"
+        return format_instructions(
+            self.pydantic_object, "json", style
         )
-        return format_instructions
 
 
 # # Example usage
@@ -0,0 +1,515 @@
+import copy
+import json
+import re
+import threading
+from typing import (
+    Annotated,
+    Any,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+)
+from weakref import WeakKeyDictionary
+
+from pydantic import (
+    BaseModel,
+    PydanticUserError,
+    TypeAdapter,
+    ValidationError,
+)
+
+from agentparse.json_output_parser import JsonParsingException
+
+T = TypeVar("T", bound=BaseModel)
+
+# model class -> (field checks, forbid unknown keys); recursive models are
+# not cached, as their checks refer to the model and would keep it alive
+_field_checks_cache: WeakKeyDictionary = WeakKeyDictionary()
+_field_checks_cache_lock = threading.Lock()
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING_RUN = re.compile(r'[^"\\\x00-\x1f]*')
+_BARE_RUN = re.compile(r"[-+.0-9A-Za-z]*")
+_NUMBER = re.compile(
+    r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?"
+)
+# Every prefix of a valid number, and nothing else
+_NUMBER_PREFIX = re.compile(
+    r"-?(?:(?:0|[1-9][0-9]*)"
+    r"(?:\.(?:[0-9]+(?:[eE][-+]?[0-9]*)?)?|[eE][-+]?[0-9]*)?)?"
+)
+# The non-numeric literals json.loads accepts
+_LITERALS = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "NaN": float("nan"),
+    "Infinity": float("inf"),
+    "-Infinity": float("-inf"),
+}
+_VALUE_START = frozenset("-0123456789tfnNI")
+_ESCAPABLE = frozenset('"\\/bfnrtu')
+
+# Parser states for the innermost open container
+_OBJ_KEY_OR_END = 0
+_OBJ_KEY = 1
+_OBJ_COLON = 2
+_OBJ_VALUE = 3
+_OBJ_COMMA_OR_END = 4
+_ARR_VALUE_OR_END = 5
+_ARR_VALUE = 6
+_ARR_COMMA_OR_END = 7
+
+
+class JsonStreamParser(Generic[T]):
+    """Incrementally parse a streamed JSON object into a Pydantic model.
+
+    Text is fed in chunks as it arrives, e.g. token by token from an LLM.
+    Any text before the first "{" (prose, a ```json fence) and after the
+    object closes is ignored. Each chunk is processed in time proportional
+    to its length, and the parser fails as soon as the stream can no
+    longer produce a valid model: on a JSON syntax error, a key the model
+    forbids, a top-level field whose value does not validate, or an
+    object that closes with required fields missing.
+
+    Attributes:
+        pydantic_object: A Pydantic model class for parsing and validation.
+        done: True once the top-level object has closed.
+
+    Examples:
+    >>> parser = JsonStreamParser(MyModel)
+    >>> for token in llm_stream:
+    ...     for field in parser.feed(token):
+    ...         print("ready:", field, parser.completed_fields[field])
+    >>> model = parser.close()
+    """
+
+    def __init__(self, pydantic_object: Type[T]):
+        self.pydantic_object = pydantic_object
+        self.done = False
+        self._root: Optional[Dict[str, Any]] = None
+        # Open containers, innermost last: [container, state, key]
+        self._stack: List[list] = []
+        self._string_parts: Optional[List[str]] = None
+        self._string_is_key = False
+        self._escape_pending = False
+        self._bare: Optional[List[str]] = None
+        self._offset = 0
+        self._chunk = ""
+        self._completed: Dict[str, Any] = {}
+        self._newly_completed: List[str] = []
+        self._result: Optional[T] = None
+        self._error: Optional[JsonParsingException] = None
+        self._fields, self._forbid_unknown = _field_checks(
+            pydantic_object
+        )
+
+    @property
+    def completed_fields(self) -> Dict[str, Any]:
+        """Top-level fields whose values are complete and valid, by field name."""
+        return dict(self._completed)
+
+    @property
+    def partial(self) -> Optional[Dict[str, Any]]:
+        """A snapshot of the object parsed so far, including an unfinished string value."""
+        if self._root is None:
+            return None
+        memo: Dict[int, Any] = {}
+        snapshot = copy.deepcopy(self._root, memo)
+        if self._string_parts is not None and not self._string_is_key:
+            container, _, key = self._stack[-1]
+            target = memo[id(container)]
+            value = _decode_partial_string(
+                "".join(self._string_parts)
+            )
+            if isinstance(target, dict):
+                target[key] = value
+            else:
+                target.append(value)
+        return snapshot
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Consume the next piece of streamed text.
+
+        Args:
+            chunk (str): The new text.
+
+        Returns:
+            List[str]: Names of the top-level fields completed by this chunk.
+
+        Raises:
+            JsonParsingException: If the stream can no longer produce a valid model.
+        """
+        if self._error is not None:
+            raise self._error
+        self._newly_completed = []
+        if not self.done:
+            try:
+                self._consume(chunk)
+            except JsonParsingException as e:
+                self._error = e
+                raise
+        return self._newly_completed
+
+    def close(self) -> T:
+        """
+        Finish the stream and return the validated model.
+
+        Returns:
+            T: An instance of the specified Pydantic model.
+
+        Raises:
+            JsonParsingException: If the stream ended early or the object is invalid.
+        """
+        if self._error is not None:
+            raise self._error
+        if not self.done:
+            self._error = self._failure(
+                "Unexpected end of stream"
+                if self._root is not None
+                else "No JSON object found"
+            )
+            raise self._error
+        return self._result
+
+    def _consume(self, chunk: str) -> None:
+        self._chunk = chunk
+        pos = 0
+        end = len(chunk)
+        if self._root is None:
+            pos = chunk.find("{")
+            if pos < 0:
+                self._offset += end
+                return
+            self._root = {}
+            self._stack.append([self._root, _OBJ_KEY_OR_END, None])
+            pos += 1
+
+        stack = self._stack
+        while pos < end and not self.done:
+            if self._string_parts is not None:
+                pos = self._consume_string(chunk, pos)
+                continue
+            if self._bare is not None:
+                match = _BARE_RUN.match(chunk, pos)
+                pos = match.end()
+                self._bare.append(match.group())
+                if pos < end:
+                    self._finish_bare(pos)
+                else:
+                    self._check_bare_prefix(pos)
+                continue
+
+            pos = _WHITESPACE.match(chunk, pos).end()
+            if pos == end:
+                break
+            char = chunk[pos]
+            frame = stack[-1]
+            state = frame[1]
+            if state == _OBJ_KEY_OR_END or state == _OBJ_KEY:
+                if char == '"':
+                    self._string_parts = []
+                    self._string_is_key = True
+                elif char == "}" and state == _OBJ_KEY_OR_END:
+                    self._close_container()
+                else:
+                    self._syntax_error("Expecting property name", pos)
+            elif state == _OBJ_COLON:
+                if char != ":":
+                    self._syntax_error("Expecting ':' delimiter", pos)
+                frame[1] = _OBJ_VALUE
+            elif state == _OBJ_COMMA_OR_END:
+                if char == ",":
+                    frame[1] = _OBJ_KEY
+                elif char == "}":
+                    self._close_container()
+                else:
+                    self._syntax_error("Expecting ',' delimiter", pos)
+            elif state == _ARR_COMMA_OR_END:
+                if char == ",":
+                    frame[1] = _ARR_VALUE
+                elif char == "]":
+                    self._close_container()
+                else:
+                    self._syntax_error("Expecting ',' delimiter", pos)
+            elif char == "]" and state == _ARR_VALUE_OR_END:
+                self._close_container()
+            elif char == "{":
+                self._open_container({}, _OBJ_KEY_OR_END)
+            elif char == "[":
+                self._open_container([], _ARR_VALUE_OR_END)
+            elif char == '"':
+                self._string_parts = []
+                self._string_is_key = False
+            elif char in _VALUE_START:
+                self._bare = []
+                continue
+            else:
+                self._syntax_error("Expecting value", pos)
+            pos += 1
+
+        self._offset += end
+
+    def _consume_string(self, chunk: str, pos: int) -> int:
+        parts = self._string_parts
+        end = len(chunk)
+        while pos < end:
+            if self._escape_pending:
+                if chunk[pos] not in _ESCAPABLE:
+                    self._syntax_error("Invalid \\escape", pos)
+                parts.append(chunk[pos])
+                self._escape_pending = False
+                pos += 1
+                continue
+            match = _STRING_RUN.match(chunk, pos)
+            if match.end() > pos:
+                parts.append(match.group())
+                pos = match.end()
+                if pos == end:
+                    break
+            char = chunk[pos]
+            if char == '"':
+                self._finish_string(pos)
+                return pos + 1
+            if char == "\\":
+                parts.append(char)
+                self._escape_pending = True
+                pos += 1
+            else:
+                self._syntax_error("Invalid control character", pos)
+        return pos
+
+    def _finish_string(self, pos: int) -> None:
+        raw = "".join(self._string_parts)
+        self._string_parts = None
+        if "\\" in raw:
+            try:
+                value = json.loads(f'"{raw}"')
+            except json.JSONDecodeError as e:
+                self._syntax_error(e.msg, pos)
+        else:
+            value = raw
+
+        if not self._string_is_key:
+            self._add_value(value)
+            return
+        frame = self._stack[-1]
+        frame[2] = value
+        frame[1] = _OBJ_COLON
+        if (
+            len(self._stack) == 1
+            and self._forbid_unknown
+            and value not in self._fields
+        ):
+            raise self._failure(
+                f"Extra inputs are not permitted: {value!r}"
+            )
+
+    def _check_bare_prefix(self, pos: int) -> None:
+        token = "".join(self._bare)
+        if _NUMBER_PREFIX.fullmatch(token) or any(
+            literal.startswith(token) for literal in _LITERALS
+        ):
+            return
+        self._syntax_error("Expecting value", pos)
+
+    def _finish_bare(self, pos: int) -> None:
+        token = "".join(self._bare)
+        self._bare = None
+        if token in _LITERALS:
+            value = _LITERALS[token]
+        elif _NUMBER.fullmatch(token):
+            if "." in token or "e" in token or "E" in token:
+                value = float(token)
+            else:
+                value = int(token)
+        else:
+            self._syntax_error("Expecting value", pos)
+        self._add_value(value)
+
+    def _open_container(self, container, state: int) -> None:
+        # Attach it now so partial snapshots show nested progress
+        parent, _, key = self._stack[-1]
+        if isinstance(parent, dict):
+            parent[key] = container
+        else:
+            parent.append(container)
+        self._stack.append([container, state, None])
+
+    def _close_container(self) -> None:
+        container = self._stack.pop()[0]
+        if not self._stack:
+            self.done = True
+            self._validate_result()
+            return
+        self._add_value(container, attached=True)
+
+    def _add_value(self, value: Any, attached: bool = False) -> None:
+        frame = self._stack[-1]
+        container = frame[0]
+        if isinstance(container, dict):
+            if not attached:
+                container[frame[2]] = value
+            frame[1] = _OBJ_COMMA_OR_END
+            if len(self._stack) == 1:
+                self._complete_field(frame[2], value)
+        else:
+            if not attached:
+                container.append(value)
+            frame[1] = _ARR_COMMA_OR_END
+
+    def _complete_field(self, key: str, value: Any) -> None:
+        check = self._fields.get(key)
+        if check is None:
+            return
+        name, adapter = check
+        if adapter is not None:
+            try:
+                value = adapter.validate_python(value)
+            except ValidationError as e:
+                raise self._failure(
+                    f"Invalid value for field {name!r}: {e}", e
+                )
+        self._completed[name] = value
+        self._newly_completed.append(name)
+
+    def _validate_result(self) -> None:
+        try:
+            if hasattr(self.pydantic_object, "model_validate"):
+                self._result = self.pydantic_object.model_validate(
+                    self._root
+                )
+            else:
+                self._result = self.pydantic_object.parse_obj(
+                    self._root
+                )
+        except ValidationError as e:
+            raise self._failure(str(e), e)
+
+    def _syntax_error(self, message: str, pos: int) -> None:
+        position = self._offset + pos
+        raise self._failure(
+            f"{message}: char {position}",
+            json.JSONDecodeError(message, self._chunk, pos),
+        )
+
+    def _failure(
+        self, detail: str, cause: Optional[Exception] = None
+    ) -> JsonParsingException:
+        name = self.pydantic_object.__name__
+        error = JsonParsingException(
+            f"Failed to parse {name} from stream. Error: {detail}"
+        )
+        error.__cause__ = cause
+        return error
+
+
+def _decode_partial_string(raw: str) -> str:
+    if "\\" not in raw:
+        return raw
+    # Drop an escape sequence cut off by the end of the stream so far
+    cut = raw.rfind("\\", max(0, len(raw) - 6))
+    for candidate in (raw, raw[:cut] if cut >= 0 else raw):
+        try:
+            return json.loads(f'"{candidate}"')
+        except json.JSONDecodeError:
+            continue
+    return raw
+
+
+def _field_checks(pydantic_object: Type[BaseModel]):
+    """Return the cached _build_field_checks result for the model."""
+    cached = _field_checks_cache.get(pydantic_object)
+    if cached is not None:
+        return cached
+    result = _build_field_checks(pydantic_object)
+    if not any(
+        adapter is not None
+        and _refers_to(adapter.core_schema, pydantic_object)
+        for _, adapter in result[0].values()
+    ):
+        with _field_checks_cache_lock:
+            _field_checks_cache[pydantic_object] = result
+    return result
+
+
+def _refers_to(core_schema: Any, target: Any) -> bool:
+    """Return True if target appears anywhere in a core schema."""
+    if isinstance(core_schema, dict):
+        core_schema = core_schema.values()
+    elif not isinstance(core_schema, (list, tuple)):
+        return False
+    return any(
+        value is target or _refers_to(value, target)
+        for value in core_schema
+    )
+
+
+def _build_field_checks(pydantic_object: Type[BaseModel]):
+    """Map accepted top-level keys to (field name, TypeAdapter or None).
+
+    Fields are checked on their own only when that cannot reject input the
+    full model would accept, i.e. there are no "before"/"wrap" model or
+    field validators rewriting it. Each check validates with the model's
+    config (coercion, string constraints, strictness, ...), except for
+    types that carry their own. Unknown keys fail early only when the
+    model forbids extras and every field's key is known.
+    """
+    model_fields = getattr(pydantic_object, "model_fields", None)
+    if model_fields is None:
+        return {}, False
+
+    decorators = pydantic_object.__pydantic_decorators__
+    rewrites_model = any(
+        d.info.mode in ("before", "wrap")
+        for d in decorators.model_validators.values()
+    )
+    rewritten_fields = set()
+    for d in decorators.field_validators.values():
+        if d.info.mode in ("before", "wrap", "plain"):
+            rewritten_fields.update(d.info.fields)
+
+    config = pydantic_object.model_config
+    by_name = config.get("populate_by_name") or config.get(
+        "validate_by_name"
+    )
+    keys_known = True
+    checks = {}
+    for name, field in model_fields.items():
+        adapter = None
+        if not rewrites_model and name not in rewritten_fields:
+            try:
+                annotation = field.annotation
+                if field.metadata:
+                    annotation = Annotated[
+                        (annotation, *field.metadata)
+                    ]
+                try:
+                    adapter = TypeAdapter(annotation, config=config)
+                except PydanticUserError:
+                    # Models, dataclasses and TypedDicts use their own
+                    # config, as they do inside the full model
+                    adapter = TypeAdapter(annotation)
+            except Exception:
+                adapter = None
+
+        alias = field.validation_alias or field.alias
+        if alias is None:
+            checks[name] = (name, adapter)
+        elif isinstance(alias, str):
+            checks[alias] = (name, adapter)
+            if by_name:
+                checks[name] = (name, adapter)
+        else:
+            keys_known = False
+
+    forbid_unknown = (
+        config.get("extra") == "forbid"
+        and keys_known
+        and not rewrites_model
+    )
+    return checks, forbid_unknown
@@ -1,66 +1,224 @@
 import os
-from PyPDF2 import PdfReader
-import openpyxl
+from bisect import bisect_left, bisect_right
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    wait,
+)
+from functools import partial
+from itertools import accumulate, islice
 from loguru import logger
-from swarm_models.tiktoken_wrapper import TikTokenizer
-from typing import List
+from time import perf_counter
+from typing import (
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
+from agentparse.extraction_cache import ExtractionCache
+from agentparse.extractors import get_handler
+from agentparse.metrics import (
+    BYTES_TOTAL,
+    CHARS_TOTAL,
+    METRICS,
+    TOKENS_TOTAL,
+)
+from agentparse.tokenizer import DEFAULT_ENCODING, get_tokenizer
 
-def file_to_string(file_path: str) -> str:
+
+def _extract_text(
+    file_path: str, workers: Optional[int] = None
+) -> str:
+    return get_handler(file_path).extract(file_path, workers=workers)
+
+
+def file_to_string(
+    file_path: str,
+    workers: Optional[int] = None,
+    cache: Optional[ExtractionCache] = None,
+) -> str:
     """
-    Convert various file types to string, auto-detecting the file extension.
-    Supported types: .txt, .csv, .pdf, .docx, .xlsx, .json
+    Convert various file types to string, auto-detecting the file format.
+    Supported types: .txt, .csv, .pdf, .docx, .xlsx, .json, plus any format
+    added with register_extractor. PDF, XLSX and DOCX files are recognized
+    by their content even when the extension is wrong or missing.
 
     Args:
     file_path (str): Path to the file
+    workers (Optional[int]): Worker processes for PDF page extraction (default: serial)
+    cache (Optional[ExtractionCache]): Persistent cache of extracted text; hits skip parsing entirely (default: no cache)
 
     Returns:
     str: Content of the file as a string
     """
-    _, file_extension = os.path.splitext(file_path)
-
     try:
-        if file_extension == ".txt":
-            with open(file_path, "r", encoding="utf-8") as file:
-                return file.read()
-
-        elif file_extension == ".csv":
-            with open(file_path, "r", encoding="utf-8") as file:
-                return file.read()
-
-        elif file_extension == ".pdf":
-            text = ""
-            with open(file_path, "rb") as file:
-                pdf_reader = PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-            return text
-
-        elif file_extension == ".xlsx":
-            wb = openpyxl.load_workbook(file_path)
-            text = ""
-            for sheet in wb.sheetnames:
-                text += f"Sheet: {sheet}\n"
-                for row in wb[sheet].iter_rows(values_only=True):
-                    text += ",".join(str(cell) for cell in row) + "\n"
-            return text
-
-        elif file_extension == ".json":
-            with open(file_path, "r", encoding="utf-8") as file:
-                return file.read()
-
-        else:
-            raise ValueError(
-                f"Unsupported file type: {file_extension}"
-            )
+        with METRICS.timer("file.extract"):
+            if cache is not None and cache.accepts(file_path):
+                text = cache.get_or_extract(
+                    file_path, partial(_extract_text, workers=workers)
+                )
+            else:
+                text = _extract_text(file_path, workers)
 
     except Exception as e:
         logger.error(f"Error processing file {file_path}: {str(e)}")
         raise
 
+    if METRICS.enabled:
+        METRICS.inc(
+            BYTES_TOTAL,
+            os.path.getsize(file_path),
+            stage="file.extract",
+        )
+        METRICS.inc(CHARS_TOTAL, len(text), stage="file.extract")
+    return text
+
+
+def _iter_word_blocks(
+    text: Union[str, Iterable[str]], block_chars: int
+) -> Iterator[List[str]]:
+    """
+    Split text into lists of whole words, roughly block_chars characters at a time.
+
+    A word that straddles the end of a block is carried over to the next one,
+    so no word is ever cut in half. Accepts either a single string or an
+    iterable of string pieces (e.g. blocks streamed from a file).
+    """
+    if isinstance(text, str):
+        pieces = (
+            text[i : i + block_chars]
+            for i in range(0, len(text), block_chars)
+        )
+    else:
+        pieces = text
+
+    buffer: List[str] = []
+    buffered = 0
+    for piece in pieces:
+        buffer.append(piece)
+        buffered += len(piece)
+        if buffered < block_chars:
+            continue
+
+        block = "".join(buffer)
+        words = block.split()
+        buffer, buffered = [], 0
+        if words and not block[-1].isspace():
+            carry = words.pop()
+            buffer, buffered = [carry], len(carry)
+        if words:
+            yield words
+
+    words = "".join(buffer).split()
+    if words:
+        yield words
+
+
+def iter_text_chunks(
+    text: Union[str, Iterable[str]],
+    limit_tokens: int = 10000,
+    encoding_name: str = DEFAULT_ENCODING,
+    block_chars: int = 1_000_000,
+) -> Iterator[str]:
+    """
+    Lazily chunk text on word boundaries using a single tokenizer pass per block.
+
+    Words are taken from large whitespace-aligned blocks, each block is encoded
+    in one call, and token byte offsets are mapped back onto word boundaries.
+    Chunk cuts are then found by binary search instead of counting each word
+    separately.
+
+    Args:
+    text (Union[str, Iterable[str]]): The input text, or an iterable of text pieces
+    limit_tokens (int): The approximate number of tokens per chunk (default: 10000)
+    encoding_name (str): The tiktoken encoding to count with (default: "o200k_base")
+    block_chars (int): Approximate number of characters encoded per call (default: 1,000,000)
+
+    Yields:
+    str: Text chunks, with words joined by single spaces
+    """
+    if limit_tokens <= 0:
+        raise ValueError("Limit must be greater than zero")
+
+    encoding = get_tokenizer(encoding_name).encoding
+
+    pending: List[str] = []
+    # Whether a chunk was yielded yet, i.e. words[0] follows earlier text
+    emitted = False
+    blocks = _iter_word_blocks(text, block_chars)
+    block = next(blocks, None)
+
+    while block is not None:
+        next_block = next(blocks, None)
+        words = pending + block if pending else block
+        pending = []
+
+        # Words after the first one keep their joining space so they
+        # tokenize exactly as they would inside the whole document; carried
+        # words that start the document never had one
+        prefix = " " if emitted else ""
+
+        joined = prefix + " ".join(words)
+        started = METRICS.enabled and perf_counter()
+        tokens = encoding.encode_ordinary(joined)
+        token_ends = list(
+            accumulate(map(len, encoding.decode_tokens_bytes(tokens)))
+        )
+        if started:
+            METRICS.stage_time("chunk.tokenize", started)
+            METRICS.inc(
+                TOKENS_TOTAL, len(tokens), stage="chunk.tokenize"
+            )
+            METRICS.inc(
+                CHARS_TOTAL, len(joined), stage="chunk.tokenize"
+            )
+        if joined.isascii():
+            word_lengths = map(len, words)
+        else:
+            word_lengths = (
+                len(word.encode("utf-8")) for word in words
+            )
+        # Byte offset just past each word (excluding the joining space)
+        word_ends = [
+            end - 1
+            for end in accumulate(
+                length + 1 for length in word_lengths
+            )
+        ]
+        if prefix:
+            word_ends = [end + 1 for end in word_ends]
+
+        start = 0
+        consumed = 0
+        while start < len(words):
+            budget = consumed + limit_tokens
+            if budget < len(token_ends):
+                end = bisect_left(word_ends, token_ends[budget]) - 1
+            else:
+                end = len(words) - 1
+            end = max(end, start)
+
+            if end == len(words) - 1 and next_block is not None:
+                # The trailing chunk may still grow with the next block
+                pending = words[start:]
+                break
+
+            yield " ".join(words[start : end + 1])
+            emitted = True
+            consumed = bisect_right(token_ends, word_ends[end])
+            start = end + 1
+
+        block = next_block
+
 
 def chunk_text_dynamic(
-    text: str, limit_tokens: int = 10000
+    text: str,
+    limit_tokens: int = 10000,
+    encoding_name: str = DEFAULT_ENCODING,
 ) -> List[str]:
     """
     Chunk text into smaller chunks based on the token limit, ensuring words are not cut off.
@@ -68,30 +226,88 @@ def chunk_text_dynamic(
     Args:
     text (str): The input text to be chunked
     limit_tokens (int): The approximate number of tokens per chunk (default: 10000)
+    encoding_name (str): The tiktoken encoding to count with (default: "o200k_base")
 
     Returns:
     List[str]: A list of text chunks
     """
-    tokenizer = TikTokenizer()
-    words = text.split()
-    chunks = []
-    current_chunk = []
-    current_token_count = 0
-
-    for word in words:
-        word_tokens = tokenizer.count_tokens(word)
-        if (
-            current_token_count + word_tokens > limit_tokens
-            and current_chunk
-        ):
-            chunks.append(" ".join(current_chunk))
-            current_chunk = []
-            current_token_count = 0
-
-        current_chunk.append(word)
-        current_token_count += word_tokens
-
-    if current_chunk:
-        chunks.append(" ".join(current_chunk))
-
-    return chunks
+    with METRICS.timer("chunk.text"):
+        return list(
+            iter_text_chunks(text, limit_tokens, encoding_name)
+        )
+
+
+def _chunk_document(
+    doc_id: Hashable,
+    text: str,
+    limit_tokens: int,
+    encoding_name: str,
+) -> Tuple[Hashable, List[str]]:
+    return doc_id, chunk_text_dynamic(
+        text, limit_tokens, encoding_name
+    )
+
+
+def chunk_corpus(
+    documents: Iterable[Tuple[Hashable, str]],
+    limit_tokens: int = 10000,
+    workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    encoding_name: str = DEFAULT_ENCODING,
+) -> Iterator[Tuple[Hashable, int, str]]:
+    """
+    Chunk many documents in parallel across a process pool.
+
+    Documents are pulled from the iterable lazily and at most max_in_flight of
+    them are queued at any time, so memory stays flat regardless of corpus
+    size. Each document is chunked exactly as chunk_text_dynamic would chunk
+    it; results stream back as soon as each document finishes, so documents
+    may arrive out of input order.
+
+    Args:
+    documents (Iterable[Tuple[Hashable, str]]): (doc_id, text) pairs
+    limit_tokens (int): The approximate number of tokens per chunk (default: 10000)
+    workers (Optional[int]): Number of worker processes (default: os.cpu_count())
+    max_in_flight (Optional[int]): Maximum documents submitted but not yet yielded (default: 2 * workers)
+    encoding_name (str): The tiktoken encoding to count with (default: "o200k_base")
+
+    Yields:
+    Tuple[Hashable, int, str]: (doc_id, chunk_index, chunk) for every chunk
+    """
+    if limit_tokens <= 0:
+        raise ValueError("Limit must be greater than zero")
+
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * workers
+    if max_in_flight <= 0:
+        raise ValueError("max_in_flight must be greater than zero")
+
+    documents = iter(documents)
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        in_flight = set()
+
+        def submit(count: int) -> None:
+            for doc_id, text in islice(documents, count):
+                in_flight.add(
+                    executor.submit(
+                        _chunk_document,
+                        doc_id,
+                        text,
+                        limit_tokens,
+                        encoding_name,
+                    )
+                )
+
+        submit(max_in_flight)
+        while in_flight:
+            done, in_flight = wait(
+                in_flight, return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                doc_id, chunks = future.result()
+                for chunk_index, chunk in enumerate(chunks):
+                    yield doc_id, chunk_index, chunk
+            submit(max_in_flight - len(in_flight))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,429 @@
+import os
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+# Metric names
+STAGE_SECONDS = "agentparse_stage_seconds"
+FAILURES_TOTAL = "agentparse_failures_total"
+BYTES_TOTAL = "agentparse_bytes_total"
+CHARS_TOTAL = "agentparse_chars_total"
+TOKENS_TOTAL = "agentparse_tokens_total"
+EXECUTOR_QUEUE_DEPTH = "agentparse_executor_queue_depth"
+
+# Upper bounds, in seconds, of the stage latency histogram buckets
+DEFAULT_BUCKETS = (
+    5e-6,
+    1e-5,
+    2.5e-5,
+    5e-5,
+    1e-4,
+    2.5e-4,
+    5e-4,
+    1e-3,
+    2.5e-3,
+    5e-3,
+    1e-2,
+    2.5e-2,
+    5e-2,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+# Called with (kind, name, value, labels) for every recorded measurement;
+# for a gauge, value is its new value
+Sink = Callable[[str, str, float, Dict[str, str]], None]
+
+
+class Histogram:
+    """Bucketed observations with count, sum, min and max."""
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        # One count per bucket, plus the +Inf bucket
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile by interpolating within its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = (
+                    self.bounds[index]
+                    if index < len(self.bounds)
+                    else self.max
+                )
+                estimate = lower + (upper - lower) * (
+                    (rank - seen) / count
+                )
+                return min(max(estimate, self.min), self.max)
+            seen += count
+        return self.max
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _StageTimer:
+    __slots__ = ("metrics", "stage", "started")
+
+    def __init__(self, metrics: "Metrics", stage: str):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self) -> "_StageTimer":
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        self.metrics.stage_time(self.stage, self.started)
+        if exc_type is not None:
+            self.metrics.inc(FAILURES_TOTAL, stage=self.stage)
+        return False
+
+
+class Metrics:
+    """
+    A thread-safe registry of counters, gauges and histograms.
+
+    Recording is off until enabled, and every recording method returns at
+    once while it is. Hot paths check the enabled attribute themselves
+    before reading the clock, so disabled metrics cost one attribute
+    lookup. In process mode each worker process records into its own
+    registry; only measurements taken in the calling process appear in
+    its snapshot.
+
+    Args:
+        buckets (Tuple[float, ...]): Upper bounds of the histogram buckets.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.enabled = False
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._gauges: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._sinks: List[Sink] = []
+
+    def inc(
+        self, name: str, value: float = 1.0, **labels: str
+    ) -> None:
+        """Add value to a counter."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+        self._emit("counter", name, value, labels)
+
+    def set_gauge(
+        self, name: str, value: float, **labels: str
+    ) -> None:
+        """Set a gauge to value."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = value
+        self._emit("gauge", name, value, labels)
+
+    def add_gauge(
+        self, name: str, delta: float, **labels: str
+    ) -> None:
+        """Add delta (which may be negative) to a gauge."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            value = self._gauges.get(key, 0.0) + delta
+            self._gauges[key] = value
+        self._emit("gauge", name, value, labels)
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record value in a histogram."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = Histogram(self.buckets)
+                self._histograms[key] = histogram
+            histogram.observe(value)
+        self._emit("histogram", name, value, labels)
+
+    def stage_time(self, stage: str, started: float) -> None:
+        """Record the time since started (a perf_counter value) for stage."""
+        self.observe(
+            STAGE_SECONDS, perf_counter() - started, stage=stage
+        )
+
+    def timer(self, stage: str):
+        """
+        Return a context manager timing its block as stage.
+
+        An exception leaving the block also counts a failure of stage.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, stage)
+
+    def timed_iter(
+        self, stage: str, items: Iterable[T]
+    ) -> Iterator[T]:
+        """Yield from items, recording the total time spent producing them as stage."""
+        if not self.enabled:
+            yield from items
+            return
+        items = iter(items)
+        elapsed = 0.0
+        try:
+            while True:
+                started = perf_counter()
+                try:
+                    item = next(items)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed += perf_counter() - started
+                yield item
+        finally:
+            self.observe(STAGE_SECONDS, elapsed, stage=stage)
+
+    def add_sink(self, sink: Sink) -> None:
+        """Call sink(kind, name, value, labels) for every measurement."""
+        with self._lock:
+            self._sinks = self._sinks + [sink]
+
+    def remove_sink(self, sink: Sink) -> None:
+        with self._lock:
+            self._sinks = [s for s in self._sinks if s is not sink]
+
+    def reset(self) -> None:
+        """Drop every recorded value; sinks are kept."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the current values as plain data.
+
+        Returns:
+            Dict[str, Any]: {"counters": ..., "gauges": ..., "histograms": ...},
+                each mapping a metric name to a list of {"labels": ..., ...}
+                series. Histogram series hold count, sum, min, max, p50,
+                p90, p99 and cumulative (upper bound, count) buckets.
+        """
+        with self._lock:
+            counters = {
+                key: {"value": value}
+                for key, value in self._counters.items()
+            }
+            gauges = {
+                key: {"value": value}
+                for key, value in self._gauges.items()
+            }
+            histograms = {
+                key: _histogram_data(histogram)
+                for key, histogram in self._histograms.items()
+            }
+        return {
+            "counters": _group_series(counters),
+            "gauges": _group_series(gauges),
+            "histograms": _group_series(histograms),
+        }
+
+    def to_prometheus(self) -> str:
+        """Render the current values in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = []
+        for kind in ("counters", "gauges"):
+            for name, series in snapshot[kind].items():
+                lines.append(f"# TYPE {name} {kind[:-1]}")
+                for item in series:
+                    lines.append(
+                        f"{name}{_format_labels(item['labels'])}"
+                        f" {_format_value(item['value'])}"
+                    )
+        for name, series in snapshot["histograms"].items():
+            lines.append(f"# TYPE {name} histogram")
+            for item in series:
+                labels = item["labels"]
+                for bound, count in item["buckets"]:
+                    le = (
+                        "+Inf"
+                        if bound == float("inf")
+                        else repr(bound)
+                    )
+                    lines.append(
+                        f"{name}_bucket"
+                        f"{_format_labels({**labels, 'le': le})} {count}"
+                    )
+                lines.append(
+                    f"{name}_sum{_format_labels(labels)}"
+                    f" {_format_value(item['sum'])}"
+                )
+                lines.append(
+                    f"{name}_count{_format_labels(labels)} {item['count']}"
+                )
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def _emit(
+        self,
+        kind: str,
+        name: str,
+        value: float,
+        labels: Dict[str, str],
+    ) -> None:
+        for sink in self._sinks:
+            try:
+                sink(kind, name, value, labels)
+            except Exception:
+                # A broken sink must not break parsing
+                continue
+
+
+def _group_series(
+    values: Dict[Tuple[str, Labels], Dict[str, Any]],
+) -> Dict[str, List[Dict[str, Any]]]:
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for (name, labels), data in sorted(values.items()):
+        grouped.setdefault(name, []).append(
+            {"labels": dict(labels), **data}
+        )
+    return grouped
+
+
+def _histogram_data(histogram: Histogram) -> Dict[str, Any]:
+    cumulative = 0
+    buckets = []
+    for bound, count in zip(
+        histogram.bounds + (float("inf"),), histogram.counts
+    ):
+        cumulative += count
+        buckets.append((bound, cumulative))
+    return {
+        "count": histogram.count,
+        "sum": histogram.sum,
+        "min": histogram.min if histogram.count else None,
+        "max": histogram.max if histogram.count else None,
+        "p50": histogram.quantile(0.5),
+        "p90": histogram.quantile(0.9),
+        "p99": histogram.quantile(0.99),
+        "buckets": buckets,
+    }
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        f'{key}="{_escape(str(value))}"'
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\n", "\\n")
+        .replace('"', '\\"')
+    )
+
+
+def _format_value(value: float) -> str:
+    return (
+        str(int(value)) if float(value).is_integer() else repr(value)
+    )
+
+
+# The process-wide registry every agentparse component records into
+METRICS = Metrics()
+METRICS.enabled = os.environ.get(
+    "AGENTPARSE_METRICS", ""
+).strip().lower() in ("1", "true", "yes", "on")
+
+
+def enable_metrics() -> None:
+    """Start recording metrics (also enabled by $AGENTPARSE_METRICS=1)."""
+    METRICS.enabled = True
+
+
+def disable_metrics() -> None:
+    """Stop recording metrics; recorded values are kept."""
+    METRICS.enabled = False
+
+
+def metrics_snapshot() -> Dict[str, Any]:
+    """Return the process-wide metrics as a dict (see Metrics.snapshot)."""
+    return METRICS.snapshot()
+
+
+def metrics_to_prometheus() -> str:
+    """Return the process-wide metrics in Prometheus text format."""
+    return METRICS.to_prometheus()
+
+
+def add_metrics_sink(sink: Sink) -> None:
+    """Call sink(kind, name, value, labels) for every measurement."""
+    METRICS.add_sink(sink)
+
+
+def remove_metrics_sink(sink: Sink) -> None:
+    """Stop calling a sink added with add_metrics_sink."""
+    METRICS.remove_sink(sink)
+
+
+def reset_metrics() -> None:
+    """Drop every recorded value of the process-wide metrics."""
+    METRICS.reset()
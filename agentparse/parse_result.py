@@ -0,0 +1,130 @@
+import reprlib
+from dataclasses import dataclass
+from typing import Any, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_MAX_MESSAGE_CHARS = 300
+DEFAULT_SNIPPET_CHARS = 80
+
+# Summarizes offending inputs without walking all of a large one
+_SHORT_REPR = reprlib.Repr()
+_SHORT_REPR.maxstring = DEFAULT_SNIPPET_CHARS
+_SHORT_REPR.maxother = DEFAULT_SNIPPET_CHARS
+
+
+@dataclass
+class ParseError:
+    """A compact, structured description of why a parse failed.
+
+    stage is "decode" (the text is not valid JSON/YAML) or "validate" (it
+    does not fit the model). location is "line L column C" for decode
+    errors and the dotted field path for validation errors. offset is the
+    character offset into the parsed text, when known, and snippet the
+    text around it. message and snippet are truncated, so an error record
+    stays small whatever the size of the input.
+    """
+
+    stage: str
+    error_type: str
+    message: str
+    location: str = ""
+    offset: Optional[int] = None
+    snippet: str = ""
+
+
+@dataclass
+class ParseResult(Generic[T]):
+    """The outcome of parsing one text: exactly one of value or error is set."""
+
+    value: Optional[T] = None
+    error: Optional[ParseError] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def truncate(text: str, max_chars: int) -> str:
+    """Cap text at max_chars characters, marking any cut with "..."."""
+    if len(text) <= max_chars:
+        return text
+    return text[: max(0, max_chars - 3)] + "..."
+
+
+def snippet_at(text: str, offset: int, snippet_chars: int) -> str:
+    """Return about snippet_chars characters of text centred on offset."""
+    start = max(0, offset - snippet_chars // 2)
+    return text[start : start + snippet_chars]
+
+
+def decode_error(
+    text: str,
+    error_type: str,
+    message: str,
+    offset: int,
+    max_message_chars: int = DEFAULT_MAX_MESSAGE_CHARS,
+    snippet_chars: int = DEFAULT_SNIPPET_CHARS,
+) -> ParseError:
+    """Build a ParseError for text that could not be decoded at offset."""
+    line = text.count("\n", 0, offset) + 1
+    column = offset - text.rfind("\n", 0, offset)
+    return ParseError(
+        stage="decode",
+        error_type=error_type,
+        message=truncate(message, max_message_chars),
+        location=f"line {line} column {column}",
+        offset=offset,
+        snippet=snippet_at(text, offset, snippet_chars),
+    )
+
+
+def validation_error(
+    errors: Any,
+    max_message_chars: int = DEFAULT_MAX_MESSAGE_CHARS,
+    snippet_chars: int = DEFAULT_SNIPPET_CHARS,
+) -> ParseError:
+    """
+    Build a ParseError from a pydantic ValidationError's errors() list.
+
+    Only the first error is described, with a count of the rest; the
+    offending input is summarized by a truncated repr.
+    """
+    first = errors[0]
+    location = ".".join(str(part) for part in first["loc"])
+    message = first["msg"]
+    if len(errors) > 1:
+        message += f" (and {len(errors) - 1} more errors)"
+    return ParseError(
+        stage="validate",
+        error_type="ValidationError",
+        message=truncate(message, max_message_chars),
+        location=location,
+        snippet=truncate(
+            _SHORT_REPR.repr(first.get("input")), snippet_chars
+        ),
+    )
+
+
+def exception_error(
+    error: Exception,
+    max_message_chars: int = DEFAULT_MAX_MESSAGE_CHARS,
+    snippet_chars: int = DEFAULT_SNIPPET_CHARS,
+) -> ParseError:
+    """Build a validate-stage ParseError from any exception raised by a model."""
+    errors = getattr(error, "errors", None)
+    if callable(errors):
+        try:
+            details = errors(include_url=False)
+        except TypeError:
+            # pydantic.v1 errors() takes no arguments
+            details = errors()
+        if details:
+            return validation_error(
+                details, max_message_chars, snippet_chars
+            )
+    return ParseError(
+        stage="validate",
+        error_type=type(error).__name__,
+        message=truncate(str(error), max_message_chars),
+    )
@@ -0,0 +1,221 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+DEFAULT_ENCODING = "o200k_base"
+DEFAULT_CACHE_SIZE = 65536
+DEFAULT_MAX_KEY_CHARS = 256
+
+
+@dataclass(frozen=True)
+class TokenCacheStats:
+    """A point-in-time snapshot of a token-count cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    currsize: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TokenCountCache:
+    """
+    A thread-safe, bounded LRU cache mapping strings to token counts.
+
+    Args:
+        maxsize (int): Maximum number of entries kept. 0 disables caching.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        if maxsize < 0:
+            raise ValueError("maxsize must be zero or greater")
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: str) -> Optional[int]:
+        """Return the cached count for key, or None on a miss."""
+        with self._lock:
+            count = self._data.get(key)
+            if count is None:
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return count
+
+    def put(self, key: str, count: int) -> None:
+        """Store a count, evicting the least recently used entries."""
+        with self._lock:
+            if self.maxsize == 0:
+                return
+            self._data[key] = count
+            self._data.move_to_end(key)
+            self._evict()
+
+    def resize(self, maxsize: int) -> None:
+        """Change the maximum size, evicting entries if it shrinks."""
+        if maxsize < 0:
+            raise ValueError("maxsize must be zero or greater")
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self) -> None:
+        """Drop all entries and reset the statistics."""
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> TokenCacheStats:
+        with self._lock:
+            return TokenCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                currsize=len(self._data),
+                maxsize=self.maxsize,
+            )
+
+    def _evict(self) -> None:
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self._evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CachedTokenizer:
+    """
+    A tokenizer for one encoding with an LRU token-count cache in front of it.
+
+    Instances are normally obtained from `get_tokenizer`, which shares one
+    per encoding across the whole process.
+
+    Args:
+        encoding_name (str): The tiktoken encoding to load.
+        cache_size (int): Maximum number of cached token counts.
+        max_key_chars (int): Strings longer than this are counted directly
+            and never cached, so large documents do not pin memory.
+    """
+
+    def __init__(
+        self,
+        encoding_name: str = DEFAULT_ENCODING,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        max_key_chars: int = DEFAULT_MAX_KEY_CHARS,
+    ):
+        self.encoding_name = encoding_name
+        self.max_key_chars = max_key_chars
+        self.cache = TokenCountCache(cache_size)
+
+        from swarm_models.tiktoken_wrapper import TikTokenizer
+
+        self.encoding: Any = TikTokenizer(encoding_name).encoding
+
+    def encode(self, text: str) -> List[int]:
+        """Encode text, treating special-token markers as plain text."""
+        return self.encoding.encode_ordinary(text)
+
+    def decode(self, tokens: List[int]) -> str:
+        return self.encoding.decode(tokens)
+
+    def count_tokens(self, text: str) -> int:
+        """Return the number of tokens in text, using the cache for short strings."""
+        if len(text) > self.max_key_chars:
+            return len(self.encoding.encode_ordinary(text))
+
+        count = self.cache.get(text)
+        if count is None:
+            count = len(self.encoding.encode_ordinary(text))
+            self.cache.put(text, count)
+        return count
+
+    def cache_stats(self) -> TokenCacheStats:
+        return self.cache.stats()
+
+
+_registry: Dict[str, CachedTokenizer] = {}
+_registry_lock = threading.Lock()
+
+
+def get_tokenizer(
+    encoding_name: str = DEFAULT_ENCODING,
+) -> CachedTokenizer:
+    """
+    Return the process-wide tokenizer for an encoding, loading it on first use.
+
+    Args:
+        encoding_name (str): The tiktoken encoding name (default: "o200k_base").
+
+    Returns:
+        CachedTokenizer: The shared tokenizer for that encoding.
+    """
+    tokenizer = _registry.get(encoding_name)
+    if tokenizer is None:
+        with _registry_lock:
+            tokenizer = _registry.get(encoding_name)
+            if tokenizer is None:
+                tokenizer = CachedTokenizer(encoding_name)
+                _registry[encoding_name] = tokenizer
+    return tokenizer
+
+
+def count_tokens(
+    text: str, encoding_name: str = DEFAULT_ENCODING
+) -> int:
+    """Count tokens in text with the shared, cached tokenizer."""
+    return get_tokenizer(encoding_name).count_tokens(text)
+
+
+def configure_token_cache(
+    cache_size: Optional[int] = None,
+    max_key_chars: Optional[int] = None,
+    encoding_name: Optional[str] = None,
+) -> None:
+    """
+    Resize the token-count caches of registered tokenizers.
+
+    Args:
+        cache_size (int, optional): New maximum number of cached entries.
+        max_key_chars (int, optional): New maximum length of cached strings.
+        encoding_name (str, optional): Only configure this encoding. Defaults
+            to every loaded encoding.
+    """
+    if encoding_name is not None:
+        tokenizers = [get_tokenizer(encoding_name)]
+    else:
+        with _registry_lock:
+            tokenizers = list(_registry.values())
+
+    for tokenizer in tokenizers:
+        if cache_size is not None:
+            tokenizer.cache.resize(cache_size)
+        if max_key_chars is not None:
+            tokenizer.max_key_chars = max_key_chars
+
+
+def token_cache_stats() -> Dict[str, TokenCacheStats]:
+    """Return cache statistics for every loaded encoding."""
+    with _registry_lock:
+        tokenizers = dict(_registry)
+    return {
+        name: tokenizer.cache_stats()
+        for name, tokenizer in tokenizers.items()
+    }
+
+
+def clear_tokenizers() -> None:
+    """Forget all loaded tokenizers and their caches."""
+    with _registry_lock:
+        _registry.clear()
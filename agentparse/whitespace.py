@@ -1,6 +1,6 @@
 import json
 
-import yaml
+from agentparse import json_backend, yaml_backend
 
 
 def remove_whitespace_from_json(json_string: str) -> str:
@@ -16,7 +16,7 @@ def remove_whitespace_from_json(json_string: str) -> str:
     Returns:
         str: The JSON string with whitespace removed.
     """
-    parsed = json.loads(json_string)
+    parsed = json_backend.loads(json_string)
     return json.dumps(parsed, separators=(",", ":"))
 
 
@@ -39,8 +39,8 @@ def remove_whitespace_from_yaml(yaml_string: str) -> str:
     Returns:
         str: The YAML string with whitespace reduced.
     """
-    parsed = yaml.safe_load(yaml_string)
-    return yaml.dump(parsed, default_flow_style=True)
+    parsed = yaml_backend.safe_load(yaml_string)
+    return yaml_backend.dump(parsed, default_flow_style=True)
 
 
 # # Example usage for YAML
@@ -0,0 +1,43 @@
+from typing import Any, Iterator, Optional, TextIO, Union
+
+import yaml
+
+# Every YAML call in agentparse goes through this module. Loading uses
+# PyYAML's libyaml bindings when available (several times faster) and the
+# pure-Python loader otherwise. For input both accept they build the same
+# data, but libyaml also accepts tabs as separators (e.g. "a:\tb",
+# "[1,\t2]", a tab before a comment) where the pure-Python scanner raises,
+# and the wording of syntax errors differs. Dumping always uses the
+# pure-Python dumpers: libyaml's emitter formats some documents
+# differently (top-level scalars, long and escaped quoted strings, tags).
+HAS_LIBYAML: bool = getattr(yaml, "__with_libyaml__", False)
+
+SafeLoader = yaml.CSafeLoader if HAS_LIBYAML else yaml.SafeLoader
+
+YAMLError = yaml.YAMLError
+
+Stream = Union[str, bytes, TextIO]
+
+
+def safe_load(stream: Stream) -> Any:
+    """Load one YAML document with the safe loader (yaml.safe_load)."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def safe_load_all(stream: Stream) -> Iterator[Any]:
+    """Lazily load every document in a YAML stream (yaml.safe_load_all)."""
+    return yaml.load_all(stream, Loader=SafeLoader)
+
+
+def safe_dump(
+    data: Any, stream: Optional[TextIO] = None, **kwargs
+) -> Optional[str]:
+    """Dump data with the safe dumper (yaml.safe_dump)."""
+    return yaml.dump(data, stream, Dumper=yaml.SafeDumper, **kwargs)
+
+
+def dump(
+    data: Any, stream: Optional[TextIO] = None, **kwargs
+) -> Optional[str]:
+    """Dump data with the full dumper (yaml.dump)."""
+    return yaml.dump(data, stream, Dumper=yaml.Dumper, **kwargs)
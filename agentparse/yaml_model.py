@@ -1,11 +1,11 @@
-import json
 from dataclasses import fields, is_dataclass
 from typing import Any, Dict, Type
 
-import yaml
 from loguru import logger
 from pydantic import BaseModel, Field
 
+from agentparse import json_backend, yaml_backend
+
 
 def get_type_name(typ: Type) -> str:
     """Map Python types to simple string representations."""
@@ -66,7 +66,7 @@ def create_yaml_schema_from_dict(
                 "description": "No description provided",
             }
 
-    return yaml.safe_dump(schema, sort_keys=False)
+    return yaml_backend.safe_dump(schema, sort_keys=False)
 
 
 def pydantic_type_to_yaml_schema(pydantic_type):
@@ -131,7 +131,9 @@ class YamlModel(BaseModel):
         """
         Serialize the Pydantic model instance to a YAML string.
         """
-        return yaml.safe_dump(self.input_dict, sort_keys=False)
+        return yaml_backend.safe_dump(
+            self.input_dict, sort_keys=False
+        )
 
     def from_yaml(self, cls, yaml_str: str):
         """
@@ -145,7 +147,7 @@ class YamlModel(BaseModel):
                  Returns None if there was an error loading the YAML data.
         """
         try:
-            data = yaml.safe_load(yaml_str)
+            data = yaml_backend.safe_load(yaml_str)
             return cls(**data)
         except ValueError as error:
             logger.error(f"Error loading YAML data: {error}")
@@ -156,10 +158,10 @@ class YamlModel(BaseModel):
         """
         Convert a JSON string to a YAML string.
         """
-        data = json.loads(
+        data = json_backend.loads(
             json_str
         )  # Convert JSON string to dictionary
-        return yaml.dump(data)
+        return yaml_backend.dump(data)
 
     def save_to_yaml(self, filename: str):
         """
@@ -216,13 +218,13 @@ class YamlModel(BaseModel):
         """
         Convert a YAML string to a Python dictionary.
         """
-        return yaml.safe_load(yaml_str)
+        return yaml_backend.safe_load(yaml_str)
 
     def dict_to_yaml(self, data: Dict[str, Any]):
         """
         Convert a Python dictionary to a YAML string.
         """
-        return yaml.safe_dump(data, sort_keys=False)
+        return yaml_backend.safe_dump(data, sort_keys=False)
 
 
 # dict = {'name': 'Alice', 'age': 30, 'is_active': True}
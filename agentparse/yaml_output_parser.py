@@ -1,12 +1,51 @@
-import json
 import re
-from typing import Type, TypeVar
+from time import perf_counter
+from typing import (
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
-import yaml
 from pydantic import BaseModel
 
+from agentparse import yaml_backend
+from agentparse.block_scanner import (
+    iter_candidate_spans,
+    iter_candidates,
+)
+from agentparse.instructions import format_instructions
+from agentparse.metrics import CHARS_TOTAL, FAILURES_TOTAL, METRICS
+from agentparse.parse_result import (
+    DEFAULT_MAX_MESSAGE_CHARS,
+    DEFAULT_SNIPPET_CHARS,
+    ParseError,
+    ParseResult,
+    decode_error,
+    exception_error,
+    truncate,
+)
+
 T = TypeVar("T", bound=BaseModel)
 
+# Fence info strings treated as YAML
+YAML_LANGUAGES = frozenset(["", "yaml", "yml"])
+
+
+def _failure_stage(error: Optional[Exception]) -> str:
+    if isinstance(error, yaml_backend.YAMLError):
+        return "yaml.decode"
+    return "yaml.validate"
+
+
+def _record_parse(started: float, text: str) -> None:
+    METRICS.stage_time("yaml.parse", started)
+    METRICS.inc(CHARS_TOTAL, len(text), stage="yaml.parse")
+
 
 class YamlParsingException(Exception):
     """Custom exception for errors in YAML parsing."""
@@ -20,7 +59,8 @@ class YamlOutputParser:
 
     Attributes:
         pydantic_object: A Pydantic model class for parsing and validation.
-        pattern: A regex pattern to match YAML code blocks.
+        pattern: The legacy regex for YAML code blocks; parsing now uses
+            agentparse.block_scanner.
 
 
     Examples:
@@ -46,6 +86,10 @@ class YamlOutputParser:
     def parse(self, text: str) -> T:
         """Parse the provided text to extract and validate YAML data.
 
+        Fenced ```yaml blocks are tried in the order they appear, and the
+        first one that validates is returned. Text without any is parsed
+        whole.
+
         Args:
             text: A string containing potential YAML data.
 
@@ -53,38 +97,296 @@ class YamlOutputParser:
             An instance of the specified Pydantic model with parsed data.
 
         Raises:
-            YamlParsingException: If parsing or validation fails.
+            YamlParsingException: If parsing or validation fails. The
+                error reported is the first block's.
         """
+        started = METRICS.enabled and perf_counter()
         try:
-            match = re.search(self.pattern, text.strip())
-            yaml_str = match.group("yaml") if match else text
-
-            json_object = yaml.safe_load(yaml_str)
-            return self.pydantic_object.parse_obj(json_object)
+            first_error = None
+            candidates = iter_candidates(
+                text, YAML_LANGUAGES, include_bare=False
+            )
+            if METRICS.enabled:
+                candidates = METRICS.timed_iter(
+                    "yaml.extract", candidates
+                )
+            for yaml_str in candidates:
+                try:
+                    return self._parse_block(yaml_str)
+                except (yaml_backend.YAMLError, Exception) as e:
+                    if first_error is None:
+                        first_error = e
 
-        except (yaml.YAMLError, Exception) as e:
+            if METRICS.enabled:
+                METRICS.inc(
+                    FAILURES_TOTAL, stage=_failure_stage(first_error)
+                )
             name = self.pydantic_object.__name__
             msg = (
                 f"Failed to parse {name} from text '{text}'."
-                f" Error: {e}"
+                f" Error: {first_error}"
+            )
+            raise YamlParsingException(msg) from first_error
+        finally:
+            if started:
+                _record_parse(started, text)
+
+    def parse_all(self, text: str) -> List[T]:
+        """Parse every YAML block in the text that validates against the model.
+
+        Args:
+            text: A string containing any number of YAML blocks.
+
+        Returns:
+            Model instances for the valid blocks, in document order.
+            Blocks that fail to parse or validate are skipped.
+        """
+        models = []
+        for yaml_str in iter_candidates(
+            text, YAML_LANGUAGES, include_bare=False
+        ):
+            try:
+                models.append(self._parse_block(yaml_str))
+            except (yaml_backend.YAMLError, Exception):
+                continue
+        return models
+
+    def parse_result(
+        self,
+        text: str,
+        max_message_chars: int = DEFAULT_MAX_MESSAGE_CHARS,
+        snippet_chars: int = DEFAULT_SNIPPET_CHARS,
+    ) -> ParseResult[T]:
+        """Parse like parse(), but return a ParseResult instead of raising.
+
+        Failures are described by a compact ParseError (stage, location,
+        truncated message and snippet) instead of an exception message
+        that embeds the whole input.
+
+        Args:
+            text: A string containing potential YAML data.
+            max_message_chars: Maximum length of the error message.
+            snippet_chars: Maximum length of the error's input excerpt.
+
+        Returns:
+            A ParseResult holding the model instance or the first block's error.
+        """
+        limits = (max_message_chars, snippet_chars)
+        started = METRICS.enabled and perf_counter()
+        try:
+            first_error = None
+            spans = iter_candidate_spans(
+                text, YAML_LANGUAGES, include_bare=False
+            )
+            if METRICS.enabled:
+                spans = METRICS.timed_iter("yaml.extract", spans)
+            for start, end in spans:
+                value, error = self._try_block(
+                    text, start, end, limits
+                )
+                if error is None:
+                    return ParseResult(value=value)
+                if first_error is None:
+                    first_error = error
+            if METRICS.enabled:
+                METRICS.inc(
+                    FAILURES_TOTAL, stage=f"yaml.{first_error.stage}"
+                )
+            return ParseResult(error=first_error)
+        finally:
+            if started:
+                _record_parse(started, text)
+
+    def parse_many(
+        self,
+        texts: Iterable[str],
+        max_message_chars: int = DEFAULT_MAX_MESSAGE_CHARS,
+        snippet_chars: int = DEFAULT_SNIPPET_CHARS,
+    ) -> List[ParseResult[T]]:
+        """Parse a batch of texts without raising.
+
+        Args:
+            texts: The texts to parse.
+            max_message_chars: Maximum length of each error message.
+            snippet_chars: Maximum length of each error's input excerpt.
+
+        Returns:
+            One ParseResult per text, in order.
+        """
+        return [
+            self.parse_result(text, max_message_chars, snippet_chars)
+            for text in texts
+        ]
+
+    def parse_stream(
+        self, stream: yaml_backend.Stream
+    ) -> Iterator[T]:
+        """Lazily parse a multi-document YAML stream, one model per document.
+
+        Documents are separated by "---" lines and loaded one at a time, so
+        for a file-like stream memory is bounded by the largest document,
+        not the whole stream. Empty documents are skipped. Unlike parse(),
+        the input is raw YAML: Markdown fences are not scanned for.
+
+        Args:
+            stream: A YAML string or a file-like object open for reading.
+
+        Yields:
+            A validated model instance per non-empty document, in order.
+
+        Raises:
+            YamlParsingException: When a document fails to parse or
+                validate. Documents before it have already been yielded;
+                a syntax error ends the stream.
+        """
+        name = self.pydantic_object.__name__
+        for index, data, error in self._iter_stream_documents(stream):
+            if error is None:
+                try:
+                    yield self._validate_python(data)
+                    continue
+                except Exception as e:
+                    error = e
+            msg = (
+                f"Failed to parse {name} from document {index} of"
+                f" YAML stream. Error: {error}"
+            )
+            raise YamlParsingException(msg) from error
+
+    def parse_stream_results(
+        self,
+        stream: yaml_backend.Stream,
+        max_message_chars: int = DEFAULT_MAX_MESSAGE_CHARS,
+        snippet_chars: int = DEFAULT_SNIPPET_CHARS,
+    ) -> Iterator[ParseResult[T]]:
+        """Like parse_stream(), but yield a ParseResult per document.
+
+        Documents that fail validation yield an error result and the
+        stream continues; a syntax error yields a final decode error,
+        since the rest of the stream cannot be read past it. Decode error
+        offsets are relative to the start of the stream.
+
+        Args:
+            stream: A YAML string or a file-like object open for reading.
+            max_message_chars: Maximum length of each error message.
+            snippet_chars: Maximum length of each error's input excerpt.
+
+        Yields:
+            One ParseResult per non-empty document, in order.
+        """
+        limits = (max_message_chars, snippet_chars)
+        for _, data, error in self._iter_stream_documents(stream):
+            if error is not None:
+                yield ParseResult(
+                    error=self._stream_decode_error(
+                        stream, error, limits
+                    )
+                )
+                return
+            try:
+                yield ParseResult(value=self._validate_python(data))
+            except Exception as e:
+                yield ParseResult(error=exception_error(e, *limits))
+
+    def _iter_stream_documents(
+        self, stream: yaml_backend.Stream
+    ) -> Iterator[Tuple[int, object, Optional[Exception]]]:
+        # (1-based document index, data, YAML error); an error is last
+        documents = yaml_backend.safe_load_all(stream)
+        index = 0
+        while True:
+            index += 1
+            try:
+                data = next(documents)
+            except StopIteration:
+                return
+            except yaml_backend.YAMLError as e:
+                yield index, None, e
+                return
+            if data is not None:
+                yield index, data, None
+
+    @staticmethod
+    def _stream_decode_error(
+        stream: yaml_backend.Stream,
+        error: Exception,
+        limits: Tuple[int, int],
+    ) -> ParseError:
+        mark = getattr(error, "problem_mark", None)
+        message = getattr(error, "problem", None) or str(error)
+        if isinstance(stream, str) and mark is not None:
+            return decode_error(
+                stream,
+                type(error).__name__,
+                message,
+                mark.index,
+                *limits,
             )
-            raise YamlParsingException(msg) from e
+        # A file-like stream is not kept, so there is no snippet
+        return ParseError(
+            stage="decode",
+            error_type=type(error).__name__,
+            message=truncate(message, limits[0]),
+            location=(
+                f"line {mark.line + 1} column {mark.column + 1}"
+                if mark is not None
+                else ""
+            ),
+            offset=mark.index if mark is not None else None,
+        )
 
-    def get_format_instructions(self) -> str:
+    def _try_block(
+        self, text: str, start: int, end: int, limits: Tuple[int, int]
+    ) -> Tuple[Optional[T], Optional[ParseError]]:
+        started = METRICS.enabled and perf_counter()
+        try:
+            json_object = yaml_backend.safe_load(text[start:end])
+        except yaml_backend.YAMLError as e:
+            mark = getattr(e, "problem_mark", None)
+            offset = start + mark.index if mark is not None else start
+            message = getattr(e, "problem", None) or str(e)
+            return None, decode_error(
+                text, type(e).__name__, message, offset, *limits
+            )
+        if started:
+            METRICS.stage_time("yaml.decode", started)
+            started = perf_counter()
+        try:
+            model = self._validate_python(json_object)
+        except Exception as e:
+            return None, exception_error(e, *limits)
+        if started:
+            METRICS.stage_time("yaml.validate", started)
+        return model, None
+
+    def _parse_block(self, yaml_str: str) -> T:
+        started = METRICS.enabled and perf_counter()
+        json_object = yaml_backend.safe_load(yaml_str)
+        if started:
+            METRICS.stage_time("yaml.decode", started)
+            started = perf_counter()
+        model = self._validate_python(json_object)
+        if started:
+            METRICS.stage_time("yaml.validate", started)
+        return model
+
+    def _validate_python(self, json_object: Any) -> T:
+        if hasattr(self.pydantic_object, "model_validate"):
+            return self.pydantic_object.model_validate(json_object)
+        return self.pydantic_object.parse_obj(json_object)
+
+    def get_format_instructions(self, style: str = "full") -> str:
         """Generate formatting instructions based on the Pydantic model schema.
 
+        The instructions are rendered once per model and style and then
+        served from the cache in agentparse.instructions.
+
+        Args:
+            style: How the schema is rendered (see format_instructions).
+
         Returns:
             A string containing formatting instructions.
         """
-        schema = self.pydantic_object.schema()
-        reduced_schema = {
-            k: v
-            for k, v in schema.items()
-            if k not in ["title", "type"]
-        }
-        schema_str = json.dumps(reduced_schema, indent=4)
-
-        format_instructions = (
-            f"YAML Formatting Instructions:\n{schema_str}"
+        return format_instructions(
+            self.pydantic_object, "yaml", style
         )
-        return format_instructions
@@ -0,0 +1,46 @@
+"""
+Benchmark AgentParse.parse_json_concurrently in thread and process mode.
+
+Usage:
+    python benchmarks/bench_agent_parse_modes.py --items 20000 --workers 1 2 4
+"""
+
+import argparse
+import time
+
+from agentparse.agent_parse import AgentParse
+from corpora import Record, make_outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4]
+    )
+    args = parser.parse_args()
+
+    outputs = make_outputs(args.items)
+    models = [Record] * len(outputs)
+    print(
+        f"{'mode':<8} {'workers':>7} {'seconds':>9} {'items/s':>10}"
+    )
+    # Untimed warm-up run, so pool start-up is not measured
+    warmup = max(1, len(outputs) // 10)
+    for mode in ("thread", "process"):
+        for workers in args.workers:
+            with AgentParse(workers=workers, mode=mode) as agent:
+                agent.parse_json_concurrently(
+                    models[:warmup], outputs[:warmup]
+                )
+                start = time.perf_counter()
+                agent.parse_json_concurrently(models, outputs)
+                elapsed = time.perf_counter() - start
+            print(
+                f"{mode:<8} {workers:7d} {elapsed:9.2f}"
+                f" {len(outputs) / elapsed:10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark chunk_text_dynamic against the previous per-word counting approach.
+
+Usage:
+    python benchmarks/bench_chunk_text_dynamic.py --words 10000 100000 1000000
+"""
+
+import argparse
+import time
+from typing import List
+
+from swarm_models.tiktoken_wrapper import TikTokenizer
+
+from agentparse.main import chunk_text_dynamic
+from corpora import make_text
+
+
+def chunk_text_per_word(text: str, limit_tokens: int) -> List[str]:
+    """The previous implementation: one count_tokens call per word."""
+    tokenizer = TikTokenizer()
+    chunks = []
+    current_chunk = []
+    current_token_count = 0
+
+    for word in text.split():
+        word_tokens = tokenizer.count_tokens(word)
+        if (
+            current_token_count + word_tokens > limit_tokens
+            and current_chunk
+        ):
+            chunks.append(" ".join(current_chunk))
+            current_chunk = []
+            current_token_count = 0
+
+        current_chunk.append(word)
+        current_token_count += word_tokens
+
+    if current_chunk:
+        chunks.append(" ".join(current_chunk))
+
+    return chunks
+
+
+def time_call(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--words",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000],
+    )
+    parser.add_argument("--limit-tokens", type=int, default=1000)
+    parser.add_argument(
+        "--legacy-max-words",
+        type=int,
+        default=100_000,
+        help="Skip the per-word baseline above this size",
+    )
+    args = parser.parse_args()
+
+    # Load the encoding outside the timed region
+    TikTokenizer()
+
+    print(
+        f"{'words':>10} {'MB':>8} {'per-word (s)':>14}"
+        f" {'encode-once (s)':>16} {'speedup':>8}"
+    )
+    for num_words in args.words:
+        text = make_text(num_words)
+        fast = time_call(chunk_text_dynamic, text, args.limit_tokens)
+        if num_words <= args.legacy_max_words:
+            slow = time_call(
+                chunk_text_per_word, text, args.limit_tokens
+            )
+            slow_str = f"{slow:14.3f}"
+            speedup = f"{slow / fast:7.1f}x"
+        else:
+            slow_str = f"{'skipped':>14}"
+            speedup = f"{'-':>8}"
+        size_mb = len(text.encode("utf-8")) / 1e6
+        print(
+            f"{num_words:>10} {size_mb:8.2f} {slow_str}"
+            f" {fast:16.3f} {speedup}"
+        )
+
+
+if __name__ == "__main__":
+    main()
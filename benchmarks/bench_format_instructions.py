@@ -0,0 +1,59 @@
+"""
+Compare the prompt cost of each format instruction style.
+
+Prints the characters and tokens (with the project tokenizer) of the JSON and
+YAML instructions in every style, so the cheapest form that still parses
+reliably can be picked per model.
+
+Usage:
+    python benchmarks/bench_format_instructions.py --encoding o200k_base
+"""
+
+import argparse
+
+from agentparse.instructions import (
+    FORMATS,
+    STYLES,
+    format_instruction_tokens,
+    format_instructions,
+)
+from agentparse.function_to_basemodel import (
+    function_to_pydantic_schema,
+)
+from agentparse.tokenizer import DEFAULT_ENCODING
+from corpora import Record, Report, make_function
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--encoding", default=DEFAULT_ENCODING)
+    args = parser.parse_args()
+
+    models = {
+        "Record": Record,
+        "Report": Report,
+        "tool (16 params)": function_to_pydantic_schema(
+            make_function(16)
+        ),
+    }
+    print(
+        f"{'model':<18} {'format':<6}"
+        + "".join(
+            f" {style + ' chars/tokens':>22}" for style in STYLES
+        )
+    )
+    for label, model in models.items():
+        for format in FORMATS:
+            tokens = format_instruction_tokens(
+                model, format, STYLES, args.encoding
+            )
+            cells = (
+                f"{len(format_instructions(model, format, style)):>12}"
+                f"/{tokens[style]:<9}"
+                for style in STYLES
+            )
+            print(f"{label:<18} {format:<6}" + "".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark agentparse.json_backend decoders on LLM-sized JSON outputs.
+
+Usage:
+    python benchmarks/bench_json_backends.py --repeat 5
+"""
+
+import argparse
+import time
+from typing import Dict
+
+from agentparse import json_backend
+from corpora import make_document
+
+SIZES: Dict[str, int] = {
+    "tool call (~0.5 KB)": 1,
+    "answer (~8 KB)": 25,
+    "report (~150 KB)": 500,
+}
+
+
+def time_loads(document: str, repeat: int) -> float:
+    """Return the best per-call time in microseconds."""
+    number = max(1, 200_000 // len(document))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            json_backend.loads(document)
+        best = min(best, (time.perf_counter() - start) / number)
+    return best * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    backends = json_backend.available_json_backends()
+    previous = json_backend.get_json_backend()
+    print(
+        f"{'document':<22} {'KB':>7}"
+        + "".join(f" {name + ' (us)':>19}" for name in backends)
+    )
+    try:
+        for label, num_items in SIZES.items():
+            document = make_document(num_items)
+            timings = []
+            for name in backends:
+                json_backend.set_json_backend(name)
+                timings.append(time_loads(document, args.repeat))
+            size_kb = len(document.encode("utf-8")) / 1e3
+            print(
+                f"{label:<22} {size_kb:7.1f}"
+                + "".join(f" {t:19.1f}" for t in timings)
+            )
+    finally:
+        json_backend.set_json_backend(previous)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark pure-Python PyYAML loading against agentparse.yaml_backend
+(libyaml). Dumping always uses the pure-Python dumpers, so it is not timed.
+
+Usage:
+    python benchmarks/bench_yaml_backends.py --repeat 5
+"""
+
+import argparse
+import time
+from typing import Callable, Dict
+
+import yaml
+
+from agentparse import yaml_backend
+from corpora import make_data
+
+SIZES: Dict[str, int] = {
+    "tool call (~0.5 KB)": 1,
+    "answer (~8 KB)": 25,
+    "report (~150 KB)": 500,
+}
+
+
+def best_time(
+    func: Callable[[], object], size: int, repeat: int
+) -> float:
+    """Return the best per-call time of func in microseconds."""
+    number = max(1, 50_000 // size)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if not yaml_backend.HAS_LIBYAML:
+        print(
+            "PyYAML was built without libyaml; both paths are equal."
+        )
+    print(
+        f"{'document':<22} {'KB':>7} {'load py (us)':>14}"
+        f" {'load C (us)':>13}"
+    )
+    for label, num_items in SIZES.items():
+        data = make_data(num_items)
+        document = yaml.safe_dump(data, allow_unicode=True)
+        size = len(document)
+        timings = [
+            best_time(
+                lambda document=document: yaml.safe_load(document),
+                size,
+                args.repeat,
+            ),
+            best_time(
+                lambda document=document: yaml_backend.safe_load(
+                    document
+                ),
+                size,
+                args.repeat,
+            ),
+        ]
+        size_kb = len(document.encode("utf-8")) / 1e3
+        print(
+            f"{label:<22} {size_kb:7.1f} {timings[0]:14.1f}"
+            f" {timings[1]:13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+Deterministic synthetic corpora shared by the benchmarks.
+
+Every generator takes a seed, so the same arguments always produce the same
+bytes and timings stay comparable across runs and releases.
+"""
+
+import json
+import os
+import random
+import zipfile
+from typing import Any, Callable, Dict, List, Optional
+from xml.sax.saxutils import escape
+
+import openpyxl
+import yaml
+from pydantic import BaseModel
+
+# Prose vocabulary, mixing ASCII, accents, CJK and punctuation
+VOCABULARY = (
+    "the quick brown fox jumps over lazy dog agent parse model token"
+    " chunk document pipeline ingestion transcript speaker said that"
+    " revenue quarter growth customer support latency throughput 2024"
+    " naïve café résumé 数据 分析, hello! (example) [note] {json}"
+).split()
+
+# Words used in the fields of structured answers
+WORDS = (
+    "the agent called a tool and returned the result to the user"
+    " with a summary of revenue growth latency and customer feedback"
+    " café résumé 数据"
+).split()
+
+
+class Record(BaseModel):
+    id: int
+    title: str
+    summary: str
+    score: float
+    tags: List[str]
+    done: bool
+    parent: Optional[int] = None
+
+
+class Report(BaseModel):
+    status: str
+    reasoning: str
+    items: List[Record]
+
+
+def make_text(num_words: int, seed: int = 0) -> str:
+    """Build a deterministic document of num_words words, 12 per line."""
+    rng = random.Random(seed)
+    words = rng.choices(VOCABULARY, k=num_words)
+    lines = [
+        " ".join(words[i : i + 12]) for i in range(0, num_words, 12)
+    ]
+    return "\n".join(lines)
+
+
+def make_paragraphs(num_words: int, seed: int = 0) -> List[str]:
+    """Split make_text output into paragraphs of 10 lines."""
+    lines = make_text(num_words, seed).split("\n")
+    return [
+        " ".join(lines[i : i + 10]) for i in range(0, len(lines), 10)
+    ]
+
+
+def make_record(rng: random.Random, index: int) -> Dict[str, Any]:
+    """Build one record matching the Record model."""
+    return {
+        "id": index,
+        "title": " ".join(rng.choices(WORDS, k=6)),
+        "summary": " ".join(rng.choices(WORDS, k=40)),
+        "score": round(rng.random(), 4),
+        "tags": rng.sample(WORDS, 3),
+        "done": rng.random() < 0.5,
+        "parent": None,
+    }
+
+
+def make_data(num_items: int, seed: int = 0) -> Dict[str, Any]:
+    """Build a structured answer, matching Report, with num_items records."""
+    rng = random.Random(seed)
+    return {
+        "status": "ok",
+        "reasoning": " ".join(WORDS),
+        "items": [make_record(rng, i) for i in range(num_items)],
+    }
+
+
+def make_document(num_items: int, seed: int = 0) -> str:
+    """Serialize make_data as indented JSON."""
+    return json.dumps(
+        make_data(num_items, seed), indent=2, ensure_ascii=False
+    )
+
+
+def make_json_answer(num_items: int, seed: int = 0) -> str:
+    """Wrap make_document in a fenced block with some surrounding chatter."""
+    return (
+        "Sure, here is the report you asked for:\n```json\n"
+        + make_document(num_items, seed)
+        + "\n```\nLet me know if you need anything else."
+    )
+
+
+def make_yaml_answer(num_items: int, seed: int = 0) -> str:
+    """Wrap make_data, dumped as block-style YAML, in a fenced block."""
+    document = yaml.safe_dump(
+        make_data(num_items, seed),
+        allow_unicode=True,
+        sort_keys=False,
+    )
+    return (
+        "Sure, here is the report you asked for:\n```yaml\n"
+        + document
+        + "```\nLet me know if you need anything else."
+    )
+
+
+def make_outputs(count: int, seed: int = 0) -> List[str]:
+    """Build count fenced LLM answers, each holding one Record."""
+    rng = random.Random(seed)
+    return [
+        "Here is the record:\n```json\n"
+        + json.dumps(make_record(rng, i), indent=2)
+        + "\n```"
+        for i in range(count)
+    ]
+
+
+def write_pdf(path: str, page_texts: List[str]) -> str:
+    """Write a minimal PDF with one line of Helvetica text per page."""
+    num_pages = len(page_texts)
+    page_ids = [4 + 2 * i for i in range(num_pages)]
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: (
+            b"<< /Type /Pages /Kids ["
+            + b" ".join(b"%d 0 R" % i for i in page_ids)
+            + b"] /Count %d >>" % num_pages
+        ),
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for page_id, text in zip(page_ids, page_texts):
+        # Helvetica only covers Latin-1; escape the string delimiters
+        line = (
+            text.encode("latin-1", "replace")
+            .replace(b"\\", b"\\\\")
+            .replace(b"(", b"\\(")
+            .replace(b")", b"\\)")
+        )
+        stream = b"BT /F1 12 Tf 72 720 Td (%s) Tj ET" % line
+        objects[page_id] = (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792]"
+            b" /Resources << /Font << /F1 3 0 R >> >>"
+            b" /Contents %d 0 R >>" % (page_id + 1)
+        )
+        objects[page_id + 1] = (
+            b"<< /Length %d >>\nstream\n%s\nendstream"
+            % (len(stream), stream)
+        )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (obj_id, objects[obj_id])
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for obj_id in sorted(objects):
+        out += b"%010d 00000 n \n" % offsets[obj_id]
+    out += (
+        b"trailer\n<< /Size %d /Root 1 0 R"
+        b" >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    )
+    with open(path, "wb") as file:
+        file.write(bytes(out))
+    return path
+
+
+def write_xlsx(path: str, num_rows: int, seed: int = 0) -> str:
+    """Write a one-sheet workbook with a header and num_rows records."""
+    rng = random.Random(seed)
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("records")
+    sheet.append(["id", "title", "score", "done"])
+    for i in range(num_rows):
+        record = make_record(rng, i)
+        sheet.append(
+            [i, record["title"], record["score"], record["done"]]
+        )
+    workbook.save(path)
+    return path
+
+
+def write_docx(path: str, paragraphs: List[str]) -> str:
+    """Write a minimal .docx holding one run per paragraph."""
+    namespace = (
+        "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    )
+    body = "".join(
+        f"<w:p><w:r><w:t>{escape(text)}</w:t></w:r></w:p>"
+        for text in paragraphs
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{namespace}"><w:body>{body}'
+        "</w:body></w:document>"
+    )
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8"?><Types'
+        ' xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml"'
+        ' ContentType="application/'
+        'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        "</Types>"
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", content_types)
+        archive.writestr("word/document.xml", document)
+    return path
+
+
+# Formats file_to_string handles out of the box
+FIXTURE_EXTENSIONS = (
+    ".txt",
+    ".csv",
+    ".json",
+    ".pdf",
+    ".xlsx",
+    ".docx",
+)
+
+
+def write_fixture(
+    directory: str, extension: str, num_words: int, seed: int = 0
+) -> str:
+    """
+    Write a file of the given format holding about num_words words.
+
+    Text formats hold make_text content (JSON a make_document report), the
+    PDF one page and the .docx one paragraph per make_paragraphs entry, and
+    the workbook num_words // 10 rows.
+
+    Returns:
+        str: The path of the written file.
+    """
+    path = os.path.join(directory, f"corpus-{num_words}{extension}")
+    if extension in (".txt", ".csv", ".json"):
+        if extension == ".json":
+            text = make_document(max(1, num_words // 50), seed)
+        else:
+            text = make_text(num_words, seed)
+            if extension == ".csv":
+                text = text.replace(" ", ",")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+        return path
+    if extension == ".pdf":
+        return write_pdf(path, make_paragraphs(num_words, seed))
+    if extension == ".xlsx":
+        return write_xlsx(path, max(1, num_words // 10), seed)
+    if extension == ".docx":
+        return write_docx(path, make_paragraphs(num_words, seed))
+    raise ValueError(f"no fixture writer for {extension!r}")
+
+
+# Parameter annotations of make_function, as source text
+PARAMETER_TYPES = (
+    "int",
+    "str",
+    "float",
+    "bool",
+    "List[str]",
+    "Dict[str, int]",
+    "Tuple[int, str]",
+    "Union[int, str]",
+    "Optional[int]",
+)
+
+
+def make_function(
+    num_params: int, seed: int = 0
+) -> Callable[..., Any]:
+    """
+    Build a tool-like function with num_params annotated parameters.
+
+    Optional parameters default to None and come last, as in hand-written
+    tool signatures.
+    """
+    rng = random.Random(seed)
+    annotations = sorted(
+        rng.choices(PARAMETER_TYPES, k=num_params),
+        key=lambda annotation: annotation.startswith("Optional"),
+    )
+    params = ", ".join(
+        f"arg{i}: {annotation}"
+        + (" = None" if annotation.startswith("Optional") else "")
+        for i, annotation in enumerate(annotations)
+    )
+    namespace: Dict[str, Any] = {}
+    exec(
+        "from typing import Dict, List, Optional, Tuple, Union\n"
+        f"def tool_{num_params}({params}):\n    pass\n",
+        namespace,
+    )
+    return namespace[f"tool_{num_params}"]
@@ -0,0 +1,571 @@
+"""
+Microbenchmark suite for agentparse's hot paths.
+
+Every benchmark runs on deterministic synthetic corpora (see corpora.py) at
+three sizes. Each case is warmed up, then timed in repeats of enough calls to
+last --min-time seconds; the per-call minimum, median, mean and standard
+deviation are reported. Results can be written as JSON and compared against
+a stored baseline; the run exits with status 1 when a case is slower than
+the baseline by more than --tolerance, and with status 2 when a case fails
+to run.
+
+Timings only compare on the same machine, so the baseline is not committed:
+record it with --save-baseline on the base branch (by default to
+benchmarks/baseline.json, which git ignores), then run --baseline on your
+branch. A filtered --save-baseline run updates only the cases it ran.
+
+Usage:
+    python benchmarks/run_suite.py --save-baseline
+    python benchmarks/run_suite.py --baseline --tolerance 0.2
+    python benchmarks/run_suite.py --output results.json
+    python benchmarks/run_suite.py --filter "json.*" "yaml.*" --sizes small
+    python benchmarks/run_suite.py --list
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from agentparse import json_backend, yaml_backend
+from agentparse.agent_parse import AgentParse
+from agentparse.function_to_basemodel import (
+    clear_function_model_cache,
+    function_to_pydantic_schema,
+)
+from agentparse.json_output_parser import JsonOutputParser
+from agentparse.main import chunk_text_dynamic, file_to_string
+from agentparse.metrics import METRICS
+from agentparse.whitespace import (
+    remove_whitespace_from_json,
+    remove_whitespace_from_yaml,
+)
+from agentparse.yaml_output_parser import YamlOutputParser
+from corpora import (
+    FIXTURE_EXTENSIONS,
+    Record,
+    Report,
+    make_document,
+    make_function,
+    make_json_answer,
+    make_outputs,
+    make_text,
+    make_yaml_answer,
+    write_fixture,
+)
+
+SIZES = ("small", "medium", "large")
+RESULTS_VERSION = 1
+DEFAULT_BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baseline.json"
+)
+
+
+@dataclass
+class Context:
+    """What a benchmark setup may use: options and a place for cleanups."""
+
+    workers: int
+    stack: ExitStack
+    _directory: Optional[str] = field(default=None, repr=False)
+
+    def directory(self) -> str:
+        """Return a temporary directory removed after the case."""
+        if self._directory is None:
+            self._directory = self.stack.enter_context(
+                tempfile.TemporaryDirectory(
+                    prefix="agentparse-bench-"
+                )
+            )
+        return self._directory
+
+
+# A setup builds the inputs for one size outside the timed region and
+# returns the zero-argument call to time
+Setup = Callable[[int, Context], Callable[[], Any]]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Setup
+    # Size label -> the parameter passed to setup
+    sizes: Dict[str, int]
+    unit: str
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(
+    name: str, small: int, medium: int, large: int, unit: str
+) -> Callable[[Setup], Setup]:
+    """Register a setup under name, with its parameter for each size."""
+
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS[name] = Benchmark(
+            name,
+            setup,
+            {"small": small, "medium": medium, "large": large},
+            unit,
+        )
+        return setup
+
+    return register
+
+
+@benchmark("json.parse", 1, 25, 500, "records")
+def json_parse(size: int, context: Context):
+    parser = JsonOutputParser(Report)
+    text = make_json_answer(size)
+    return lambda: parser.parse(text)
+
+
+@benchmark("json.parse_result", 1, 25, 500, "records")
+def json_parse_result(size: int, context: Context):
+    parser = JsonOutputParser(Report)
+    text = make_json_answer(size)
+    return lambda: parser.parse_result(text)
+
+
+@benchmark("yaml.parse", 1, 25, 500, "records")
+def yaml_parse(size: int, context: Context):
+    parser = YamlOutputParser(Report)
+    text = make_yaml_answer(size)
+    return lambda: parser.parse(text)
+
+
+@benchmark("whitespace.json", 1, 25, 500, "records")
+def whitespace_json(size: int, context: Context):
+    document = make_document(size)
+    return lambda: remove_whitespace_from_json(document)
+
+
+@benchmark("whitespace.yaml", 1, 25, 500, "records")
+def whitespace_yaml(size: int, context: Context):
+    document = make_yaml_answer(size).split("```yaml\n")[1]
+    document = document.split("```")[0]
+    return lambda: remove_whitespace_from_yaml(document)
+
+
+@benchmark("chunk.text_dynamic", 1_000, 20_000, 200_000, "words")
+def chunk_text(size: int, context: Context):
+    text = make_text(size)
+    return lambda: chunk_text_dynamic(text, 1000)
+
+
+def _file_benchmark(extension: str) -> None:
+    @benchmark(
+        f"file.to_string{extension}", 1_000, 20_000, 100_000, "words"
+    )
+    def to_string(size: int, context: Context):
+        path = write_fixture(context.directory(), extension, size)
+        return lambda: file_to_string(path)
+
+
+for _extension in FIXTURE_EXTENSIONS:
+    _file_benchmark(_extension)
+
+
+@benchmark("function_schema.build", 2, 8, 32, "params")
+def function_schema_build(size: int, context: Context):
+    func = make_function(size)
+
+    def build():
+        clear_function_model_cache()
+        return function_to_pydantic_schema(func)
+
+    return build
+
+
+@benchmark("function_schema.cached", 2, 8, 32, "params")
+def function_schema_cached(size: int, context: Context):
+    func = make_function(size)
+    return lambda: function_to_pydantic_schema(func)
+
+
+def _agent(context: Context, mode: str = "thread") -> AgentParse:
+    return context.stack.enter_context(
+        AgentParse(workers=context.workers, mode=mode)
+    )
+
+
+@benchmark(
+    "agent.parse_json_concurrently", 100, 1_000, 10_000, "items"
+)
+def agent_parse_threads(size: int, context: Context):
+    agent = _agent(context)
+    outputs = make_outputs(size)
+    models = [Record] * size
+    return lambda: agent.parse_json_concurrently(models, outputs)
+
+
+@benchmark(
+    "agent.parse_json_concurrently.process",
+    100,
+    1_000,
+    10_000,
+    "items",
+)
+def agent_parse_processes(size: int, context: Context):
+    agent = _agent(context, mode="process")
+    outputs = make_outputs(size)
+    models = [Record] * size
+    return lambda: agent.parse_json_concurrently(models, outputs)
+
+
+@benchmark("agent.imap", 100, 1_000, 10_000, "items")
+def agent_imap(size: int, context: Context):
+    agent = _agent(context)
+    outputs = make_outputs(size)
+    return lambda: sum(1 for _ in agent.imap(Record, outputs))
+
+
+@benchmark("agent.aparse_json_many", 100, 1_000, 10_000, "items")
+def agent_aparse_json_many(size: int, context: Context):
+    agent = _agent(context)
+    outputs = make_outputs(size)
+    models = [Record] * size
+    return lambda: asyncio.run(
+        agent.aparse_json_many(models, outputs)
+    )
+
+
+@benchmark(
+    "agent.convert_functions_concurrently",
+    10,
+    100,
+    1_000,
+    "functions",
+)
+def agent_convert_functions(size: int, context: Context):
+    agent = _agent(context)
+    functions = [make_function(8, seed) for seed in range(size)]
+
+    def convert():
+        clear_function_model_cache()
+        return agent.convert_functions_concurrently(functions)
+
+    return convert
+
+
+def time_case(
+    func: Callable[[], Any], repeat: int, min_time: float
+) -> Dict[str, Any]:
+    """Time func, returning per-call statistics in seconds."""
+    # The warm-up call also fills lazy caches and pools and calibrates
+    start = time.perf_counter()
+    func()
+    once = time.perf_counter() - start
+    number = max(1, int(min_time / once)) if once > 0 else 1000
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "stdev": statistics.stdev(timings) if repeat > 1 else 0.0,
+    }
+
+
+def run_case(
+    bench: Benchmark,
+    size: str,
+    workers: int,
+    repeat: int,
+    min_time: float,
+) -> Dict[str, Any]:
+    result: Dict[str, Any] = {
+        "benchmark": bench.name,
+        "size": size,
+        "param": bench.sizes[size],
+        "unit": bench.unit,
+    }
+    try:
+        with ExitStack() as stack:
+            func = bench.setup(
+                bench.sizes[size], Context(workers, stack)
+            )
+            result.update(time_case(func, repeat, min_time))
+    except Exception as error:
+        result["error"] = f"{type(error).__name__}: {error}"
+    return result
+
+
+def environment() -> Dict[str, Any]:
+    """Describe what the results were measured on."""
+    try:
+        from importlib.metadata import version
+
+        agentparse_version = version("agentparse")
+    except Exception:
+        agentparse_version = None
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "agentparse": agentparse_version,
+        "json_backend": json_backend.get_json_backend(),
+        "libyaml": yaml_backend.HAS_LIBYAML,
+        "metrics_enabled": METRICS.enabled,
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    metric: str,
+    tolerance: float,
+) -> List[Dict[str, Any]]:
+    """
+    Compare each case with its baseline entry.
+
+    Returns:
+        List[Dict[str, Any]]: One row per case present in both runs, with
+            the ratio current / baseline of metric and whether it regressed
+            beyond 1 + tolerance.
+    """
+    rows = []
+    for case, result in results.items():
+        previous = baseline.get(case)
+        if (
+            previous is None
+            or metric not in previous
+            or metric not in result
+        ):
+            continue
+        ratio = result[metric] / previous[metric]
+        rows.append({
+            "case": case,
+            "baseline": previous[metric],
+            "current": result[metric],
+            "ratio": ratio,
+            "regressed": ratio > 1 + tolerance,
+        })
+    return rows
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def select(
+    patterns: Optional[List[str]], sizes: List[str]
+) -> List[Tuple[Benchmark, str]]:
+    cases = []
+    for name, bench in BENCHMARKS.items():
+        if patterns and not any(
+            fnmatch.fnmatchcase(name, pattern) for pattern in patterns
+        ):
+            continue
+        cases.extend((bench, size) for size in sizes)
+    return cases
+
+
+def write_report(path: str, report: Dict[str, Any]) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+        file.write("\n")
+
+
+def save_baseline(path: str, report: Dict[str, Any]) -> None:
+    """
+    Write report as the baseline at path.
+
+    Cases of an existing baseline that this run did not time are kept, so
+    a filtered run refreshes just its own cases.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as file:
+            results = json.load(file)["results"]
+    results.update(report["results"])
+    baseline = {
+        key: value
+        for key, value in report.items()
+        if key != "comparison"
+    }
+    write_report(path, {**baseline, "results": results})
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--filter",
+        nargs="+",
+        metavar="PATTERN",
+        help="Run only benchmarks whose name matches a glob pattern",
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", choices=SIZES, default=list(SIZES)
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.1,
+        help="Minimum seconds per repeat (default: 0.1)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=min(4, os.cpu_count() or 1),
+        help="Workers of the AgentParse benchmarks",
+    )
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument(
+        "--baseline",
+        nargs="?",
+        const=DEFAULT_BASELINE,
+        metavar="PATH",
+        help=(
+            "Compare against a saved baseline or an earlier --output"
+            " file (default: benchmarks/baseline.json)"
+        ),
+    )
+    parser.add_argument(
+        "--save-baseline",
+        nargs="?",
+        const=DEFAULT_BASELINE,
+        metavar="PATH",
+        help=(
+            "Record the results as the baseline"
+            " (default: benchmarks/baseline.json)"
+        ),
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help=(
+            "Allowed slowdown over the baseline (default: 0.2 = 20%%)"
+        ),
+    )
+    parser.add_argument(
+        "--metric",
+        choices=("min", "median", "mean"),
+        default="min",
+        help="Statistic compared with the baseline (default: min)",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="List the benchmarks"
+    )
+    args = parser.parse_args(argv)
+
+    cases = select(args.filter, args.sizes)
+    if args.list:
+        for name, bench in BENCHMARKS.items():
+            sizes = ", ".join(
+                f"{size}={param}"
+                for size, param in bench.sizes.items()
+            )
+            print(f"{name:<42} {bench.unit}: {sizes}")
+        return 0
+    if not cases:
+        parser.error("no benchmark matches --filter")
+    if args.baseline and not os.path.exists(args.baseline):
+        parser.error(
+            f"no baseline at {args.baseline}; record one on the base"
+            " branch with --save-baseline"
+        )
+
+    # Per-call debug logging would dominate the cheaper cases
+    logger.disable("agentparse")
+
+    print(f"{'case':<52} {'min':>10} {'median':>10} {'stdev':>8}")
+    results: Dict[str, Dict[str, Any]] = {}
+    for bench, size in cases:
+        case = f"{bench.name}[{size}]"
+        result = run_case(
+            bench, size, args.workers, args.repeat, args.min_time
+        )
+        results[case] = result
+        if "error" in result:
+            print(f"{case:<52} failed: {result['error']}")
+            continue
+        print(
+            f"{case:<52} {format_seconds(result['min']):>10}"
+            f" {format_seconds(result['median']):>10}"
+            f" {result['stdev'] / result['mean']:7.1%}"
+        )
+
+    report: Dict[str, Any] = {
+        "version": RESULTS_VERSION,
+        "environment": environment(),
+        "results": results,
+    }
+    status = 2 if any("error" in r for r in results.values()) else 0
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        rows = compare(results, baseline, args.metric, args.tolerance)
+        report["comparison"] = {
+            "baseline": args.baseline,
+            "metric": args.metric,
+            "tolerance": args.tolerance,
+            "cases": rows,
+        }
+        print(
+            f"\n{'case':<52} {'baseline':>10} {'current':>10}"
+            f" {'change':>8}"
+        )
+        for row in rows:
+            flag = "  REGRESSION" if row["regressed"] else ""
+            print(
+                f"{row['case']:<52}"
+                f" {format_seconds(row['baseline']):>10}"
+                f" {format_seconds(row['current']):>10}"
+                f" {row['ratio'] - 1:+8.1%}{flag}"
+            )
+        regressions = [row for row in rows if row["regressed"]]
+        if regressions:
+            print(
+                f"\n{len(regressions)} of {len(rows)} cases regressed"
+                f" by more than {args.tolerance:.0%}",
+                file=sys.stderr,
+            )
+            status = status or 1
+
+    if args.output:
+        write_report(args.output, report)
+    if args.save_baseline:
+        if status == 2:
+            print(
+                "not saving a baseline: some cases failed",
+                file=sys.stderr,
+            )
+        else:
+            save_baseline(args.save_baseline, report)
+            print(f"\nbaseline saved to {args.save_baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+# AgentParse
+
+import asyncio
+import gc
+import itertools
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pydantic import BaseModel, create_model
+
+from agentparse import json_output_parser
+from agentparse.agent_parse import AgentParse
+from agentparse.json_output_parser import JsonParsingException
+
+
+class Person(BaseModel):
+    name: str
+    age: int
+
+
+class Item(BaseModel):
+    id: int
+
+
+def make_inputs(count):
+    models, data = [], []
+    for i in range(count):
+        if i % 2:
+            models.append(Item)
+            data.append(f'{{"id": {i}}}')
+        else:
+            models.append(Person)
+            data.append(
+                f'```json\n{{"name": "p{i}", "age": {i}}}\n```'
+            )
+    return models, data
+
+
+# Test an unknown execution mode is rejected
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        AgentParse(mode="fiber")
+
+
+# Test each model's schema is checked once and not kept alive
+def test_model_setup_is_cached_weakly(monkeypatch):
+    calls = []
+    uses_strict = json_output_parser._uses_strict
+    monkeypatch.setattr(
+        json_output_parser,
+        "_uses_strict",
+        lambda schema: calls.append(schema) or uses_strict(schema),
+    )
+    agent = AgentParse()
+    Temporary = create_model("Temporary", name=(str, ...))
+    for _ in range(3):
+        agent.parse_json_with_base_model(Temporary, '{"name": "a"}')
+    model = weakref.ref(Temporary)
+    schema = Temporary.__pydantic_core_schema__
+
+    assert sum(walked is schema for walked in calls) == 1
+    # The recorded core schemas refer to the model class too
+    del schema, calls[:]
+    del Temporary
+    gc.collect()
+    assert model() is None
+
+
+# Test process mode returns the same results in input order
+@pytest.mark.parametrize("chunksize", [None, 1, 7])
+def test_process_mode_matches_thread_mode(chunksize):
+    models, data = make_inputs(25)
+
+    with AgentParse(workers=2) as agent:
+        threaded = agent.parse_json_concurrently(models, data)
+    with AgentParse(
+        workers=2, mode="process", chunksize=chunksize
+    ) as agent:
+        processed = agent.parse_json_concurrently(models, data)
+
+    assert processed == threaded
+    assert [type(m) for m in processed] == models
+
+
+# Test process mode raises the first failing item's exception
+def test_process_mode_raises_first_error():
+    models, data = make_inputs(10)
+    data[3] = '{"id": "three"}'
+    data[8] = "not json"
+    with AgentParse(workers=2, mode="process", chunksize=2) as agent:
+        with pytest.raises(JsonParsingException, match="three"):
+            agent.parse_json_concurrently(models, data)
+
+
+# Test process mode with return_results reports failures per item
+def test_process_mode_return_results():
+    models, data = make_inputs(6)
+    data[1] = '{"id": "one"}'
+    with AgentParse(workers=2, mode="process") as agent:
+        results = agent.parse_json_concurrently(
+            models, data, return_results=True
+        )
+        assert agent.parse_json_concurrently([], []) == []
+
+    assert [r.ok for r in results] == [True, False] + [True] * 4
+    assert results[1].error.location == "id"
+
+
+# Test the pool persists across calls until close()
+def test_persistent_executor():
+    models, data = make_inputs(4)
+    with AgentParse(workers=2) as agent:
+        agent.parse_json_concurrently(models, data)
+        pool = agent._get_executor()
+        agent.parse_json_concurrently(models, data)
+        assert agent._get_executor() is pool
+
+    assert agent._pools == {}
+    with pytest.raises(RuntimeError):
+        pool.submit(int)
+
+
+# Test imap pulls inputs lazily within the in-flight window
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_imap_is_bounded(mode):
+    pulled = 0
+
+    def messages():
+        nonlocal pulled
+        for i in itertools.count():
+            pulled += 1
+            yield f'{{"id": {i}}}'
+
+    with AgentParse(workers=2, mode=mode, chunksize=3) as agent:
+        results = agent.imap(Item, messages(), max_in_flight=4)
+        first = list(itertools.islice(results, 10))
+        results.close()
+
+    assert [item.id for item in first] == list(range(10))
+    assert pulled <= 10 + 4 * 3 + 3
+
+
+# Test imap pairs per-item models and reports errors in order
+def test_imap_models_and_errors():
+    models, data = make_inputs(6)
+    data[4] = "{"
+    with AgentParse(workers=2) as agent:
+        results = list(
+            agent.imap(iter(models), iter(data), return_results=True)
+        )
+        with pytest.raises(JsonParsingException):
+            list(agent.imap(models, data))
+        with pytest.raises(ValueError):
+            agent.imap(Item, [], max_in_flight=-1)
+
+    assert [r.ok for r in results] == [True] * 4 + [False, True]
+    assert results[4].error.stage == "decode"
+
+
+async def delayed(value, seconds):
+    await asyncio.sleep(seconds)
+    return value
+
+
+# Test aparse_json_many keeps input order
+def test_aparse_json_many():
+    models, data = make_inputs(12)
+    agent = AgentParse(workers=3)
+
+    parsed = asyncio.run(agent.aparse_json_many(models, data))
+
+    assert parsed == agent.parse_json_concurrently(models, data)
+
+
+# Test aparse_json_as_completed yields responses as they arrive
+def test_aparse_json_as_completed_order():
+    agent = AgentParse(workers=2)
+    data = [
+        delayed('{"id": 0}', 0.2),
+        delayed('{"id": 1}', 0.0),
+        delayed('{"id": 2}', 0.1),
+    ]
+
+    async def collect():
+        return [
+            (index, item.id)
+            async for index, item in agent.aparse_json_as_completed(
+                [Item] * 3, data
+            )
+        ]
+
+    assert asyncio.run(collect()) == [(1, 1), (2, 2), (0, 0)]
+
+
+# Test a failure is raised from the iterator unless results are requested
+def test_aparse_json_as_completed_errors():
+    agent = AgentParse(workers=2)
+
+    async def collect(return_results):
+        return [
+            result
+            async for _, result in agent.aparse_json_as_completed(
+                [Item, Item], ['{"id": 1}', "nope"], return_results
+            )
+        ]
+
+    with pytest.raises(JsonParsingException):
+        asyncio.run(collect(False))
+    results = asyncio.run(collect(True))
+    assert sorted(r.ok for r in results) == [False, True]
+
+
+# Test the semaphore caps parses running at once
+def test_max_concurrency():
+    running, peak = 0, 0
+    lock = threading.Lock()
+
+    def slow_parse(*args):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+
+    agent = AgentParse(
+        executor=ThreadPoolExecutor(max_workers=8), max_concurrency=2
+    )
+
+    async def run_all():
+        await asyncio.gather(*(
+            agent._run_in_executor(agent.executor, slow_parse)
+            for _ in range(8)
+        ))
+
+    asyncio.run(run_all())
+    agent.executor.shutdown()
+    assert peak == 2
+
+
+# Test ayaml_output_parse and aconvert_functions
+def test_ayaml_and_aconvert_functions():
+    def greet(name: str, times: int = 1) -> str:
+        return name * times
+
+    agent = AgentParse(workers=2)
+
+    async def run_all():
+        person = await agent.ayaml_output_parse(
+            Person, delayed("name: A\nage: 1", 0)
+        )
+        models = await agent.aconvert_functions(
+            [greet, greet], ["First", "Second"]
+        )
+        return person, models
+
+    person, models = asyncio.run(run_all())
+    assert person == Person(name="A", age=1)
+    assert [m.__name__ for m in models] == ["First", "Second"]
@@ -0,0 +1,71 @@
+# fenced-block and bare JSON span scanning
+
+from agentparse.block_scanner import (
+    TextBlock,
+    iter_candidates,
+    scan_blocks,
+)
+
+MIXED = (
+    "See [1] and {oops.\n"
+    "```json\n"
+    '{"name": "a `tick` }", "age": 1}\n'
+    "```\n"
+    'Also {"name": "b", "age": 2} and [1, {"x": "]"}]\n'
+    "~~~yaml\n"
+    "name: c\n"
+    "~~~\n"
+)
+
+
+def block_texts(text):
+    return [
+        (block.language, text[block.start : block.end])
+        for block in scan_blocks(text)
+    ]
+
+
+# Test every fenced block and bare span is found in document order
+def test_scan_blocks_mixed_text():
+    assert block_texts(MIXED) == [
+        (None, "[1]"),
+        ("json", '{"name": "a `tick` }", "age": 1}'),
+        (None, '{"name": "b", "age": 2}'),
+        (None, '[1, {"x": "]"}]'),
+        ("yaml", "name: c"),
+    ]
+
+
+# Test an unclosed fence runs to the end of the text
+def test_unclosed_fence_runs_to_end():
+    text = 'Streaming...\n```json\n{"partial": tr'
+
+    assert block_texts(text) == [("json", '{"partial": tr')]
+
+
+# Test a fence closed on its own line
+def test_single_line_fence():
+    text = '```json {"inline": true}```'
+
+    assert list(scan_blocks(text)) == [TextBlock(7, 24, "json")]
+
+
+# Test brackets inside JSON strings do not end a span
+def test_brackets_inside_strings():
+    text = 'x {"a": "}]", "b": "\\"{"} y'
+
+    assert block_texts(text) == [(None, '{"a": "}]", "b": "\\"{"}')]
+
+
+# Test the whole text is the fallback candidate
+def test_iter_candidates_falls_back_to_text():
+    text = "name: John\nage: 42"
+
+    assert list(iter_candidates(text, {"", "yaml"})) == [text]
+
+
+# Test candidates are filtered by fence language
+def test_iter_candidates_filters_languages():
+    assert list(
+        iter_candidates(MIXED, {"yaml"}, include_bare=False)
+    ) == ["name: c"]
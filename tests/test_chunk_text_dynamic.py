@@ -1,7 +1,11 @@
 # chunk_text_dynamic
 
 import pytest
-from agentparse import chunk_text_dynamic
+from agentparse import (
+    chunk_corpus,
+    chunk_text_dynamic,
+    iter_text_chunks,
+)
 
 
 # Test normal case with a standard text input
@@ -57,3 +61,86 @@ def test_chunk_text_dynamic_with_punctuation():
     assert len(chunks) == 1
     assert "Hello, world!" in chunks[0]
     assert "Let's see how it handles punctuation." in chunks[0]
+
+
+# Test that chunks preserve every word in order
+def test_chunk_text_dynamic_preserves_words():
+    text = "alpha beta\ngamma  delta\tepsilon " * 200
+    chunks = chunk_text_dynamic(text, limit_tokens=20)
+    assert " ".join(chunks).split() == text.split()
+
+
+# Test that the block size used for encoding does not change the chunks
+def test_iter_text_chunks_block_size_invariant():
+    text = "The quick brown fox jumps over the lazy dog. " * 500
+    expected = chunk_text_dynamic(text, limit_tokens=25)
+    for block_chars in (16, 1000, 50000):
+        chunks = list(
+            iter_text_chunks(
+                text, limit_tokens=25, block_chars=block_chars
+            )
+        )
+        assert chunks == expected
+
+
+# Test words carried over from the first block get no leading space
+@pytest.mark.parametrize("text", ["x a", "x a b c d e f g h i j k"])
+def test_iter_text_chunks_small_blocks_match_default(text):
+    for limit_tokens in (1, 2, 3):
+        expected = chunk_text_dynamic(text, limit_tokens=limit_tokens)
+        for block_chars in (1, 2, 3):
+            chunks = list(
+                iter_text_chunks(
+                    text,
+                    limit_tokens=limit_tokens,
+                    block_chars=block_chars,
+                )
+            )
+            assert chunks == expected
+
+
+# Test chunking text streamed in pieces that split words
+def test_iter_text_chunks_from_pieces():
+    text = "streaming pieces may split words anywhere " * 300
+    pieces = [text[i : i + 7] for i in range(0, len(text), 7)]
+    chunks = list(
+        iter_text_chunks(iter(pieces), limit_tokens=30, block_chars=64)
+    )
+    assert chunks == chunk_text_dynamic(text, limit_tokens=30)
+
+
+# Test that parallel corpus chunking matches the serial path
+def test_chunk_corpus_matches_serial():
+    documents = [
+        (f"doc-{i}", f"document {i} has some words in it " * (i + 1))
+        for i in range(12)
+    ]
+    results = list(
+        chunk_corpus(documents, limit_tokens=8, workers=2)
+    )
+
+    by_doc = {}
+    for doc_id, chunk_index, chunk in results:
+        by_doc.setdefault(doc_id, {})[chunk_index] = chunk
+    for doc_id, text in documents:
+        chunks = by_doc[doc_id]
+        assert [chunks[i] for i in range(len(chunks))] == (
+            chunk_text_dynamic(text, limit_tokens=8)
+        )
+
+
+# Test that chunk_corpus pulls documents lazily
+def test_chunk_corpus_bounded_in_flight():
+    pulled = []
+
+    def documents():
+        for i in range(100):
+            pulled.append(i)
+            yield i, "a few words per document"
+
+    results = chunk_corpus(
+        documents(), limit_tokens=50, workers=1, max_in_flight=3
+    )
+    next(results)
+    assert len(pulled) <= 4
+    results.close()
@@ -0,0 +1,135 @@
+# ExtractionCache
+
+import os
+
+import openpyxl
+from agentparse import ExtractionCache, file_to_string
+
+
+def counting_extractor(calls):
+    def extract(file_path):
+        calls.append(file_path)
+        with open(file_path, "rb") as file:
+            return file.read().decode("utf-8").upper()
+
+    return extract
+
+
+# Test that a second lookup is served from the cache
+def test_cache_hit_skips_extraction(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    source = tmp_path / "doc.pdf"
+    source.write_text("hello cache")
+    calls = []
+
+    first = cache.get_or_extract(
+        str(source), counting_extractor(calls)
+    )
+    second = cache.get_or_extract(
+        str(source), counting_extractor(calls)
+    )
+
+    assert first == second == "HELLO CACHE"
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+    assert stats.bytes_saved == source.stat().st_size
+
+
+# Test that identical content at another path is a hit
+def test_cache_is_content_addressed(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    first = tmp_path / "a.pdf"
+    copy = tmp_path / "b.pdf"
+    first.write_text("same bytes")
+    copy.write_text("same bytes")
+    calls = []
+
+    cache.get_or_extract(str(first), counting_extractor(calls))
+    cache.get_or_extract(str(copy), counting_extractor(calls))
+    assert len(calls) == 1
+
+
+# Test that a changed file is extracted again
+def test_cache_detects_modified_file(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    source = tmp_path / "doc.pdf"
+    source.write_text("version one")
+    calls = []
+    cache.get_or_extract(str(source), counting_extractor(calls))
+
+    source.write_text("version two!")
+    text = cache.get_or_extract(
+        str(source), counting_extractor(calls)
+    )
+    assert text == "VERSION TWO!"
+    assert len(calls) == 2
+
+
+# Test that the size cap evicts the least recently used entries
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache"), max_bytes=300)
+    extract = counting_extractor([])
+    paths = []
+    for i in range(6):
+        source = tmp_path / f"doc{i}.pdf"
+        source.write_bytes(os.urandom(60).hex().encode())
+        paths.append(str(source))
+        cache.get_or_extract(str(source), extract)
+
+    assert cache.size_bytes() <= 300
+    assert cache.stats().evictions > 0
+    calls = []
+    cache.get_or_extract(paths[-1], counting_extractor(calls))
+    assert calls == []
+
+
+# Test that stamps count against the cap and go with their entries
+def test_cache_evicts_stamps(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache"), max_bytes=1000)
+    extract = counting_extractor([])
+    for i in range(50):
+        source = tmp_path / f"churn{i}.pdf"
+        source.write_bytes(os.urandom(60).hex().encode())
+        cache.get_or_extract(str(source), extract)
+        source.unlink()
+
+    entries = os.listdir(tmp_path / "cache" / "entries")
+    stamps = os.listdir(tmp_path / "cache" / "stamps")
+    assert cache.size_bytes() <= 1000
+    assert 0 < len(stamps) == len(entries) < 50
+
+
+# Test that file_to_string serves workbooks from the cache
+def test_file_to_string_uses_cache(tmp_path, monkeypatch):
+    xlsx = tmp_path / "book.xlsx"
+    wb = openpyxl.Workbook()
+    wb.active.append([1, 2])
+    wb.save(xlsx)
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    expected = file_to_string(str(xlsx), cache=cache)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("workbook was parsed again")
+
+    monkeypatch.setattr("agentparse.main._extract_text", fail)
+    assert file_to_string(str(xlsx), cache=cache) == expected
+    assert cache.stats().hits == 1
+
+
+# Test that files are cached by detected format, not just extension
+def test_accepts_detected_format(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    misnamed = tmp_path / "book.bin"
+    wb = openpyxl.Workbook()
+    wb.active.append([1, 2])
+    wb.save(misnamed)
+    text = tmp_path / "notes.txt"
+    text.write_text("plain")
+
+    assert cache.accepts(str(misnamed))
+    assert not cache.accepts(str(text))
+    assert not cache.accepts(str(tmp_path / "missing.pdf"))
+    file_to_string(str(misnamed), cache=cache)
+    file_to_string(str(misnamed), cache=cache)
+    assert cache.stats().hits == 1
@@ -0,0 +1,103 @@
+# extractor registry and content sniffing
+
+import zipfile
+
+import pytest
+from agentparse import (
+    FileHandler,
+    file_to_string,
+    iter_file_text,
+    register_extractor,
+)
+from agentparse.extractors import (
+    detect_extractor,
+    unregister_extractor,
+)
+from test_file_readers import write_pdf, write_xlsx
+
+
+def write_docx(path, paragraphs):
+    body = "".join(
+        f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>"
+        for text in paragraphs
+    )
+    document = (
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/'
+        f'wordprocessingml/2006/main"><w:body>{body}</w:body>'
+        "</w:document>"
+    )
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", document)
+    return path
+
+
+# Test that formats are sniffed when the extension is wrong or missing
+def test_detect_by_content(tmp_path):
+    pdf = write_pdf(tmp_path / "report.txt", ["sniffed pdf"])
+    xlsx = write_xlsx(tmp_path / "book", {"Sheet": [(1, 2)]})
+    docx = write_docx(tmp_path / "letter.bin", ["Hello"])
+    text = tmp_path / "README"
+    text.write_text("plain text, no extension")
+
+    assert detect_extractor(str(pdf)).name == "pdf"
+    assert detect_extractor(str(xlsx)).name == "xlsx"
+    assert detect_extractor(str(docx)).name == "docx"
+    assert detect_extractor(str(text)).name == "text"
+    assert file_to_string(str(pdf)) == "sniffed pdf\n"
+    assert file_to_string(str(xlsx)) == "Sheet: Sheet\n1,2\n"
+
+
+# Test that unknown binary content is still rejected
+def test_unsupported_binary_without_extension(tmp_path):
+    blob = tmp_path / "blob"
+    blob.write_bytes(b"\x00\x01\x02binary")
+
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        file_to_string(str(blob))
+
+
+# Test .docx extraction, one paragraph per line
+def test_file_to_string_docx(tmp_path):
+    docx = write_docx(
+        tmp_path / "letter.docx", ["Dear team,", "Thanks"]
+    )
+
+    assert file_to_string(str(docx)) == "Dear team,\nThanks\n"
+
+
+# Test that the streaming interface matches the full-text interface
+def test_iter_file_text_matches_file_to_string(tmp_path):
+    pdf = write_pdf(tmp_path / "doc.pdf", ["one", "two", "three"])
+    csv_file = tmp_path / "data.csv"
+    csv_file.write_text("a,b\n1,2\n")
+
+    for path in (pdf, csv_file):
+        blocks = list(iter_file_text(str(path)))
+        assert "".join(blocks) == file_to_string(str(path))
+    assert len(list(iter_file_text(str(pdf)))) == 3
+
+
+# Test that custom handlers load lazily, only when first needed
+def test_register_custom_extractor(tmp_path):
+    loaded = []
+
+    class UpperHandler(FileHandler):
+        def stream(self, file_path, **options):
+            with open(file_path, encoding="utf-8") as file:
+                for line in file:
+                    yield line.upper()
+
+    def factory():
+        loaded.append(True)
+        return UpperHandler()
+
+    register_extractor("shout", factory, extensions=[".shout"])
+    try:
+        assert loaded == []
+        note = tmp_path / "note.shout"
+        note.write_text("quiet\nplease\n")
+        assert file_to_string(str(note)) == "QUIET\nPLEASE\n"
+        file_to_string(str(note))
+        assert loaded == [True]
+    finally:
+        unregister_extractor("shout")
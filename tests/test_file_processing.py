@@ -0,0 +1,127 @@
+# ingest_files
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import pytest
+
+from agentparse import file_processing, ingest_files, iter_input_files
+from agentparse.extractors import (
+    FileHandler,
+    register_extractor,
+    unregister_extractor,
+)
+
+
+def make_corpus(tmp_path):
+    (tmp_path / "nested").mkdir()
+    for i in range(6):
+        (tmp_path / f"doc{i}.txt").write_text(f"document {i}")
+    (tmp_path / "nested" / "data.csv").write_text("a,b\n1,2")
+    (tmp_path / "nested" / "broken.xlsx").write_bytes(b"not a zip")
+    (tmp_path / "notes.xyz").write_text("unsupported")
+    (tmp_path / ".hidden.txt").write_text("skipped")
+    return tmp_path
+
+
+# Test expanding a directory, a glob and an extension filter
+def test_iter_input_files(tmp_path):
+    root = make_corpus(tmp_path)
+
+    walked = list(iter_input_files(str(root)))
+    assert len(walked) == 9
+    assert not any(".hidden" in path for path in walked)
+
+    globbed = list(iter_input_files(str(root / "**" / "*.csv")))
+    assert globbed == [str(root / "nested" / "data.csv")]
+
+    txt_only = list(iter_input_files(str(root), extensions=[".txt"]))
+    assert len(txt_only) == 6
+
+
+# Test that results stream back with failures isolated per file
+def test_ingest_files_isolates_failures(tmp_path):
+    root = make_corpus(tmp_path)
+
+    results = {
+        result.path: result
+        for result in ingest_files(str(root), workers=2)
+    }
+    assert len(results) == 9
+    assert results[str(root / "doc3.txt")].text == "document 3"
+    broken = results[str(root / "nested" / "broken.xlsx")]
+    assert not broken.ok
+    assert broken.text is None
+    unsupported = results[str(root / "notes.xyz")]
+    assert unsupported.error_type == "ValueError"
+    assert sum(result.ok for result in results.values()) == 7
+
+
+# Test that ordered mode preserves input order
+def test_ingest_files_ordered(tmp_path):
+    root = make_corpus(tmp_path)
+    paths = list(iter_input_files(str(root), extensions=[".txt"]))
+
+    results = list(
+        ingest_files(
+            list(reversed(paths)),
+            workers=3,
+            ordered=True,
+            max_in_flight=2,
+        )
+    )
+    assert [result.path for result in results] == list(
+        reversed(paths)
+    )
+    assert all(result.ok for result in results)
+
+
+class CrashingHandler(FileHandler):
+    def extract(self, file_path, **options):
+        if "crash" in os.path.basename(file_path):
+            os._exit(1)
+        with open(file_path, encoding="utf-8") as file:
+            return file.read()
+
+
+# Test a file that kills its worker fails alone and the rest succeed,
+# with the runtime-registered extractor available under every start method
+@pytest.mark.parametrize("ordered", [False, True])
+@pytest.mark.parametrize(
+    "start_method", multiprocessing.get_all_start_methods()
+)
+def test_ingest_files_survives_worker_crash(
+    tmp_path, monkeypatch, ordered, start_method
+):
+    monkeypatch.setattr(
+        file_processing,
+        "ProcessPoolExecutor",
+        partial(
+            ProcessPoolExecutor,
+            mp_context=multiprocessing.get_context(start_method),
+        ),
+    )
+    paths = []
+    for i in range(6):
+        name = "crash.boom" if i == 2 else f"doc{i}.boom"
+        (tmp_path / name).write_text(f"document {i}")
+        paths.append(str(tmp_path / name))
+    register_extractor("boom", CrashingHandler, extensions=[".boom"])
+    try:
+        results = list(
+            ingest_files(
+                paths, workers=2, ordered=ordered, max_in_flight=2
+            )
+        )
+    finally:
+        unregister_extractor("boom")
+
+    by_path = {result.path: result for result in results}
+    assert sorted(by_path) == sorted(paths)
+    crashed = by_path.pop(str(tmp_path / "crash.boom"))
+    assert crashed.error_type == "BrokenProcessPool"
+    assert all(result.ok for result in by_path.values())
+    if ordered:
+        assert [result.path for result in results] == paths
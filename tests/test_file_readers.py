@@ -0,0 +1,179 @@
+# file_readers
+
+import tracemalloc
+
+import openpyxl
+from agentparse import file_to_string
+from agentparse.file_readers import (
+    iter_pdf_pages,
+    iter_text_blocks,
+    iter_xlsx_rows,
+)
+
+
+def write_pdf(path, page_texts):
+    """Write a minimal PDF with one line of Helvetica text per page."""
+    num_pages = len(page_texts)
+    page_ids = [4 + 2 * i for i in range(num_pages)]
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: (
+            b"<< /Type /Pages /Kids ["
+            + b" ".join(b"%d 0 R" % i for i in page_ids)
+            + b"] /Count %d >>" % num_pages
+        ),
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for page_id, text in zip(page_ids, page_texts):
+        stream = b"BT /F1 12 Tf 72 720 Td (%s) Tj ET" % text.encode()
+        objects[page_id] = (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792]"
+            b" /Resources << /Font << /F1 3 0 R >> >>"
+            b" /Contents %d 0 R >>" % (page_id + 1)
+        )
+        objects[page_id + 1] = (
+            b"<< /Length %d >>\nstream\n%s\nendstream"
+            % (len(stream), stream)
+        )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (obj_id, objects[obj_id])
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for obj_id in sorted(objects):
+        out += b"%010d 00000 n \n" % offsets[obj_id]
+    out += (
+        b"trailer\n<< /Size %d /Root 1 0 R"
+        b" >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    )
+    path.write_bytes(bytes(out))
+    return path
+
+
+# Test that pages are yielded lazily and in order
+def test_iter_pdf_pages_serial(tmp_path):
+    pdf = write_pdf(
+        tmp_path / "doc.pdf", ["first", "second", "third"]
+    )
+    pages = iter_pdf_pages(str(pdf))
+
+    assert next(pages) == (1, "first")
+    assert list(pages) == [(2, "second"), (3, "third")]
+
+
+# Test that the process-pool mode reassembles pages in order
+def test_iter_pdf_pages_parallel_matches_serial(tmp_path):
+    texts = [f"page number {i}" for i in range(23)]
+    pdf = write_pdf(tmp_path / "doc.pdf", texts)
+
+    parallel = list(
+        iter_pdf_pages(str(pdf), workers=2, pages_per_task=4)
+    )
+    assert parallel == list(iter_pdf_pages(str(pdf)))
+    assert [text for _, text in parallel] == texts
+
+
+# Test that file_to_string joins the pages with newlines
+def test_file_to_string_pdf_pages(tmp_path):
+    pdf = write_pdf(tmp_path / "doc.pdf", ["alpha", "beta"])
+
+    assert file_to_string(str(pdf)) == "alpha\nbeta\n"
+    assert file_to_string(str(pdf), workers=2) == "alpha\nbeta\n"
+
+
+def write_xlsx(path, sheets):
+    """Write a workbook from a {sheet_name: rows} mapping."""
+    wb = openpyxl.Workbook(write_only=True)
+    for name, rows in sheets.items():
+        ws = wb.create_sheet(name)
+        for row in rows:
+            ws.append(row)
+    wb.save(path)
+    return path
+
+
+# Test that rows are streamed per sheet in batches
+def test_iter_xlsx_rows_batches(tmp_path):
+    rows = [(i, f"name {i}") for i in range(25)]
+    xlsx = write_xlsx(tmp_path / "book.xlsx", {"Data": rows})
+
+    batches = list(iter_xlsx_rows(str(xlsx), batch_size=10))
+    assert [len(batch) for _, batch in batches] == [10, 10, 5]
+    assert all(sheet == "Data" for sheet, _ in batches)
+    assert [row for _, batch in batches for row in batch] == rows
+
+
+# Test that file_to_string keeps its workbook text format
+def test_file_to_string_xlsx_format(tmp_path):
+    xlsx = write_xlsx(
+        tmp_path / "book.xlsx",
+        {"First": [(1, 2), (3, None)], "Empty": [], "Last": [("x",)]},
+    )
+
+    content = file_to_string(str(xlsx))
+    assert (
+        content
+        == "Sheet: First\n1,2\n3,None\nSheet: Empty\nSheet: Last\nx\n"
+    )
+
+
+# Test that streaming memory does not grow with the row count
+def test_iter_xlsx_rows_constant_memory(tmp_path):
+    rows = [(i, "some text", i * 1.5) for i in range(4000)]
+    xlsx = write_xlsx(tmp_path / "big.xlsx", {"Big": rows})
+
+    tracemalloc.start()
+    try:
+        count = sum(
+            len(batch)
+            for _, batch in iter_xlsx_rows(str(xlsx), batch_size=500)
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert count == len(rows)
+    assert peak < 2_000_000
+
+
+# Test that text blocks are newline-aligned and rebuild the file
+def test_iter_text_blocks_newline_aligned(tmp_path):
+    csv_file = tmp_path / "data.csv"
+    lines = [f"row{i},value {i}\n" for i in range(200)]
+    csv_file.write_text("".join(lines))
+
+    for use_mmap in (False, True):
+        blocks = list(
+            iter_text_blocks(str(csv_file), 64, use_mmap=use_mmap)
+        )
+        assert len(blocks) > 1
+        assert all(block.endswith("\n") for block in blocks)
+        assert "".join(blocks) == file_to_string(str(csv_file))
+
+
+# Test that multi-byte UTF-8 characters are never split
+def test_iter_text_blocks_utf8_boundaries(tmp_path):
+    txt_file = tmp_path / "unicode.txt"
+    text = "é日😀" * 100 + "\r\nnaïve café\r\n" * 10
+    txt_file.write_bytes(text.encode("utf-8"))
+
+    for use_mmap in (False, True):
+        for block_size in (1, 2, 3, 5):
+            blocks = list(
+                iter_text_blocks(
+                    str(txt_file), block_size, use_mmap=use_mmap
+                )
+            )
+            assert "".join(blocks) == file_to_string(str(txt_file))
+
+
+# Test that an empty file yields no blocks
+def test_iter_text_blocks_empty_file(tmp_path):
+    json_file = tmp_path / "empty.json"
+    json_file.write_text("")
+
+    assert list(iter_text_blocks(str(json_file))) == []
+    assert list(iter_text_blocks(str(json_file), use_mmap=True)) == []
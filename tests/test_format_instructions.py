@@ -0,0 +1,214 @@
+# cached format instructions
+
+import gc
+import json
+from typing import List, Optional
+
+import pytest
+from pydantic import BaseModel, Field
+
+from agentparse import JsonOutputParser, YamlOutputParser
+from agentparse.instructions import (
+    _instructions_cache,
+    clear_format_instructions_cache,
+    format_instruction_tokens,
+    format_instructions,
+    prewarm_format_instructions,
+)
+
+
+class Person(BaseModel):
+    name: str
+    age: int
+
+
+class Item(BaseModel):
+    id: int
+
+
+# Test the cached text matches the schema-based rendering
+def test_matches_schema_rendering():
+    schema = Person.model_json_schema()
+    del schema["title"], schema["type"]
+
+    assert JsonOutputParser(Person).get_format_instructions() == (
+        "JSON Formatting Instructions:\n"
+        + json.dumps(schema, indent=4)
+    )
+    assert (
+        YamlOutputParser(Person)
+        .get_format_instructions()
+        .startswith("YAML Formatting Instructions:\n{")
+    )
+
+
+# Test instructions are rendered once and served from the cache
+def test_served_from_cache(monkeypatch):
+    clear_format_instructions_cache()
+    json_text = format_instructions(Person, "json")
+    yaml_text = format_instructions(Person, "yaml")
+    monkeypatch.setattr(
+        "agentparse.instructions._render",
+        pytest.fail,
+    )
+
+    assert JsonOutputParser(Person).get_format_instructions() is (
+        json_text
+    )
+    assert YamlOutputParser(Person).get_format_instructions() is (
+        yaml_text
+    )
+
+
+# Test prewarming fills the cache for every format and style
+def test_prewarm(monkeypatch):
+    clear_format_instructions_cache()
+
+    assert prewarm_format_instructions([Person, Item]) == 12
+    monkeypatch.setattr(
+        "agentparse.instructions._render",
+        pytest.fail,
+    )
+    for model in (Person, Item):
+        for format in ("json", "yaml"):
+            assert format_instructions(model, format)
+    with pytest.raises(ValueError):
+        prewarm_format_instructions([Person], formats=["toml"])
+
+
+# Test explicit invalidation re-renders
+def test_invalidation():
+    first = format_instructions(Item)
+    other = format_instructions(Person)
+    clear_format_instructions_cache(Item)
+    second = format_instructions(Item)
+
+    assert second == first and second is not first
+    assert format_instructions(Item) is second
+    assert format_instructions(Person) is other
+
+
+# Test entries are evicted when the model class is garbage-collected
+def test_entry_evicted_with_model():
+    clear_format_instructions_cache()
+
+    class Temporary(BaseModel):
+        value: int
+
+    format_instructions(Temporary)
+    assert len(_instructions_cache) == 1
+
+    del Temporary
+    gc.collect()
+    assert len(_instructions_cache) == 0
+
+
+# Test unknown formats and styles are rejected
+def test_unknown_format_or_style():
+    with pytest.raises(ValueError):
+        format_instructions(Person, "toml")
+    with pytest.raises(ValueError):
+        JsonOutputParser(Person).get_format_instructions(style="tiny")
+
+
+class Address(BaseModel):
+    """A postal address."""
+
+    street: str = Field(description="Street and number")
+    title: str = "Home"
+
+
+class Point(BaseModel):
+    lat: float
+
+
+class Contact(BaseModel):
+    name: str = Field(description="The full name")
+    home: Address
+    work: Optional[Address] = None
+    location: Point
+    friends: List["Contact"] = []
+    meta: dict = {"title": "kept"}
+
+
+def schema_of(instructions):
+    return json.loads(instructions.split("\n", 1)[1])
+
+
+# Test compact drops titles, inlines single-use definitions and minifies
+def test_compact_style():
+    text = format_instructions(Contact, style="compact")
+    schema = schema_of(text)
+    contact = schema["$defs"]["Contact"]["properties"]
+
+    assert "\n" not in text.split("\n", 1)[1] and ": " not in text
+    # Shared and recursive definitions stay, used-once ones are inlined
+    assert set(schema["$defs"]) == {"Address", "Contact"}
+    assert schema["$ref"] == "#/$defs/Contact"
+    assert contact["location"] == {
+        "properties": {"lat": {"type": "number"}},
+        "required": ["lat"],
+        "type": "object",
+    }
+    # Only the title keyword goes, not fields or defaults named title
+    assert "title" in schema["$defs"]["Address"]["properties"]
+    assert contact["meta"]["default"] == {"title": "kept"}
+    assert "Title" not in text
+    assert contact["name"]["description"] == "The full name"
+
+
+# Test minimal also drops descriptions
+def test_minimal_style():
+    text = format_instructions(Contact, style="minimal")
+    schema = schema_of(text)
+
+    assert '"description"' not in text
+    assert schema["$defs"]["Contact"]["properties"]["name"] == {
+        "type": "string"
+    }
+
+
+# Test every style accepts and rejects the same documents
+@pytest.mark.parametrize("style", ["compact", "minimal"])
+def test_compact_styles_are_equivalent(style):
+    jsonschema = pytest.importorskip("jsonschema")
+    full = Contact.model_json_schema()
+    compact = schema_of(format_instructions(Contact, style=style))
+    documents = [
+        {
+            "name": "a",
+            "home": {"street": "s"},
+            "location": {"lat": 1},
+        },
+        {
+            "name": "a",
+            "home": {"street": "s", "title": "t"},
+            "location": {"lat": 1.5},
+            "friends": [{
+                "name": "b",
+                "home": {"street": "s"},
+                "location": {"lat": 0},
+                "work": {"street": 1},
+            }],
+        },
+        {"name": "a", "home": {}, "location": {"lat": 1}},
+        {"name": "a", "home": {"street": "s"}, "location": {}},
+    ]
+
+    for document in documents:
+        assert jsonschema.Draft202012Validator(full).is_valid(
+            document
+        ) == jsonschema.Draft202012Validator(compact).is_valid(
+            document
+        )
+
+
+# Test token counts shrink from full to compact to minimal
+def test_format_instruction_tokens():
+    tokens = format_instruction_tokens(Contact)
+
+    assert list(tokens) == ["full", "compact", "minimal"]
+    assert tokens["full"] > tokens["compact"] > tokens["minimal"] > 0
+    assert format_instruction_tokens(
+        Contact, "yaml", styles=["compact"]
+    ) == {"compact": tokens["compact"]}
@@ -0,0 +1,101 @@
+# function_to_pydantic_schema memoization
+
+import gc
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from agentparse.agent_parse import AgentParse
+from agentparse.function_to_basemodel import (
+    _model_cache,
+    clear_function_model_cache,
+    function_to_pydantic_schema,
+)
+
+
+def search(
+    query: str, limit: int = 10, tags: Optional[List[str]] = None
+):
+    pass
+
+
+# Test converting the same function twice returns the cached model
+def test_model_is_memoized():
+    first = function_to_pydantic_schema(search, "Search")
+
+    assert function_to_pydantic_schema(search, "Search") is first
+    assert function_to_pydantic_schema(search, "Other") is not first
+    assert first(query="q").limit == 10
+
+
+# Test rebinding defaults or annotations rebuilds the model
+def test_rebinding_invalidates():
+    def lookup(key: str, retries: int = 1):
+        pass
+
+    first = function_to_pydantic_schema(lookup)
+    lookup.__defaults__ = (3,)
+    second = function_to_pydantic_schema(lookup)
+    lookup.__annotations__ = {"key": int, "retries": int}
+    third = function_to_pydantic_schema(lookup)
+
+    assert second is not first
+    assert second(key="k").retries == 3
+    assert third is not second
+    assert third.model_fields["key"].annotation is int
+
+
+# Test entries are evicted when the function is garbage-collected
+def test_entry_evicted_with_function():
+    def make_function():
+        def temporary(value: int):
+            pass
+
+        return temporary
+
+    clear_function_model_cache()
+    func = make_function()
+    function_to_pydantic_schema(func)
+    assert len(_model_cache) == 1
+
+    del func
+    gc.collect()
+    assert len(_model_cache) == 0
+
+
+# Test bound methods share one model per method, not per instance
+def test_bound_methods_are_cached():
+    class Tool:
+        def run(self, command: str):
+            pass
+
+    first = function_to_pydantic_schema(Tool().run)
+
+    assert function_to_pydantic_schema(Tool().run) is first
+    assert list(first.model_fields) == ["command"]
+
+
+# Test concurrent first calls all get the same model
+def test_concurrent_calls_share_model():
+    def handler(event: str, payload: dict):
+        pass
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        models = list(
+            executor.map(
+                lambda _: function_to_pydantic_schema(handler),
+                range(64),
+            )
+        )
+
+    assert len({id(model) for model in models}) == 1
+
+
+# Test AgentParse conversions go through the cache
+def test_agent_parse_uses_cache():
+    with AgentParse(workers=2) as agent:
+        models = agent.convert_functions_concurrently(
+            [search, search]
+        )
+
+    assert models[0] is models[1]
+    assert agent.func_to_base_model(search) is models[0]
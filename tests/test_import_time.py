@@ -0,0 +1,102 @@
+# import-time regression checks
+
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))
+)
+
+# Generous enough for slow CI machines; a bare import takes ~1ms
+IMPORT_BUDGET_SECONDS = 0.25
+HEAVY_MODULES = [
+    "PyPDF2",
+    "openpyxl",
+    "swarm_models",
+    "tiktoken",
+    "pandas",
+]
+
+
+def run_in_fresh_interpreter(code, cwd):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [REPO_ROOT, env.get("PYTHONPATH")])
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=cwd,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+# Test that a bare import stays within the time budget
+def test_import_agentparse_within_budget(tmp_path):
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import agentparse\n"
+        "elapsed = time.perf_counter() - start\n"
+        "print(json.dumps(elapsed))\n"
+    )
+    elapsed = min(
+        run_in_fresh_interpreter(code, tmp_path) for _ in range(3)
+    )
+    assert elapsed < IMPORT_BUDGET_SECONDS
+
+
+# Test that parsers and modules load without heavy dependencies
+def test_parsers_do_not_load_heavy_dependencies(tmp_path):
+    code = (
+        "import json, sys\n"
+        "import agentparse\n"
+        "agentparse.JsonOutputParser, agentparse.YamlOutputParser\n"
+        "import agentparse.main, agentparse.agent_parse\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r}"
+        " if m in sys.modules]))\n"
+    )
+    assert run_in_fresh_interpreter(code, tmp_path) == []
+
+
+# Test that importing has no side effects on the filesystem
+def test_import_has_no_side_effects(tmp_path):
+    code = (
+        "import json\n"
+        "import agentparse.agent_parse, agentparse.agent_metadata\n"
+        "print(json.dumps(None))\n"
+    )
+    run_in_fresh_interpreter(code, tmp_path)
+    assert list(tmp_path.iterdir()) == []
+
+
+# Test that exports are not shadowed once their submodules are imported
+def test_exports_survive_submodule_imports(tmp_path):
+    code = "\n".join([
+        "import json, types",
+        "from pydantic import BaseModel",
+        "import agentparse",
+        "agentparse.JsonOutputParser",
+        "from agentparse import format_instructions",
+        "class Model(BaseModel):",
+        "    x: int",
+        "format_instructions(Model)",
+        "modules = [name for name in agentparse.__all__",
+        "           if isinstance(getattr(agentparse, name),",
+        "                         types.ModuleType)]",
+        "print(json.dumps(modules))",
+    ])
+    assert run_in_fresh_interpreter(code, tmp_path) == []
+
+
+# Test that __all__ lists exactly the lazily exported names
+def test_all_matches_lazy_attributes():
+    import agentparse
+
+    assert len(set(agentparse.__all__)) == len(agentparse.__all__)
+    assert set(agentparse.__all__) == set(agentparse._LAZY_ATTRIBUTES)
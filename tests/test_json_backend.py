@@ -0,0 +1,75 @@
+# JSON backend selection and stdlib-compatible decoding
+
+import json
+
+import pytest
+from agentparse import json_backend
+
+EDGE_CASES = [
+    '{"name": "John", "age": 42, "tags": ["a", "b"]}',
+    '{"a": 1, "a": 2}',
+    "NaN",
+    "[Infinity, -Infinity]",
+    "1e400",
+    "123456789012345678901234567890",
+    '{"id": -98765432109876543210}',
+    "-9999999999999999999",
+    "-9223372036854775809",
+    "[9999999999999999999, -9223372036854775808]",
+    '"\\ud800"',
+    '"caf\\u00e9 数据"',
+    b'{"bytes": true}',
+    "  [1, 2.5, null]  ",
+]
+
+INVALID = [
+    '{"name": "John", "age": }',
+    "[1] trailing",
+    "",
+    "{'single': 'quotes'}",
+]
+
+
+@pytest.fixture(params=json_backend.available_json_backends())
+def backend(request):
+    previous = json_backend.get_json_backend()
+    json_backend.set_json_backend(request.param)
+    yield request.param
+    json_backend.set_json_backend(previous)
+
+
+# Test every backend decodes edge cases exactly like json.loads
+@pytest.mark.parametrize("document", EDGE_CASES)
+def test_loads_matches_stdlib(backend, document):
+    assert repr(json_backend.loads(document)) == repr(
+        json.loads(document)
+    )
+
+
+# Test every backend raises json.loads' exact error
+@pytest.mark.parametrize("document", INVALID)
+def test_loads_raises_stdlib_error(backend, document):
+    with pytest.raises(json.JSONDecodeError) as expected:
+        json.loads(document)
+    with pytest.raises(json.JSONDecodeError) as actual:
+        json_backend.loads(document)
+
+    assert type(actual.value) is json.JSONDecodeError
+    assert str(actual.value) == str(expected.value)
+
+
+# Test automatic selection prefers the first installed backend
+def test_auto_backend_is_first_available(monkeypatch):
+    previous = json_backend.get_json_backend()
+    monkeypatch.delenv("AGENTPARSE_JSON_BACKEND", raising=False)
+    try:
+        chosen = json_backend.set_json_backend()
+        assert chosen == json_backend.available_json_backends()[0]
+    finally:
+        json_backend.set_json_backend(previous)
+
+
+# Test unknown backends are rejected
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError):
+        json_backend.set_json_backend("simdjson")
@@ -0,0 +1,195 @@
+# incremental JSON parsing of streamed output
+
+import gc
+import json
+import weakref
+from typing import Annotated, List, Optional
+
+import pytest
+from pydantic import BaseModel, ConfigDict, Field, create_model
+from agentparse import (
+    JsonOutputParser,
+    JsonStreamParser,
+    json_stream_parser,
+)
+from agentparse.json_output_parser import JsonParsingException
+
+
+class Step(BaseModel):
+    title: str
+    done: bool
+
+
+class Plan(BaseModel):
+    goal: str
+    steps: List[Step]
+    score: float = Field(ge=0)
+    note: Optional[str] = None
+
+
+DOCUMENT = json.dumps({
+    "goal": 'ship "it" café 😀',
+    "steps": [
+        {"title": "line\nbreak", "done": True},
+        {"title": "x", "done": False},
+    ],
+    "score": 1.5e2,
+    "note": None,
+})
+
+
+def feed_in_chunks(parser, text, size):
+    completed = []
+    for i in range(0, len(text), size):
+        completed += parser.feed(text[i : i + size])
+    return completed
+
+
+# Test any chunking yields the same model as parsing the whole text
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(DOCUMENT)])
+def test_stream_matches_full_parse(size):
+    parser = JsonStreamParser(Plan)
+    text = "Here is the plan:\n```json\n" + DOCUMENT + "\n```\nDone."
+
+    completed = feed_in_chunks(parser, text, size)
+
+    assert completed == ["goal", "steps", "score", "note"]
+    assert parser.done
+    assert parser.close() == Plan.model_validate_json(DOCUMENT)
+
+
+# Test partial objects and completed fields while the stream is open
+def test_partial_object_and_completed_fields():
+    parser = JsonOutputParser(Plan).stream()
+    assert parser.feed(
+        '{"goal": "ship", "steps": [{"title": "wr'
+    ) == ["goal"]
+
+    assert parser.partial == {
+        "goal": "ship",
+        "steps": [{"title": "wr"}],
+    }
+    assert parser.completed_fields == {"goal": "ship"}
+    assert not parser.done
+
+
+# Test a syntax error fails on the chunk that introduces it
+def test_fails_early_on_syntax_error():
+    parser = JsonStreamParser(Plan)
+    parser.feed('{"goal": "ship", "steps": [tr')
+
+    with pytest.raises(JsonParsingException) as exc_info:
+        parser.feed("ux]")
+
+    assert isinstance(exc_info.value.__cause__, json.JSONDecodeError)
+    with pytest.raises(JsonParsingException):
+        parser.feed("}")
+
+
+# Test an invalid top-level field fails before the object closes
+def test_fails_early_on_invalid_field():
+    parser = JsonStreamParser(Plan)
+
+    with pytest.raises(JsonParsingException) as exc_info:
+        parser.feed('{"goal": "ship", "score": -1,')
+
+    assert "score" in str(exc_info.value)
+
+
+# Test keys forbidden by the model fail as soon as they are read
+def test_fails_early_on_forbidden_key():
+    class Strict(BaseModel):
+        model_config = ConfigDict(extra="forbid")
+        name: str
+
+    parser = JsonStreamParser(Strict)
+
+    with pytest.raises(JsonParsingException):
+        parser.feed('{"nickname": ')
+
+
+# Test field checks use the model config, like the full parse
+@pytest.mark.parametrize(
+    "config, annotation, document",
+    [
+        (
+            ConfigDict(coerce_numbers_to_str=True),
+            str,
+            '{"a": 5}',
+        ),
+        (
+            ConfigDict(str_strip_whitespace=True),
+            Annotated[str, Field(max_length=3)],
+            '{"a": " ab "}',
+        ),
+    ],
+)
+def test_field_checks_use_model_config(config, annotation, document):
+    Configured = create_model(
+        "Configured", __config__=config, a=(annotation, ...)
+    )
+
+    expected = JsonOutputParser(Configured).parse(document)
+    parser = JsonStreamParser(Configured)
+    parser.feed(document)
+
+    assert parser.close() == expected
+    assert parser.completed_fields == {"a": expected.a}
+    assert expected.a in ("5", "ab")
+
+
+# Test missing required fields fail when the object closes
+def test_fails_when_object_closes_incomplete():
+    parser = JsonStreamParser(Plan)
+
+    with pytest.raises(JsonParsingException):
+        parser.feed('{"goal": "ship"}')
+
+
+# Test closing an unfinished stream raises
+def test_close_before_object_ends():
+    parser = JsonStreamParser(Plan)
+    parser.feed('{"goal": "ship"')
+
+    with pytest.raises(JsonParsingException):
+        parser.close()
+
+
+# Test field checks are built once per model and not kept alive
+def test_field_checks_cached_weakly(monkeypatch):
+    calls = []
+    build = json_stream_parser._build_field_checks
+    monkeypatch.setattr(
+        json_stream_parser,
+        "_build_field_checks",
+        lambda model: calls.append(model) or build(model),
+    )
+    Temporary = create_model("Temporary", name=(str, ...))
+    for _ in range(3):
+        parser = JsonStreamParser(Temporary)
+        parser.feed('{"name": "a"}')
+        assert parser.close().name == "a"
+    model = weakref.ref(Temporary)
+
+    assert len(calls) == 1
+    del Temporary, parser, calls[:]
+    gc.collect()
+    assert model() is None
+
+
+# Test recursive models parse but are not cached, as they would pin
+# themselves
+def test_recursive_model_not_cached():
+    class Node(BaseModel):
+        value: int
+        children: List["Node"] = []
+
+    for _ in range(2):
+        parser = JsonStreamParser(Node)
+        parser.feed('{"value": 1, "children": [{"value": 2}]}')
+        assert parser.close().children[0].value == 2
+
+    JsonStreamParser(Plan)
+
+    assert Node not in json_stream_parser._field_checks_cache
+    assert Plan in json_stream_parser._field_checks_cache
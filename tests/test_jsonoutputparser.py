@@ -1,9 +1,13 @@
 # JsonOutputParser
 
+import datetime
+import enum
+import json
 import pytest
 import re
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 from agentparse import JsonOutputParser
+from agentparse.json_output_parser import JsonParsingException
 
 
 # Define a sample Pydantic model for testing
@@ -55,3 +59,153 @@ def test_get_format_instructions():
     assert "JSON Formatting Instructions:" in instructions
     assert '"name": {"type": "string"}' in instructions
     assert '"age": {"type": "integer"}' in instructions
+
+
+# Test the fast path returns the same model as json.loads + validation
+def test_parse_fast_path_matches_python_validation():
+    parser = JsonOutputParser(MyModel)
+    text = '```json\n{"name": "John", "age": "42"}\n```'
+    model = parser.parse(text)
+    assert model == MyModel.model_validate(
+        json.loads('{"name": "John", "age": "42"}')
+    )
+
+
+# Test invalid JSON still raises with the JSONDecodeError as the cause
+def test_parse_invalid_json_keeps_decode_error():
+    parser = JsonOutputParser(MyModel)
+
+    with pytest.raises(JsonParsingException) as exc_info:
+        parser.parse('{"name": "John", "age": }')
+
+    assert isinstance(exc_info.value.__cause__, json.JSONDecodeError)
+
+
+# Test validation failures still raise with the ValidationError as the cause
+def test_parse_invalid_model_keeps_validation_error():
+    parser = JsonOutputParser(MyModel)
+
+    with pytest.raises(JsonParsingException) as exc_info:
+        parser.parse('{"name": "John", "age": "forty-two"}')
+
+    assert isinstance(exc_info.value.__cause__, ValidationError)
+    assert "Failed to parse MyModel" in str(exc_info.value)
+
+
+# Test the first valid block is chosen among prose and several blocks
+def test_parse_mixed_prose_and_blocks():
+    parser = JsonOutputParser(MyModel)
+    text = (
+        "See [1]. Draft:\n"
+        '```json\n{"name": "Draft"}\n```\n'
+        'Final: {"name": "John `Jr`", "age": 42}'
+    )
+    model = parser.parse(text)
+    assert model.name == "John `Jr`"
+    assert model.age == 42
+
+
+# Test parse_all returns every valid block in order
+def test_parse_all():
+    parser = JsonOutputParser(MyModel)
+    text = (
+        '```json\n{"name": "A", "age": 1}\n```\n'
+        'then {"name": "B", "age": "x"} and {"name": "C", "age": 3}'
+    )
+    assert [m.name for m in parser.parse_all(text)] == ["A", "C"]
+
+
+# Test parse_result reports decode errors with a location instead of raising
+def test_parse_result_decode_error():
+    parser = JsonOutputParser(MyModel)
+    text = 'Answer:\n```json\n{"name": "John",\n "age": x}\n```'
+
+    result = parser.parse_result(text)
+
+    assert not result.ok
+    assert result.error.stage == "decode"
+    assert result.error.location == "line 4 column 9"
+    assert text[result.error.offset] == "x"
+
+
+# Test parse_result and parse report a decode error the same way
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"name": "John", "age": }',
+        '{"name": "John" "age": 42}',
+        'Answer:\n```json\n{"name": "John",\n "age": x}\n```',
+    ],
+)
+def test_parse_result_decode_error_matches_parse(text):
+    parser = JsonOutputParser(MyModel)
+
+    with pytest.raises(JsonParsingException) as exc_info:
+        parser.parse(text)
+    result = parser.parse_result(text)
+
+    assert result.error.message == exc_info.value.__cause__.msg
+
+
+# Test parse_result caps the error size for huge inputs
+def test_parse_result_error_is_compact():
+    parser = JsonOutputParser(MyModel)
+    text = '{"name": "' + "x" * 1_000_000 + '", "age": "old"}'
+
+    result = parser.parse_result(
+        text, max_message_chars=40, snippet_chars=20
+    )
+
+    assert result.error.stage == "validate"
+    assert result.error.location == "age"
+    assert len(result.error.message) <= 40
+    assert len(result.error.snippet) <= 20
+
+
+# Test parse_many returns one result per input in order
+def test_parse_many():
+    parser = JsonOutputParser(MyModel)
+    results = parser.parse_many(
+        ['{"name": "A", "age": 1}', "not json", '{"name": "B"}']
+    )
+
+    assert [r.ok for r in results] == [True, False, False]
+    assert results[0].value.name == "A"
+    assert [r.error.stage for r in results[1:]] == [
+        "decode",
+        "validate",
+    ]
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+class StrictEvent(BaseModel):
+    model_config = ConfigDict(strict=True)
+    day: datetime.date
+    color: Color
+
+
+class StrictField(BaseModel):
+    day: datetime.date = Field(strict=True)
+
+
+# Test strict models reject JSON strings for dates and enums, as before
+@pytest.mark.parametrize(
+    "model, document",
+    [
+        (StrictEvent, '{"day": "2024-01-02", "color": "red"}'),
+        (StrictField, '{"day": "2024-01-02"}'),
+    ],
+)
+def test_strict_model_keeps_python_validation(model, document):
+    parser = JsonOutputParser(model)
+
+    with pytest.raises(JsonParsingException) as exc_info:
+        parser.parse(document)
+
+    assert isinstance(exc_info.value.__cause__, ValidationError)
+    assert not parser.parse_result(document).ok
+    with pytest.raises(ValidationError):
+        model.model_validate(json.loads(document))
@@ -0,0 +1,183 @@
+# metrics instrumentation
+
+import pytest
+from pydantic import BaseModel
+
+from agentparse import JsonOutputParser, YamlOutputParser
+from agentparse.agent_parse import AgentParse
+from agentparse.json_output_parser import JsonParsingException
+from agentparse.metrics import (
+    CHARS_TOTAL,
+    EXECUTOR_QUEUE_DEPTH,
+    FAILURES_TOTAL,
+    METRICS,
+    STAGE_SECONDS,
+    Histogram,
+    Metrics,
+    add_metrics_sink,
+    disable_metrics,
+    enable_metrics,
+    metrics_snapshot,
+    metrics_to_prometheus,
+    remove_metrics_sink,
+    reset_metrics,
+)
+
+
+class Person(BaseModel):
+    name: str
+    age: int
+
+
+@pytest.fixture
+def metrics():
+    was_enabled = METRICS.enabled
+    reset_metrics()
+    enable_metrics()
+    yield METRICS
+    METRICS.enabled = was_enabled
+    reset_metrics()
+
+
+def series(snapshot, kind, name):
+    return {
+        tuple(sorted(item["labels"].items())): item
+        for item in snapshot[kind].get(name, [])
+    }
+
+
+# Test nothing is recorded while metrics are disabled
+def test_disabled_records_nothing():
+    reset_metrics()
+    disable_metrics()
+    JsonOutputParser(Person).parse('{"name": "a", "age": 1}')
+
+    assert metrics_snapshot() == {
+        "counters": {},
+        "gauges": {},
+        "histograms": {},
+    }
+    assert metrics_to_prometheus() == ""
+
+
+# Test JSON parsing records stage timings, sizes and failures
+def test_json_parser_stages(metrics):
+    parser = JsonOutputParser(Person)
+    parser.parse('Sure:\n```json\n{"name": "a", "age": 1}\n```')
+    with pytest.raises(JsonParsingException):
+        parser.parse('{"name": "a", "age": "old"}')
+    parser.parse_result("no json here {")
+
+    snapshot = metrics_snapshot()
+    stages = series(snapshot, "histograms", STAGE_SECONDS)
+    assert stages[(("stage", "json.parse"),)]["count"] == 3
+    assert (("stage", "json.extract"),) in stages
+    assert (("stage", "json.decode_validate"),) in stages
+    failures = series(snapshot, "counters", FAILURES_TOTAL)
+    assert failures[(("stage", "json.validate"),)]["value"] == 1
+    assert failures[(("stage", "json.decode"),)]["value"] == 1
+    chars = series(snapshot, "counters", CHARS_TOTAL)
+    assert chars[(("stage", "json.parse"),)]["value"] > 0
+
+
+# Test YAML parsing separates decode and validate time
+def test_yaml_parser_stages(metrics):
+    YamlOutputParser(Person).parse("```yaml\nname: a\nage: 1\n```")
+
+    stages = series(metrics.snapshot(), "histograms", STAGE_SECONDS)
+    for stage in ("yaml.parse", "yaml.extract", "yaml.decode"):
+        assert stages[(("stage", stage),)]["count"] == 1
+    assert stages[(("stage", "yaml.validate"),)]["count"] == 1
+
+
+# Test AgentParse tracks its executor queue depth
+def test_agent_parse_queue_depth(metrics):
+    seen = []
+    with AgentParse(workers=2) as agent:
+        for model in agent.imap(
+            Person,
+            ['{"name": "a", "age": 1}'] * 10,
+            max_in_flight=3,
+        ):
+            gauges = series(
+                metrics.snapshot(), "gauges", EXECUTOR_QUEUE_DEPTH
+            )
+            seen.append(
+                gauges[(("executor", "ThreadPoolExecutor"),)]["value"]
+            )
+
+    assert max(seen) <= 3
+    assert seen[-1] == 0
+
+
+# Test histogram quantiles interpolate within buckets
+def test_histogram_quantiles():
+    histogram = Histogram((1.0, 2.0, 4.0))
+    for value in (0.5, 1.5, 1.5, 3.0, 10.0):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) == pytest.approx(1.75)
+    assert histogram.quantile(0.99) <= 10.0
+    assert Histogram().quantile(0.5) is None
+
+
+# Test the Prometheus rendering and custom sinks
+def test_prometheus_text_and_sinks():
+    registry = Metrics(buckets=(0.1, 1.0))
+    registry.enabled = True
+    events = []
+
+    def sink(kind, name, value, labels):
+        events.append((kind, name, value, labels))
+
+    def broken_sink(*args):
+        raise RuntimeError("sink down")
+
+    registry.add_sink(broken_sink)
+    registry.add_sink(sink)
+    registry.observe(STAGE_SECONDS, 0.5, stage='file "x"')
+    registry.inc(FAILURES_TOTAL, stage="file.extract")
+    registry.remove_sink(sink)
+    registry.inc(FAILURES_TOTAL, stage="file.extract")
+
+    assert registry.to_prometheus().splitlines() == [
+        "# TYPE agentparse_failures_total counter",
+        'agentparse_failures_total{stage="file.extract"} 2',
+        "# TYPE agentparse_stage_seconds histogram",
+        (
+            'agentparse_stage_seconds_bucket{stage="file'
+            ' \\"x\\"",le="0.1"} 0'
+        ),
+        (
+            'agentparse_stage_seconds_bucket{stage="file'
+            ' \\"x\\"",le="1.0"} 1'
+        ),
+        (
+            'agentparse_stage_seconds_bucket{stage="file'
+            ' \\"x\\"",le="+Inf"} 1'
+        ),
+        'agentparse_stage_seconds_sum{stage="file \\"x\\""} 0.5',
+        'agentparse_stage_seconds_count{stage="file \\"x\\""} 1',
+    ]
+    assert events == [
+        ("histogram", STAGE_SECONDS, 0.5, {"stage": 'file "x"'}),
+        ("counter", FAILURES_TOTAL, 1.0, {"stage": "file.extract"}),
+    ]
+
+
+# Test the module-level sink helpers use the shared registry
+def test_module_sink(metrics):
+    events = []
+
+    def sink(*event):
+        events.append(event)
+
+    add_metrics_sink(sink)
+    try:
+        metrics.inc(FAILURES_TOTAL, stage="test")
+    finally:
+        remove_metrics_sink(sink)
+
+    assert events == [
+        ("counter", FAILURES_TOTAL, 1.0, {"stage": "test"})
+    ]
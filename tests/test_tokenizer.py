@@ -0,0 +1,76 @@
+# tokenizer registry and token-count cache
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from agentparse import count_tokens, get_tokenizer
+from agentparse.tokenizer import TokenCountCache
+
+
+# Test that the cache evicts the least recently used entry
+def test_token_count_cache_lru_eviction():
+    cache = TokenCountCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert stats.currsize == 2
+
+
+# Test hit/miss statistics
+def test_token_count_cache_stats():
+    cache = TokenCountCache(maxsize=10)
+    assert cache.get("missing") is None
+    cache.put("word", 1)
+    cache.get("word")
+    cache.get("word")
+
+    stats = cache.stats()
+    assert stats.hits == 2
+    assert stats.misses == 1
+    assert stats.hit_rate == pytest.approx(2 / 3)
+
+
+# Test shrinking the cache evicts entries
+def test_token_count_cache_resize():
+    cache = TokenCountCache(maxsize=5)
+    for i in range(5):
+        cache.put(str(i), i)
+    cache.resize(2)
+    assert len(cache) == 2
+    assert cache.get("4") == 4
+
+
+# Test that a size of zero disables caching
+def test_token_count_cache_disabled():
+    cache = TokenCountCache(maxsize=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+
+
+# Test that the registry shares one tokenizer per encoding
+def test_get_tokenizer_is_shared():
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        tokenizers = list(
+            executor.map(lambda _: get_tokenizer(), range(32))
+        )
+    assert all(t is tokenizers[0] for t in tokenizers)
+
+
+# Test that repeated counts are served from the cache
+def test_count_tokens_uses_cache():
+    tokenizer = get_tokenizer()
+    tokenizer.cache.clear()
+    first = count_tokens("repeated")
+    second = count_tokens("repeated")
+
+    assert first == second == len(tokenizer.encode("repeated"))
+    stats = tokenizer.cache_stats()
+    assert stats.misses == 1
+    assert stats.hits == 1
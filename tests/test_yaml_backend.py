@@ -0,0 +1,136 @@
+# libyaml-backed YAML layer matches pure-Python PyYAML
+
+import datetime
+
+import pytest
+import yaml
+from agentparse import yaml_backend
+from agentparse.whitespace import remove_whitespace_from_yaml
+
+DOCUMENTS = [
+    "name: John\nage: 42\n",
+    (
+        "steps:\n- title: plan\n  done: true\n- title: ship\n  done:"
+        " false\n"
+    ),
+    "text: |\n  line one\n  line two\nfolded: >\n  a\n  b\n",
+    "anchors:\n  base: &b {x: 1, y: [1, 2]}\n  copy: *b\n",
+    (
+        "quoted: 'it''s'\nunicode: café 数据 😀\nempty:"
+        " ''\nnull_value: ~\n"
+    ),
+    "when: 2024-05-01\nstamp: 2024-05-01 12:30:00\nfloat: 1.5e3\n",
+    "octal: 0o17\nhex: 0x1F\nbools: [yes, no, on, off]\n",
+    "nested: {a: {b: {c: [1, {d: e}]}}}\n",
+    "abc\n",
+    "42",
+    "- 1\n- two\n",
+    'long: "' + "word " * 60 + '"\n',
+    'escaped: "tab\\there \\"q\\" \\\\ \\u00e9 \\x41\\n"\n',
+    "quoted_tab: 'a\tb'\nblock: |\n  a\tb\n",
+    "folded: >\n  " + "word " * 40 + "\n",
+]
+
+# Tab separators that libyaml accepts and the pure-Python scanner rejects
+LIBYAML_ONLY = ["a:\tb\n", "[1,\t2]\n", "a: 1\t\n", "a: 1\t# c\n"]
+
+DATA = [
+    {"name": "John", "age": 42, "tags": ["a", "b"]},
+    {"text": "multi\nline\n", "unicode": "café 数据", "empty": ""},
+    {
+        "nested": {"list": [1, 2.5, None, True]},
+        "key with: colon": "x",
+    },
+    {"date": datetime.date(2024, 5, 1), "long": "word " * 40},
+    {"stamp": datetime.datetime(2024, 5, 1, 12, 30)},
+    [{"a": 1}, {"b": [{"c": "d"}]}],
+    "abc",
+    42,
+    None,
+    "word " * 40,
+    {"long": "word " * 40 + '"quoted"'},
+    {"escaped": 'tab\there "q" \\ bell\x07 nel\x85 ü'},
+    {"leading": " space", "trailing": "tab\t", "colon": "a: b"},
+]
+
+requires_libyaml = pytest.mark.skipif(
+    not yaml_backend.HAS_LIBYAML,
+    reason="PyYAML built without libyaml",
+)
+
+
+# Test the C loader yields the same data as yaml.safe_load
+@requires_libyaml
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_safe_load_matches_pure_python(document):
+    assert yaml_backend.SafeLoader is yaml.CSafeLoader
+    assert yaml_backend.safe_load(document) == yaml.safe_load(
+        document
+    )
+
+
+# Test libyaml accepts tab separators the pure-Python scanner rejects
+@requires_libyaml
+@pytest.mark.parametrize("document", LIBYAML_ONLY)
+def test_safe_load_accepts_tab_separators(document):
+    with pytest.raises(yaml.YAMLError):
+        yaml.safe_load(document)
+
+    assert yaml_backend.safe_load(document) is not None
+
+
+# Test dumping emits the same output as pure-Python PyYAML
+@pytest.mark.parametrize("data", DATA)
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"sort_keys": False},
+        {"default_flow_style": True},
+        {"allow_unicode": True, "sort_keys": False},
+    ],
+)
+def test_dump_matches_pure_python(data, options):
+    assert yaml_backend.safe_dump(data, **options) == yaml.safe_dump(
+        data, **options
+    )
+    assert yaml_backend.dump(data, **options) == yaml.dump(
+        data, **options
+    )
+
+
+# Test multi-document streams load lazily and identically
+@requires_libyaml
+def test_safe_load_all_matches_pure_python():
+    stream = "---\na: 1\n---\nb: [2, 3]\n...\n---\nc: null\n"
+
+    documents = yaml_backend.safe_load_all(stream)
+
+    assert not isinstance(documents, list)
+    assert list(documents) == list(yaml.safe_load_all(stream))
+
+
+# Test syntax errors are still yaml.YAMLError with the same position
+@pytest.mark.parametrize(
+    "document", ["a: [1\n", "a: b: c", "a:\n\tb: 1\n", "\ta: 1\n"]
+)
+def test_errors_keep_yaml_error_and_mark(document):
+    with pytest.raises(yaml.YAMLError) as expected:
+        yaml.safe_load(document)
+    with pytest.raises(yaml_backend.YAMLError) as actual:
+        yaml_backend.safe_load(document)
+
+    assert type(actual.value) is type(expected.value)
+    assert (
+        actual.value.problem_mark.index
+        == expected.value.problem_mark.index
+    )
+
+
+# Test remove_whitespace_from_yaml output is unchanged
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_remove_whitespace_from_yaml_unchanged(document):
+    expected = yaml.dump(
+        yaml.safe_load(document), default_flow_style=True
+    )
+    assert remove_whitespace_from_yaml(document) == expected
@@ -1,9 +1,12 @@
 # YamlOutputParser
 
+import io
+
 import pytest
 import re
 from pydantic import BaseModel
 from agentparse import YamlOutputParser
+from agentparse.yaml_output_parser import YamlParsingException
 
 
 # Define a sample Pydantic model for testing
@@ -46,3 +49,106 @@ def test_get_format_instructions():
     assert "YAML Formatting Instructions:" in instructions
     assert '"name": {"type": "string"}' in instructions
     assert '"age": {"type": "integer"}' in instructions
+
+
+# Test parse_all returns every valid YAML block in order
+def test_parse_all():
+    parser = YamlOutputParser(MyModel)
+    text = (
+        "```yaml\nname: A\nage: 1\n```\n"
+        "```python\nprint('skip')\n```\n"
+        "```yml\nname: B\nage: 2\n```\n"
+    )
+    assert [m.name for m in parser.parse_all(text)] == ["A", "B"]
+
+
+# Test parse_result reports YAML syntax errors without raising
+def test_parse_result_decode_error():
+    parser = YamlOutputParser(MyModel)
+    result = parser.parse_result("```yaml\nname: [John\nage: 42\n```")
+
+    assert not result.ok
+    assert result.error.stage == "decode"
+    assert result.error.offset is not None
+
+
+# Test parse_many mixes successes and validation failures
+def test_parse_many():
+    parser = YamlOutputParser(MyModel)
+    results = parser.parse_many(
+        ["name: A\nage: 1", "name: B\nage: old"]
+    )
+
+    assert results[0].value.name == "A"
+    assert results[1].error.stage == "validate"
+    assert results[1].error.location == "age"
+
+
+# Test parse_stream yields one model per document, skipping empty ones
+def test_parse_stream_documents():
+    parser = YamlOutputParser(MyModel)
+    stream = "---\nname: A\nage: 1\n---\n---\nname: B\nage: 2\n...\n"
+
+    assert [m.name for m in parser.parse_stream(stream)] == ["A", "B"]
+
+
+# Test parse_stream reads a file-like stream lazily
+def test_parse_stream_is_lazy():
+    class CountingStream(io.StringIO):
+        def read(self, size=-1):
+            chunk = super().read(size)
+            self.consumed = self.tell()
+            return chunk
+
+    body = "".join(
+        f"---\nname: n{i}\nage: {i}\n" for i in range(5000)
+    )
+    stream = CountingStream(body)
+    models = YamlOutputParser(MyModel).parse_stream(stream)
+
+    assert next(models).name == "n0"
+    assert stream.consumed < len(body) // 4
+    assert sum(1 for _ in models) == 4999
+
+
+# Test a failing document raises after earlier documents were yielded
+def test_parse_stream_validation_error():
+    parser = YamlOutputParser(MyModel)
+    models = parser.parse_stream(
+        "name: A\nage: 1\n---\nname: B\nage: old\n"
+    )
+
+    assert next(models).name == "A"
+    with pytest.raises(YamlParsingException, match="document 2"):
+        next(models)
+
+
+# Test parse_stream_results continues past validation errors
+def test_parse_stream_results():
+    parser = YamlOutputParser(MyModel)
+    stream = (
+        "name: A\nage: 1\n---\nname: B\nage: old\n---\n"
+        "name: C\nage: 3\n---\nname: [D\n"
+    )
+    results = list(parser.parse_stream_results(stream))
+
+    assert [r.ok for r in results] == [True, False, True, False]
+    assert results[1].error.location == "age"
+    assert results[3].error.stage == "decode"
+    assert results[3].error.location == "line 11 column 1"
+
+
+# Test no parsing path goes through the deprecated parse_obj
+def test_no_deprecated_validation(recwarn):
+    parser = YamlOutputParser(MyModel)
+    stream = "name: A\nage: 1\n---\nname: B\nage: 2\n"
+
+    assert parser.parse("```yaml\nname: A\nage: 1\n```").name == "A"
+    assert parser.parse_result("name: A\nage: 1").ok
+    assert len(list(parser.parse_stream(stream))) == 2
+    assert all(r.ok for r in parser.parse_stream_results(stream))
+    assert not [
+        w
+        for w in recwarn
+        if issubclass(w.category, DeprecationWarning)
+    ]